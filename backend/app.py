@@ -1,7 +1,12 @@
 from flask import Flask
 from flask_cors import CORS
 from config import Config
-from extensions import db, jwt
+from extensions import db, jwt, migrate
+from comandos import registrar_comandos
+from utils.compresion import registrar_compresion
+from utils.metricas import registrar_metricas
+from utils.replicas import registrar_replicas
+from utils.trabajos import registrar_trabajadores
 
 def create_app():
     app = Flask(__name__)
@@ -9,13 +14,16 @@ def create_app():
     
     db.init_app(app)
     jwt.init_app(app)
+    migrate.init_app(app, db, render_as_batch=True)
     
     CORS(app, resources={
         r"/api/*": {
             "origins": app.config['CORS_ORIGINS'],
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"],
-            "expose_headers": ["Content-Type", "Authorization"],
+            "allow_headers": ["Content-Type", "Authorization", "Range"],
+            "expose_headers": ["Content-Type", "Authorization", "Content-Range",
+                               "Accept-Ranges", "Content-Length", "ETag", "Last-Modified",
+                               "Server-Timing"],
             "supports_credentials": True,
             "max_age": 3600
         }
@@ -27,6 +35,11 @@ def create_app():
     from routes.proyectos import proyectos_bp
     from routes.practicas import practicas_bp
     from routes.documentos import documentos_bp
+    from routes.sistema import sistema_bp
+    from routes.busqueda import busqueda_bp
+    from routes.estadisticas import estadisticas_bp
+    from routes.cambios import cambios_bp
+    from routes.eventos import eventos_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api')
     app.register_blueprint(estudiantes_bp, url_prefix='/api')
@@ -34,12 +47,21 @@ def create_app():
     app.register_blueprint(proyectos_bp, url_prefix='/api')
     app.register_blueprint(practicas_bp, url_prefix='/api')
     app.register_blueprint(documentos_bp, url_prefix='/api')
+    app.register_blueprint(sistema_bp, url_prefix='/api')
+    app.register_blueprint(busqueda_bp, url_prefix='/api')
+    app.register_blueprint(estadisticas_bp, url_prefix='/api')
+    app.register_blueprint(cambios_bp, url_prefix='/api')
+    app.register_blueprint(eventos_bp, url_prefix='/api')
     
-    with app.app_context():
-        db.create_all()
+    registrar_comandos(app)
+    registrar_metricas(app)
+    registrar_compresion(app)
+    registrar_replicas(app)
+    registrar_trabajadores(app)
     
     return app
 
+# Servidor de desarrollo; en producción: gunicorn -c gunicorn.conf.py
 if __name__ == '__main__':
     app = create_app()
     app.run(debug=True)
\ No newline at end of file
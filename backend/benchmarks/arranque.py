@@ -0,0 +1,59 @@
+"""Tiempo de importación y de create_app() en un intérprete nuevo.
+
+Falla (código de salida 1) si la mediana supera el presupuesto, para usarlo en CI:
+    python -m benchmarks.arranque --repeticiones 5 --presupuesto-ms 1500
+
+La base apunta a un directorio inexistente: si create_app() intentara
+conectarse o crear el esquema, la medición fallaría.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEDICION = """
+import json, time
+inicio = time.perf_counter()
+import app
+importado = time.perf_counter()
+app.create_app()
+creado = time.perf_counter()
+print(json.dumps({'importacion_ms': (importado - inicio) * 1000, 'create_app_ms': (creado - importado) * 1000}))
+"""
+
+
+def medir():
+    entorno = dict(os.environ,
+                   DB_URL='sqlite:////directorio/inexistente/arranque.db',
+                   UPLOAD_FOLDER='/directorio/inexistente/uploads')
+    salida = subprocess.run([sys.executable, '-c', MEDICION], cwd=BACKEND, env=entorno,
+                            capture_output=True, text=True, check=True)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--presupuesto-ms', type=float,
+                        default=float(os.environ.get('ARRANQUE_PRESUPUESTO_MS', 1500)),
+                        help='máximo para importación + create_app (mediana)')
+    args = parser.parse_args()
+    
+    mediciones = [medir() for _ in range(args.repeticiones)]
+    importacion = statistics.median(m['importacion_ms'] for m in mediciones)
+    creacion = statistics.median(m['create_app_ms'] for m in mediciones)
+    total = importacion + creacion
+    
+    print(f'importación: {importacion:.1f} ms  create_app(): {creacion:.1f} ms  '
+          f'total: {total:.1f} ms (presupuesto {args.presupuesto_ms:.0f} ms)')
+    if total > args.presupuesto_ms:
+        print('El arranque excede el presupuesto')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
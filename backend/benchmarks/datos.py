@@ -0,0 +1,88 @@
+"""Generador de un conjunto de datos sintético para los benchmarks."""
+import random
+from datetime import date, timedelta
+from sqlalchemy import insert
+from app import db
+from models.estudiante import Estudiante
+from models.practica import Practica
+from models.profesor import Profesor
+from models.proyecto import Proyecto
+
+NOMBRES = ['Camila', 'Matías', 'Valentina', 'Benjamín', 'Javiera', 'Vicente', 'Catalina',
+           'Martín', 'Fernanda', 'Joaquín', 'Antonia', 'Tomás', 'Isidora', 'Diego']
+APELLIDOS = ['González', 'Muñoz', 'Rojas', 'Díaz', 'Pérez', 'Soto', 'Contreras', 'Silva',
+             'Martínez', 'Sepúlveda', 'Morales', 'Rodríguez', 'López', 'Fuentes']
+EMPRESAS = ['Banco del Sur', 'Araucanía TI', 'Municipalidad de Temuco', 'Frontel',
+            'Clínica Alemana', 'Agrosuper', 'Codelco Digital', 'Startup Labs']
+
+TAMANO_LOTE = 5000
+
+
+def _insertar(modelo, filas):
+    for inicio in range(0, len(filas), TAMANO_LOTE):
+        db.session.execute(insert(modelo), filas[inicio:inicio + TAMANO_LOTE])
+
+
+def sembrar(estudiantes=20000, practicas=40000, proyectos=10000, profesores=300, semilla=1):
+    """Inserta el conjunto de datos y devuelve los tamaños generados.
+
+    Cada estudiante tiene como máximo una práctica de cada tipo, por lo que
+    practicas no puede superar 2 * estudiantes.
+    """
+    aleatorio = random.Random(semilla)
+    practicas = min(practicas, 2 * estudiantes)
+    
+    _insertar(Estudiante, [{
+        'id': i,
+        'nombre': aleatorio.choice(NOMBRES),
+        'apellido': aleatorio.choice(APELLIDOS),
+        'email': f'estudiante{i}@alu.uct.cl'
+    } for i in range(1, estudiantes + 1)])
+    
+    _insertar(Profesor, [{
+        'id': i,
+        'nombre': aleatorio.choice(NOMBRES),
+        'apellido': aleatorio.choice(APELLIDOS),
+        'email': f'profesor{i}@uct.cl',
+        'activo': aleatorio.random() > 0.05
+    } for i in range(1, profesores + 1)])
+    
+    inicio_base = date(2020, 3, 1)
+    filas = []
+    for i in range(1, practicas + 1):
+        fecha_inicio = inicio_base + timedelta(days=aleatorio.randrange(0, 6 * 365))
+        filas.append({
+            'id': i,
+            'estudiante_id': (i - 1) % estudiantes + 1,
+            'tipo_practica': 'Inicial' if i <= estudiantes else 'Profesional',
+            'empresa': aleatorio.choice(EMPRESAS),
+            'fecha_inicio': fecha_inicio,
+            'fecha_termino': fecha_inicio + timedelta(days=aleatorio.randrange(60, 180)),
+            'supervisor': f'{aleatorio.choice(NOMBRES)} {aleatorio.choice(APELLIDOS)}',
+            'contacto_supervisor': f'supervisor{i}@empresa.cl',
+            'nota': round(aleatorio.uniform(1.0, 7.0), 1) if aleatorio.random() < 0.6 else None
+        })
+    _insertar(Practica, filas)
+    
+    filas = []
+    for i in range(1, proyectos + 1):
+        nota = round(aleatorio.uniform(1.0, 7.0), 1) if aleatorio.random() < 0.5 else None
+        filas.append({
+            'id': i,
+            'titulo': f'Proyecto de título {i}',
+            'descripcion': 'Sistema de apoyo a la gestión académica del departamento',
+            'estudiante_id': aleatorio.randrange(1, estudiantes + 1),
+            'profesor_guia_id': aleatorio.randrange(1, profesores + 1),
+            'profesor_informante_id': aleatorio.randrange(1, profesores + 1),
+            'nota': nota,
+            'estado': None if nota is None else ('Aprobado' if nota >= 4.0 else 'Reprobado')
+        })
+    _insertar(Proyecto, filas)
+    
+    db.session.commit()
+    return {
+        'estudiantes': estudiantes,
+        'practicas': practicas,
+        'proyectos': proyectos,
+        'profesores': profesores
+    }
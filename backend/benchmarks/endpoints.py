@@ -0,0 +1,182 @@
+"""Latencia, consultas SQL y memoria máxima de cada endpoint GET.
+
+Siembra un conjunto de datos sintético (SQLite temporal por defecto) y llama a
+los endpoints con el cliente de pruebas de Flask. Los resultados se guardan en
+JSON para comparar corridas:
+
+    python -m benchmarks.endpoints --escala 0.1 --salida antes.json
+    python -m benchmarks.endpoints --escala 0.1 --salida despues.json --comparar antes.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ENDPOINTS = [
+    '/api/estudiantes',
+    '/api/estudiantes?limit=100',
+    '/api/practicas/inicial',
+    '/api/practicas/inicial?limit=100',
+    '/api/practicas/profesional',
+    '/api/practicas/profesional?con_nota=false&sort=-fecha_inicio&limit=100',
+    '/api/practicas/profesional/{practica_profesional}',
+    '/api/practicas/export',
+    '/api/proyectos',
+    '/api/proyectos?limit=100',
+    '/api/proyectos/finalizados',
+    '/api/proyectos/{proyecto}',
+    '/api/proyectos/export',
+    '/api/profesores',
+    '/api/profesores/{profesor}',
+    '/api/profesores/{profesor}/detalle',
+    '/api/estadisticas',
+    '/api/buscar?q=banco',
+    '/api/buscar?q=gonz&tipo=estudiante',
+]
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+def preparar(args):
+    os.environ['DB_URL'] = args.db or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'benchmark.db')
+    os.environ['TRABAJOS_HILOS'] = '0'
+    os.environ['RESPONSE_CACHE_ENABLED'] = 'true' if args.con_cache else 'false'
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    
+    from app import create_app, db
+    from benchmarks.datos import sembrar
+    from flask_jwt_extended import create_access_token
+    import models.participacionprofesores  # noqa: F401
+    
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        tamanos = sembrar(
+            estudiantes=int(20000 * args.escala),
+            practicas=int(40000 * args.escala),
+            proyectos=int(10000 * args.escala),
+            profesores=max(2, int(300 * args.escala)),
+        )
+        token = create_access_token(identity='1')
+    return app, db, tamanos, token
+
+
+def medir(app, db, url, token, repeticiones):
+    from sqlalchemy import event
+    
+    cliente = app.test_client()
+    cabeceras = {'Authorization': f'Bearer {token}'}
+    consultas = []
+    
+    def contar(*_):
+        consultas[-1] += 1
+    
+    with app.app_context():
+        motor = db.engine
+    event.listen(motor, 'before_cursor_execute', contar)
+    try:
+        consultas.append(0)
+        respuesta = cliente.get(url, headers=cabeceras)
+        respuesta.get_data()
+        
+        latencias = []
+        for _ in range(repeticiones):
+            consultas.append(0)
+            inicio = time.perf_counter()
+            respuesta = cliente.get(url, headers=cabeceras)
+            cuerpo = respuesta.get_data()
+            latencias.append((time.perf_counter() - inicio) * 1000)
+        
+        tracemalloc.start()
+        consultas.append(0)
+        cliente.get(url, headers=cabeceras).get_data()
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        event.remove(motor, 'before_cursor_execute', contar)
+    
+    return {
+        'status': respuesta.status_code,
+        'bytes': len(cuerpo),
+        'consultas_sql': consultas[-1],
+        'p50_ms': round(_percentil(latencias, 50), 2),
+        'p90_ms': round(_percentil(latencias, 90), 2),
+        'p99_ms': round(_percentil(latencias, 99), 2),
+        'media_ms': round(statistics.mean(latencias), 2),
+        'memoria_pico_kb': round(pico / 1024, 1)
+    }
+
+
+def comparar(actual, anterior):
+    print(f"\n{'endpoint':<70} {'p50 antes':>10} {'p50 ahora':>10} {'cambio':>8}")
+    for url, datos in actual['endpoints'].items():
+        previo = anterior.get('endpoints', {}).get(url)
+        if not previo:
+            continue
+        cambio = (datos['p50_ms'] - previo['p50_ms']) / previo['p50_ms'] * 100 if previo['p50_ms'] else 0
+        print(f"{url:<70} {previo['p50_ms']:>10.2f} {datos['p50_ms']:>10.2f} {cambio:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--escala', type=float, default=1.0,
+                        help='fracción del conjunto completo (20k estudiantes, 40k prácticas, '
+                             '10k proyectos, 300 profesores)')
+    parser.add_argument('--repeticiones', type=int, default=20)
+    parser.add_argument('--db', default=None, help='URL de una base vacía (por defecto un SQLite temporal)')
+    parser.add_argument('--con-cache', action='store_true', help='mide con la caché de respuestas activa')
+    parser.add_argument('--filtro', default=None, help='solo endpoints que contengan este texto')
+    parser.add_argument('--salida', default=None, help='archivo JSON de resultados')
+    parser.add_argument('--comparar', default=None, help='JSON de una corrida anterior')
+    args = parser.parse_args()
+    
+    app, db, tamanos, token = preparar(args)
+    ids = {
+        'practica_profesional': tamanos['estudiantes'] + 1,
+        'proyecto': 1,
+        'profesor': 1
+    }
+    
+    resultados = {
+        'meta': {
+            'fecha': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'base': os.environ['DB_URL'].split(':', 1)[0],
+            'datos': tamanos,
+            'repeticiones': args.repeticiones,
+            'cache': args.con_cache
+        },
+        'endpoints': {}
+    }
+    
+    print(f"{'endpoint':<70} {'p50':>8} {'p90':>8} {'p99':>8} {'sql':>5} {'pico KB':>9}")
+    for plantilla in ENDPOINTS:
+        url = plantilla.format(**ids)
+        if args.filtro and args.filtro not in url:
+            continue
+        datos = medir(app, db, url, token, args.repeticiones)
+        resultados['endpoints'][plantilla] = datos
+        print(f"{url:<70} {datos['p50_ms']:>8.2f} {datos['p90_ms']:>8.2f} {datos['p99_ms']:>8.2f} "
+              f"{datos['consultas_sql']:>5} {datos['memoria_pico_kb']:>9.1f}")
+    
+    if args.salida:
+        with open(args.salida, 'w') as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+    
+    if args.comparar:
+        with open(args.comparar) as archivo:
+            comparar(resultados, json.load(archivo))
+
+
+if __name__ == '__main__':
+    main()
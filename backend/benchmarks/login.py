@@ -0,0 +1,53 @@
+"""Rendimiento de inicio de sesión: logins/s de un worker.
+
+Uso (desde backend/):
+    python -m benchmarks.login --logins 200 --hilos 8 --metodo scrypt
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--hilos', type=int, default=8, help='peticiones concurrentes')
+    parser.add_argument('--metodo', default=None, help='PASSWORD_HASH_METHOD a medir')
+    parser.add_argument('--db', default=None, help='URL de la base (por defecto un SQLite temporal)')
+    args = parser.parse_args()
+    
+    os.environ['DB_URL'] = args.db or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'login.db')
+    os.environ['TRABAJOS_HILOS'] = '0'
+    if args.metodo:
+        os.environ['PASSWORD_HASH_METHOD'] = args.metodo
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    
+    from app import create_app, db
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    
+    cliente = app.test_client()
+    credenciales = {'email': 'benchmark@uct.cl', 'contrasena': 'benchmark'}
+    cliente.post('/api/registro/secretaria', json={'nombre': 'B', 'apellido': 'B', **credenciales})
+    
+    def login(_):
+        return cliente.post('/api/login/secretaria', json=credenciales).status_code
+    
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.hilos) as executor:
+        estados = list(executor.map(login, range(args.logins)))
+    duracion = time.perf_counter() - inicio
+    
+    exitosos = estados.count(200)
+    print(f"método: {app.config['PASSWORD_HASH_METHOD']}  "
+          f"hilos de hash: {app.config['PASSWORD_HASH_WORKERS']}  concurrencia: {args.hilos}")
+    print(f'{exitosos}/{args.logins} logins exitosos en {duracion:.2f}s '
+          f'-> {exitosos / duracion:.1f} logins/s por worker')
+
+
+if __name__ == '__main__':
+    main()
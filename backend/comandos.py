@@ -0,0 +1,83 @@
+import click
+
+
+def registrar_comandos(app):
+    app.cli.add_command(recalcular_carga_command)
+    app.cli.add_command(deduplicar_documentos_command)
+    app.cli.add_command(trabajos_command)
+    app.cli.add_command(purgar_trabajos_command)
+
+
+@click.command('recalcular-carga')
+def recalcular_carga_command():
+    """Reconstruye la tabla carga_profesores desde los proyectos abiertos."""
+    from utils.carga import recalcular_carga
+    total = recalcular_carga()
+    click.echo(f'Carga recalculada para {total} profesor(es)')
+
+
+@click.command('deduplicar-documentos')
+def deduplicar_documentos_command():
+    """Mueve los documentos heredados al almacenamiento por contenido."""
+    import os
+    from app import db
+    from models.practica import Practica
+    from routes.documentos import DOCUMENT_TYPES
+    from utils.almacenamiento import (agregar_referencia, colocar_blob, descartar_temporal, es_hash,
+                                      escribir_temporal, ruta_documento)
+    
+    migrados = 0
+    for practica in Practica.query.all():
+        heredados = []
+        for tipo in DOCUMENT_TYPES:
+            valor = getattr(practica, tipo)
+            ruta = ruta_documento(valor)
+            if not valor or es_hash(valor) or not os.path.exists(ruta):
+                continue
+            with open(ruta, 'rb') as archivo:
+                sha256, tamano, temporal = escribir_temporal(archivo)
+            try:
+                agregar_referencia(sha256, tamano)
+                colocar_blob(sha256, temporal)
+            finally:
+                descartar_temporal(temporal)
+            setattr(practica, tipo, sha256)
+            heredados.append(ruta)
+        db.session.commit()
+        for ruta in heredados:
+            os.remove(ruta)
+        migrados += len(heredados)
+    click.echo(f'{migrados} documento(s) migrados al almacenamiento por contenido')
+
+
+@click.command('trabajos')
+@click.option('--hilos', default=1, show_default=True, help='Hilos trabajadores.')
+@click.option('--una-vez', is_flag=True, help='Procesa los pendientes y termina.')
+def trabajos_command(hilos, una_vez):
+    """Atiende la cola de trabajos en un proceso dedicado."""
+    import threading
+    from flask import current_app
+    from utils.trabajos import ejecutar_pendientes, iniciar_trabajadores, recuperar_interrumpidos
+    import utils.estadisticas  # noqa: F401
+    import utils.procesamiento_pdf  # noqa: F401
+    
+    app = current_app._get_current_object()
+    if una_vez:
+        recuperar_interrumpidos(app)
+        click.echo(f'{ejecutar_pendientes(app)} trabajo(s) procesados')
+        return
+    
+    iniciar_trabajadores(app, hilos=hilos)
+    click.echo(f'Atendiendo la cola con {hilos} hilo(s); Ctrl+C para salir')
+    threading.Event().wait()
+
+
+@click.command('purgar-trabajos')
+@click.option('--dias', type=float, default=None,
+              help='Antigüedad mínima en días (por defecto TRABAJOS_RETENCION_DIAS).')
+def purgar_trabajos_command(dias):
+    """Elimina los trabajos completados o fallidos antiguos."""
+    from flask import current_app
+    from utils.trabajos import purgar_terminados
+    
+    click.echo(f'{purgar_terminados(current_app, dias)} trabajo(s) eliminados')
@@ -1,12 +1,62 @@
-from os import environ
+from os import cpu_count, environ
+from os import path
 from dotenv import load_dotenv
 from datetime import timedelta
+from sqlalchemy.pool import NullPool
 
 load_dotenv()
 
+BASE_DIR = path.dirname(path.abspath(__file__))
+
+def _booleano(nombre, defecto=False):
+    return environ.get(nombre, str(defecto)).lower() in ('1', 'true', 'yes')
+
+def opciones_motor(url):
+    """SQLALCHEMY_ENGINE_OPTIONS a partir de variables de entorno."""
+    url = url or ''
+    opciones = {
+        'pool_pre_ping': _booleano('DB_POOL_PRE_PING', True),
+        'query_cache_size': int(environ.get('DB_QUERY_CACHE_SIZE', 500))
+    }
+    if url.startswith('sqlite'):
+        return opciones
+    
+    pgbouncer = _booleano('DB_PGBOUNCER')
+    if pgbouncer:
+        # PgBouncer ya mantiene el pool; cada checkout abre una conexión hacia él
+        opciones['poolclass'] = NullPool
+    else:
+        opciones.update({
+            'pool_size': int(environ.get('DB_POOL_SIZE', 5)),
+            'max_overflow': int(environ.get('DB_MAX_OVERFLOW', 10)),
+            'pool_timeout': int(environ.get('DB_POOL_TIMEOUT', 30)),
+            'pool_recycle': int(environ.get('DB_POOL_RECYCLE', 1800)),
+            'pool_use_lifo': True
+        })
+    
+    if url.startswith('postgresql+psycopg:'):
+        # psycopg 3 prepara en el servidor las sentencias repetidas tras N ejecuciones;
+        # en modo transacción de PgBouncer las sentencias preparadas no son seguras
+        umbral = environ.get('DB_PREPARE_THRESHOLD', '5')
+        opciones['connect_args'] = {
+            'prepare_threshold': None if pgbouncer or umbral.lower() == 'none' else int(umbral)
+        }
+    return opciones
+
+def binds_replicas(urls):
+    """Un bind 'replicaN' por cada URL de DB_REPLICA_URLS (separadas por comas)."""
+    urls = [url.strip() for url in (urls or '').split(',') if url.strip()]
+    return {f'replica{i}': {'url': url, **opciones_motor(url)} for i, url in enumerate(urls)}
+
 class Config:
     SQLALCHEMY_DATABASE_URI = environ.get('DB_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = opciones_motor(SQLALCHEMY_DATABASE_URI)
+    # Réplicas de lectura: los GET van a una de ellas salvo que la misma
+    # identidad JWT haya escrito en los últimos REPLICA_VENTANA_SEGUNDOS
+    SQLALCHEMY_BINDS = binds_replicas(environ.get('DB_REPLICA_URLS'))
+    REPLICA_VENTANA_SEGUNDOS = float(environ.get('REPLICA_VENTANA_SEGUNDOS', 5))
+    REPLICA_MARCAS_DIR = environ.get('REPLICA_MARCAS_DIR')
     SECRET_KEY = 'infuct1234'
     JWT_SECRET_KEY = 'infuctsecret24'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
@@ -14,6 +64,74 @@ class Config:
     JWT_HEADER_TYPE = 'Bearer'
     JWT_IDENTITY_CLAIM = 'sub'
     
+    # Presupuesto de consultas por endpoint: si es estricto, excederlo es un error
+    QUERY_BUDGET_STRICT = _booleano('QUERY_BUDGET_STRICT')
+    
+    # Usa la tabla carga_profesores (mantenida por las escrituras de proyectos)
+    # en vez de agregar la carga en cada consulta. Tras activarla: flask recalcular-carga
+    CARGA_PROFESORES_MANTENIDA = _booleano('CARGA_PROFESORES_MANTENIDA')
+    
+    # Los directorios se crean cuando se escribe el primer archivo, no al importar
+    UPLOAD_FOLDER = environ.get('UPLOAD_FOLDER') or path.join(BASE_DIR, 'uploads')
+    
+    PAGINACION_LIMITE = int(environ.get('PAGINACION_LIMITE', 100))
+    PAGINACION_LIMITE_MAXIMO = int(environ.get('PAGINACION_LIMITE_MAXIMO', 500))
+    NOTAS_POR_LOTE_MAXIMO = int(environ.get('NOTAS_POR_LOTE_MAXIMO', 1000))
+    
+    # Caché de respuestas GET con ETag; las versiones de las tablas están en la
+    # base de datos (tabla versiones), así valen en todos los procesos y servidores
+    RESPONSE_CACHE_ENABLED = _booleano('RESPONSE_CACHE_ENABLED', True)
+    RESPONSE_CACHE_SIZE = int(environ.get('RESPONSE_CACHE_SIZE', 256))
+    
+    # Cola de trabajos en segundo plano (tabla trabajos, sin broker externo).
+    # Con TRABAJOS_HILOS=0 la cola se atiende con: flask trabajos
+    TRABAJOS_HILOS = int(environ.get('TRABAJOS_HILOS', 1))
+    TRABAJOS_INTERVALO = float(environ.get('TRABAJOS_INTERVALO', 5))
+    TRABAJOS_MAX_INTENTOS = int(environ.get('TRABAJOS_MAX_INTENTOS', 3))
+    TRABAJOS_TIEMPO_MAXIMO = int(environ.get('TRABAJOS_TIEMPO_MAXIMO', 600))
+    # Los trabajos terminados se borran tras TRABAJOS_RETENCION_DIAS; los hilos
+    # trabajadores lo revisan cada TRABAJOS_PURGA_INTERVALO segundos
+    TRABAJOS_RETENCION_DIAS = float(environ.get('TRABAJOS_RETENCION_DIAS', 7))
+    TRABAJOS_PURGA_INTERVALO = float(environ.get('TRABAJOS_PURGA_INTERVALO', 3600))
+    
+    # Hash de contraseñas: método de werkzeug (p. ej. 'scrypt' o 'pbkdf2:sha256:600000')
+    # y pool acotado que lo ejecuta fuera de los hilos de las peticiones
+    PASSWORD_HASH_METHOD = environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+    PASSWORD_HASH_WORKERS = int(environ.get('PASSWORD_HASH_WORKERS', cpu_count() or 2))
+    PASSWORD_HASH_QUEUE = int(environ.get('PASSWORD_HASH_QUEUE', 16))
+    PASSWORD_HASH_TIMEOUT = float(environ.get('PASSWORD_HASH_TIMEOUT', 10))
+    
+    # /api/cambios no entrega registros más nuevos que esto (segundos), para no
+    # saltarse los de transacciones que confirman fuera de orden
+    CAMBIOS_MARGEN_SEGUNDOS = float(environ.get('CAMBIOS_MARGEN_SEGUNDOS', 1))
+    
+    # Canal /api/eventos (Server-Sent Events): cada worker atiende hasta
+    # EVENTOS_MAX_CLIENTES conexiones, cada una con hilo propio (gunicorn.conf.py
+    # lo limita a la mitad de GUNICORN_THREADS). EVENTOS_TOKEN_SEGUNDOS es la
+    # duración de los tokens de POST /api/eventos/token
+    EVENTOS_INTERVALO = float(environ.get('EVENTOS_INTERVALO', 1))
+    EVENTOS_HEARTBEAT = float(environ.get('EVENTOS_HEARTBEAT', 15))
+    EVENTOS_BUFFER = int(environ.get('EVENTOS_BUFFER', 100))
+    EVENTOS_MAX_CLIENTES = int(environ.get('EVENTOS_MAX_CLIENTES', 50))
+    EVENTOS_DURACION_MAXIMA = float(environ.get('EVENTOS_DURACION_MAXIMA', 300))
+    EVENTOS_REINTENTO_MS = int(environ.get('EVENTOS_REINTENTO_MS', 3000))
+    EVENTOS_TOKEN_SEGUNDOS = int(environ.get('EVENTOS_TOKEN_SEGUNDOS', 3600))
+    
+    # Compresión negociada (gzip, y brotli si está instalado) de las respuestas
+    # JSON de /api que superan COMPRESSION_MIN_SIZE bytes
+    COMPRESSION_ENABLED = _booleano('COMPRESSION_ENABLED', True)
+    COMPRESSION_MIN_SIZE = int(environ.get('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_GZIP_LEVEL = int(environ.get('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(environ.get('COMPRESSION_BROTLI_QUALITY', 5))
+    
+    # Serializa las respuestas con orjson si está instalado
+    JSON_ORJSON = _booleano('JSON_ORJSON', True)
+    
+    # Instrumentación: peticiones más lentas que esto (ms) se registran en el log.
+    # /api/metrics solo se sirve con METRICS_TOKEN y exige 'Authorization: Bearer <token>'
+    SLOW_REQUEST_MS = float(environ.get('SLOW_REQUEST_MS', 500))
+    METRICS_TOKEN = environ.get('METRICS_TOKEN')
+    
     CORS_ORIGINS = [
         "http://localhost:5173",
         "http://127.0.0.1:5173",
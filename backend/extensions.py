@@ -1,6 +1,24 @@
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_jwt_extended import JWTManager
+from flask_migrate import Migrate
+from sqlalchemy.sql.dml import UpdateBase
 
-db = SQLAlchemy()
-jwt = JWTManager()
 
+class SesionEnrutada(Session):
+    """Lee de la réplica indicada en info['replica'] (ver utils/replicas.py).
+
+    Escrituras, flush y SELECT ... FOR UPDATE van siempre a la primaria.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = self.info.get('replica')
+        if replica and bind is None and not self._flushing and not isinstance(clause, UpdateBase) \
+                and getattr(clause, '_for_update_arg', None) is None:
+            return self._db.engines[replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={'class_': SesionEnrutada})
+jwt = JWTManager()
+migrate = Migrate()
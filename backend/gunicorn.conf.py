@@ -0,0 +1,36 @@
+# Servidor de producción: gunicorn -c gunicorn.conf.py (desde backend/)
+from os import cpu_count, environ
+
+wsgi_app = 'wsgi:app'
+bind = environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# create_app() se carga una vez en el proceso maestro y los workers se bifurcan
+preload_app = True
+workers = int(environ.get('GUNICORN_WORKERS', (cpu_count() or 1) * 2 + 1))
+# Workers con hilos por defecto: una conexión larga (/api/eventos) ocupa un hilo y
+# no el worker entero, y no la corta el timeout del árbitro
+threads = int(environ.get('GUNICORN_THREADS', 4))
+worker_class = environ.get('GUNICORN_WORKER_CLASS', 'gthread' if threads > 1 else 'sync')
+# Los eventos usan como máximo la mitad de los hilos; el resto queda para la API
+environ.setdefault('EVENTOS_MAX_CLIENTES', str(max(1, threads // 2)))
+
+# Reciclar workers tras N peticiones acota el crecimiento de memoria
+max_requests = int(environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+timeout = int(environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(environ.get('GUNICORN_KEEPALIVE', 5))
+
+accesslog = environ.get('GUNICORN_ACCESSLOG', '-')
+errorlog = '-'
+loglevel = environ.get('GUNICORN_LOGLEVEL', 'info')
+
+
+def post_fork(server, worker):
+    # Las conexiones abiertas por el maestro no se comparten entre procesos
+    from wsgi import app
+    from extensions import db
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
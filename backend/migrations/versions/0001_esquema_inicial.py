@@ -0,0 +1,99 @@
+"""esquema inicial
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _crear_tabla(nombre, *columnas):
+    # Las bases creadas antes con db.create_all() ya tienen estas tablas
+    if not sa.inspect(op.get_bind()).has_table(nombre):
+        op.create_table(nombre, *columnas)
+
+
+def upgrade():
+    _crear_tabla(
+        'estudiantes',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('nombre', sa.String(length=100), nullable=False),
+        sa.Column('apellido', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False)
+    )
+    _crear_tabla(
+        'profesores',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('nombre', sa.String(length=100), nullable=False),
+        sa.Column('apellido', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('activo', sa.Boolean(), nullable=True)
+    )
+    _crear_tabla(
+        'secretarias',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('nombre', sa.String(length=100), nullable=False),
+        sa.Column('apellido', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False, unique=True),
+        sa.Column('contrasena', sa.String(length=255), nullable=False)
+    )
+    _crear_tabla(
+        'proyectos',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('titulo', sa.String(length=200), nullable=False),
+        sa.Column('descripcion', sa.Text(), nullable=True),
+        sa.Column('estudiante_id', sa.Integer(), sa.ForeignKey('estudiantes.id'), nullable=False),
+        sa.Column('profesor_guia_id', sa.Integer(), sa.ForeignKey('profesores.id'), nullable=False),
+        sa.Column('profesor_informante_id', sa.Integer(), sa.ForeignKey('profesores.id'), nullable=False),
+        sa.Column('nota', sa.Float(), nullable=True),
+        sa.Column('estado', sa.String(length=20), nullable=True)
+    )
+    _crear_tabla(
+        'practicas',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('estudiante_id', sa.Integer(), sa.ForeignKey('estudiantes.id'), nullable=False),
+        sa.Column('tipo_practica', sa.String(length=100), nullable=False),
+        sa.Column('empresa', sa.String(length=200), nullable=False),
+        sa.Column('fecha_inicio', sa.Date(), nullable=False),
+        sa.Column('fecha_termino', sa.Date(), nullable=False),
+        sa.Column('supervisor', sa.String(length=200), nullable=False),
+        sa.Column('contacto_supervisor', sa.String(length=200), nullable=False),
+        sa.Column('nota', sa.Float(), nullable=True),
+        sa.Column('carta_supervisor', sa.String(length=255), nullable=True),
+        sa.Column('certificado_alumno', sa.String(length=255), nullable=True),
+        sa.Column('formulario_inscripcion', sa.String(length=255), nullable=True),
+        sa.Column('autorizacion_empresa', sa.String(length=255), nullable=True)
+    )
+    _crear_tabla(
+        'participacion_profesores',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('profesor_id', sa.Integer(), sa.ForeignKey('profesores.id'), nullable=False),
+        sa.Column('proyecto_id', sa.Integer(), sa.ForeignKey('proyectos.id'), nullable=False),
+        sa.Column('rol', sa.String(length=100), nullable=False),
+        sa.Column('fecha_participacion', sa.Date(), nullable=False)
+    )
+    _crear_tabla(
+        'carga_profesores',
+        sa.Column('profesor_id', sa.Integer(), sa.ForeignKey('profesores.id'), primary_key=True),
+        sa.Column('proyectos_guiados', sa.Integer(), nullable=False),
+        sa.Column('proyectos_informados', sa.Integer(), nullable=False)
+    )
+
+
+def downgrade():
+    op.drop_table('carga_profesores')
+    op.drop_table('participacion_profesores')
+    op.drop_table('practicas')
+    op.drop_table('proyectos')
+    op.drop_table('secretarias')
+    op.drop_table('profesores')
+    op.drop_table('estudiantes')
@@ -0,0 +1,92 @@
+"""indices de consulta y tipo_practica como enum
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+TIPOS_PRACTICA = ('Inicial', 'Profesional')
+ABIERTOS = sa.text('nota IS NULL')
+
+
+def upgrade():
+    bind = op.get_bind()
+    
+    # Normaliza valores como 'inicial' o 'PROFESIONAL' antes de restringir el tipo
+    op.execute("""
+        UPDATE practicas SET tipo_practica = CASE lower(tipo_practica)
+            WHEN 'inicial' THEN 'Inicial'
+            WHEN 'profesional' THEN 'Profesional'
+            ELSE tipo_practica
+        END
+    """)
+    
+    duplicadas = bind.execute(sa.text("""
+        SELECT estudiante_id, tipo_practica FROM practicas
+        GROUP BY estudiante_id, tipo_practica HAVING count(*) > 1
+    """)).fetchall()
+    if duplicadas:
+        raise RuntimeError(
+            'Hay estudiantes con más de una práctica del mismo tipo; '
+            f'corrígelos antes de migrar: {[tuple(fila) for fila in duplicadas]}'
+        )
+    
+    tipo_practica = sa.Enum(*TIPOS_PRACTICA, name='tipo_practica')
+    if bind.dialect.name == 'postgresql':
+        tipo_practica.create(bind, checkfirst=True)
+    
+    with op.batch_alter_table('practicas') as batch_op:
+        batch_op.alter_column(
+            'tipo_practica',
+            existing_type=sa.String(length=100),
+            type_=tipo_practica,
+            existing_nullable=False,
+            postgresql_using='tipo_practica::tipo_practica'
+        )
+        batch_op.create_unique_constraint('uq_practicas_estudiante_tipo', ['estudiante_id', 'tipo_practica'])
+        batch_op.create_index('ix_practicas_tipo_practica_id', ['tipo_practica', 'id'])
+    
+    with op.batch_alter_table('proyectos') as batch_op:
+        batch_op.create_index('ix_proyectos_estudiante_id', ['estudiante_id'])
+        batch_op.create_index('ix_proyectos_profesor_guia_id', ['profesor_guia_id'])
+        batch_op.create_index('ix_proyectos_profesor_informante_id', ['profesor_informante_id'])
+        batch_op.create_index('ix_proyectos_abiertos', ['id'],
+                              postgresql_where=ABIERTOS, sqlite_where=ABIERTOS)
+        batch_op.create_index('ix_proyectos_abiertos_guia', ['profesor_guia_id'],
+                              postgresql_where=ABIERTOS, sqlite_where=ABIERTOS)
+        batch_op.create_index('ix_proyectos_abiertos_informante', ['profesor_informante_id'],
+                              postgresql_where=ABIERTOS, sqlite_where=ABIERTOS)
+
+
+def downgrade():
+    with op.batch_alter_table('proyectos') as batch_op:
+        batch_op.drop_index('ix_proyectos_abiertos_informante')
+        batch_op.drop_index('ix_proyectos_abiertos_guia')
+        batch_op.drop_index('ix_proyectos_abiertos')
+        batch_op.drop_index('ix_proyectos_profesor_informante_id')
+        batch_op.drop_index('ix_proyectos_profesor_guia_id')
+        batch_op.drop_index('ix_proyectos_estudiante_id')
+    
+    with op.batch_alter_table('practicas') as batch_op:
+        batch_op.drop_index('ix_practicas_tipo_practica_id')
+        batch_op.drop_constraint('uq_practicas_estudiante_tipo', type_='unique')
+        batch_op.alter_column(
+            'tipo_practica',
+            existing_type=sa.Enum(*TIPOS_PRACTICA, name='tipo_practica'),
+            type_=sa.String(length=100),
+            existing_nullable=False,
+            postgresql_using='tipo_practica::text'
+        )
+    
+    if op.get_bind().dialect.name == 'postgresql':
+        sa.Enum(name='tipo_practica').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,30 @@
+"""documentos por contenido con conteo de referencias
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'documentos',
+        sa.Column('sha256', sa.String(length=64), primary_key=True),
+        sa.Column('tamano', sa.BigInteger(), nullable=False),
+        sa.Column('referencias', sa.Integer(), nullable=False),
+        sa.Column('creado_en', sa.DateTime(), nullable=False)
+    )
+
+
+def downgrade():
+    op.drop_table('documentos')
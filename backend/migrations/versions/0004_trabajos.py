@@ -0,0 +1,49 @@
+"""cola de trabajos y metadatos de documentos
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'trabajos',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('tipo', sa.String(length=50), nullable=False),
+        sa.Column('datos', sa.JSON(), nullable=False),
+        sa.Column('estado', sa.String(length=20), nullable=False),
+        sa.Column('intentos', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('creado_en', sa.DateTime(), nullable=False),
+        sa.Column('iniciado_en', sa.DateTime(), nullable=True),
+        sa.Column('terminado_en', sa.DateTime(), nullable=True)
+    )
+    op.create_index('ix_trabajos_estado_id', 'trabajos', ['estado', 'id'])
+    
+    with op.batch_alter_table('documentos') as batch_op:
+        batch_op.add_column(sa.Column('paginas', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('valido', sa.Boolean(), nullable=True))
+        batch_op.add_column(sa.Column('version_pdf', sa.String(length=10), nullable=True))
+        batch_op.add_column(sa.Column('procesado_en', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('documentos') as batch_op:
+        batch_op.drop_column('procesado_en')
+        batch_op.drop_column('version_pdf')
+        batch_op.drop_column('valido')
+        batch_op.drop_column('paginas')
+    
+    op.drop_index('ix_trabajos_estado_id', table_name='trabajos')
+    op.drop_table('trabajos')
@@ -0,0 +1,44 @@
+"""búsqueda de texto: índices GIN en Postgres, tabla FTS5 en SQLite
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from utils.busqueda import (VECTOR_ESTUDIANTE, VECTOR_PRACTICA, VECTOR_PROYECTO,
+                            ddl_busqueda_sqlite, eliminar_busqueda_sqlite)
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+INDICES = (
+    ('ix_estudiantes_busqueda', 'estudiantes', VECTOR_ESTUDIANTE),
+    ('ix_practicas_busqueda', 'practicas', VECTOR_PRACTICA),
+    ('ix_proyectos_busqueda', 'proyectos', VECTOR_PROYECTO),
+)
+
+
+def upgrade():
+    dialecto = op.get_bind().dialect.name
+    if dialecto == 'postgresql':
+        for nombre, tabla, expresion in INDICES:
+            op.create_index(nombre, tabla, [sa.text(expresion)], postgresql_using='gin')
+    elif dialecto == 'sqlite':
+        for sentencia in ddl_busqueda_sqlite():
+            op.execute(sentencia)
+
+
+def downgrade():
+    dialecto = op.get_bind().dialect.name
+    if dialecto == 'postgresql':
+        for nombre, tabla, _ in INDICES:
+            op.drop_index(nombre, table_name=tabla)
+    elif dialecto == 'sqlite':
+        for sentencia in eliminar_busqueda_sqlite():
+            op.execute(sentencia)
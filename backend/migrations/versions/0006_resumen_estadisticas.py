@@ -0,0 +1,30 @@
+"""resumen de estadísticas precalculadas
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 12:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'resumen_estadisticas',
+        sa.Column('seccion', sa.String(length=50), primary_key=True),
+        sa.Column('datos', sa.JSON(), nullable=False),
+        sa.Column('versiones', sa.String(length=255), nullable=False),
+        sa.Column('calculado_en', sa.DateTime(), nullable=False)
+    )
+
+
+def downgrade():
+    op.drop_table('resumen_estadisticas')
@@ -0,0 +1,48 @@
+"""registro de cambios y columnas actualizado_en
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 13:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from utils.busqueda import ddl_busqueda_sqlite, eliminar_busqueda_sqlite
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+TABLAS = ('estudiantes', 'practicas', 'proyectos', 'profesores')
+
+
+def upgrade():
+    op.create_table(
+        'cambios',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('entidad', sa.String(length=50), nullable=False),
+        sa.Column('entidad_id', sa.Integer(), nullable=True),
+        sa.Column('accion', sa.String(length=20), nullable=False),
+        sa.Column('creado_en', sa.DateTime(), nullable=False)
+    )
+    
+    for tabla in TABLAS:
+        with op.batch_alter_table(tabla) as batch_op:
+            batch_op.add_column(sa.Column('actualizado_en', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    for tabla in TABLAS:
+        with op.batch_alter_table(tabla) as batch_op:
+            batch_op.drop_column('actualizado_en')
+    
+    # En SQLite quitar la columna recrea la tabla y con ella se pierden los
+    # triggers de la búsqueda; se reconstruye el índice FTS completo
+    if op.get_bind().dialect.name == 'sqlite':
+        for sentencia in eliminar_busqueda_sqlite() + ddl_busqueda_sqlite():
+            op.execute(sentencia)
+    
+    op.drop_table('cambios')
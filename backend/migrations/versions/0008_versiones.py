@@ -0,0 +1,28 @@
+"""versiones de las tablas en la base de datos
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 21:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'versiones',
+        sa.Column('recurso', sa.String(length=50), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False)
+    )
+
+
+def downgrade():
+    op.drop_table('versiones')
@@ -0,0 +1,23 @@
+from datetime import datetime
+from app import db
+
+ACCIONES_CAMBIO = ('creado', 'actualizado', 'eliminado', 'recargar')
+
+class Cambio(db.Model):
+    """Registro de escrituras; su id es el cursor de /api/cambios."""
+    __tablename__ = 'cambios'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    entidad = db.Column(db.String(50), nullable=False)
+    # Nulo en 'recargar': una escritura masiva sin ids conocidos
+    entidad_id = db.Column(db.Integer, nullable=True)
+    accion = db.Column(db.String(20), nullable=False)
+    creado_en = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'cursor': self.id,
+            'entidad': self.entidad,
+            'id': self.entidad_id,
+            'accion': self.accion
+        }
@@ -0,0 +1,15 @@
+from app import db
+
+class CargaProfesor(db.Model):
+    __tablename__ = 'carga_profesores'
+    
+    profesor_id = db.Column(db.Integer, db.ForeignKey('profesores.id'), primary_key=True)
+    proyectos_guiados = db.Column(db.Integer, nullable=False, default=0)
+    proyectos_informados = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self):
+        return {
+            'profesor_id': self.profesor_id,
+            'proyectos_guiados': self.proyectos_guiados,
+            'proyectos_informados': self.proyectos_informados
+        }
@@ -0,0 +1,28 @@
+from datetime import datetime
+from app import db
+
+class Documento(db.Model):
+    __tablename__ = 'documentos'
+    
+    sha256 = db.Column(db.String(64), primary_key=True)
+    tamano = db.Column(db.BigInteger, nullable=False)
+    referencias = db.Column(db.Integer, nullable=False, default=0)
+    creado_en = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Resultados del procesamiento en segundo plano (utils/procesamiento_pdf.py)
+    paginas = db.Column(db.Integer, nullable=True)
+    valido = db.Column(db.Boolean, nullable=True)
+    version_pdf = db.Column(db.String(10), nullable=True)
+    procesado_en = db.Column(db.DateTime, nullable=True)
+    
+    def to_dict(self):
+        return {
+            'sha256': self.sha256,
+            'tamano': self.tamano,
+            'referencias': self.referencias,
+            'creado_en': self.creado_en.isoformat(),
+            'paginas': self.paginas,
+            'valido': self.valido,
+            'version_pdf': self.version_pdf,
+            'procesado_en': self.procesado_en.isoformat() if self.procesado_en else None
+        }
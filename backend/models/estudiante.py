@@ -1,12 +1,20 @@
+from datetime import datetime
 from app import db
+from utils.busqueda import VECTOR_ESTUDIANTE
 
 class Estudiante(db.Model):
     __tablename__ = 'estudiantes'
+    __table_args__ = (
+        # Búsqueda de texto (Postgres); en SQLite se usa la tabla FTS5 busqueda
+        db.Index('ix_estudiantes_busqueda', db.text(VECTOR_ESTUDIANTE),
+                 postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     nombre = db.Column(db.String(100), nullable=False)
     apellido = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), nullable=False)
+    actualizado_en = db.Column(db.DateTime, nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def to_dict(self):
         return {
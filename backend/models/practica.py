@@ -1,11 +1,21 @@
+from datetime import datetime
 from app import db
+from utils.busqueda import VECTOR_PRACTICA
+
+TIPOS_PRACTICA = ('Inicial', 'Profesional')
 
 class Practica(db.Model):
     __tablename__ = 'practicas'
+    __table_args__ = (
+        db.UniqueConstraint('estudiante_id', 'tipo_practica', name='uq_practicas_estudiante_tipo'),
+        db.Index('ix_practicas_tipo_practica_id', 'tipo_practica', 'id'),
+        db.Index('ix_practicas_busqueda', db.text(VECTOR_PRACTICA),
+                 postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     estudiante_id = db.Column(db.Integer, db.ForeignKey('estudiantes.id'), nullable=False)
-    tipo_practica = db.Column(db.String(100), nullable=False)
+    tipo_practica = db.Column(db.Enum(*TIPOS_PRACTICA, name='tipo_practica'), nullable=False)
     empresa = db.Column(db.String(200), nullable=False)
     fecha_inicio = db.Column(db.Date, nullable=False)
     fecha_termino = db.Column(db.Date, nullable=False)
@@ -16,6 +26,7 @@ class Practica(db.Model):
     certificado_alumno = db.Column(db.String(255), nullable=True)
     formulario_inscripcion = db.Column(db.String(255), nullable=True)
     autorizacion_empresa = db.Column(db.String(255), nullable=True)
+    actualizado_en = db.Column(db.DateTime, nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relación
     estudiante = db.relationship('Estudiante', foreign_keys=[estudiante_id])
@@ -1,3 +1,4 @@
+from datetime import datetime
 from app import db
 
 class Profesor(db.Model):
@@ -8,6 +9,7 @@ class Profesor(db.Model):
     apellido = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), nullable=False)
     activo = db.Column(db.Boolean, default=True)
+    actualizado_en = db.Column(db.DateTime, nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def to_dict(self):
         return {
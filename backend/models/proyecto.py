@@ -1,7 +1,23 @@
+from datetime import datetime
 from app import db
+from utils.busqueda import VECTOR_PROYECTO
 
 class Proyecto(db.Model):
     __tablename__ = 'proyectos'
+    __table_args__ = (
+        db.Index('ix_proyectos_estudiante_id', 'estudiante_id'),
+        db.Index('ix_proyectos_profesor_guia_id', 'profesor_guia_id'),
+        db.Index('ix_proyectos_profesor_informante_id', 'profesor_informante_id'),
+        # Índices parciales sobre los proyectos abiertos (sin nota)
+        db.Index('ix_proyectos_abiertos', 'id',
+                 postgresql_where=db.text('nota IS NULL'), sqlite_where=db.text('nota IS NULL')),
+        db.Index('ix_proyectos_abiertos_guia', 'profesor_guia_id',
+                 postgresql_where=db.text('nota IS NULL'), sqlite_where=db.text('nota IS NULL')),
+        db.Index('ix_proyectos_abiertos_informante', 'profesor_informante_id',
+                 postgresql_where=db.text('nota IS NULL'), sqlite_where=db.text('nota IS NULL')),
+        db.Index('ix_proyectos_busqueda', db.text(VECTOR_PROYECTO),
+                 postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     titulo = db.Column(db.String(200), nullable=False)
@@ -11,6 +27,7 @@ class Proyecto(db.Model):
     profesor_informante_id = db.Column(db.Integer, db.ForeignKey('profesores.id'), nullable=False)
     nota = db.Column(db.Float, nullable=True)  
     estado = db.Column(db.String(20), nullable=True) 
+    actualizado_en = db.Column(db.DateTime, nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relaciones
     estudiante = db.relationship('Estudiante', foreign_keys=[estudiante_id])
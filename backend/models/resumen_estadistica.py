@@ -0,0 +1,11 @@
+from datetime import datetime
+from app import db
+
+class ResumenEstadistica(db.Model):
+    __tablename__ = 'resumen_estadisticas'
+    
+    seccion = db.Column(db.String(50), primary_key=True)
+    datos = db.Column(db.JSON, nullable=False)
+    # Versiones de las tablas de origen con que se calculó (utils/cache.py)
+    versiones = db.Column(db.String(255), nullable=False)
+    calculado_en = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
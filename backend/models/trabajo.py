@@ -0,0 +1,33 @@
+from datetime import datetime
+from app import db
+
+ESTADOS_TRABAJO = ('pendiente', 'en_proceso', 'completado', 'fallido')
+
+class Trabajo(db.Model):
+    __tablename__ = 'trabajos'
+    __table_args__ = (
+        db.Index('ix_trabajos_estado_id', 'estado', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    tipo = db.Column(db.String(50), nullable=False)
+    datos = db.Column(db.JSON, nullable=False, default=dict)
+    estado = db.Column(db.String(20), nullable=False, default='pendiente')
+    intentos = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    creado_en = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    iniciado_en = db.Column(db.DateTime, nullable=True)
+    terminado_en = db.Column(db.DateTime, nullable=True)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'tipo': self.tipo,
+            'datos': self.datos,
+            'estado': self.estado,
+            'intentos': self.intentos,
+            'error': self.error,
+            'creado_en': self.creado_en.isoformat(),
+            'iniciado_en': self.iniciado_en.isoformat() if self.iniciado_en else None,
+            'terminado_en': self.terminado_en.isoformat() if self.terminado_en else None
+        }
@@ -0,0 +1,8 @@
+from app import db
+
+class VersionRecurso(db.Model):
+    """Versión de cada tabla; toda escritura confirmada la sube (utils/cache.py)."""
+    __tablename__ = 'versiones'
+    
+    recurso = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
@@ -1,8 +1,8 @@
 from flask import Blueprint, jsonify, request
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_jwt_extended import create_access_token, jwt_required
 from models.secretaria import Secretaria
 from app import db
+from utils.seguridad import ServidorOcupado, generar_hash, necesita_rehash, verificar_contrasena
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -29,7 +29,7 @@ def registrar_secretaria():
             nombre=data['nombre'],
             apellido=data['apellido'],
             email=data['email'],
-            contrasena=generate_password_hash(data['contrasena'])
+            contrasena=generar_hash(data['contrasena'])
         )
         
         db.session.add(nueva_secretaria)
@@ -44,6 +44,12 @@ def registrar_secretaria():
             'status': 'success'
         }), 201
         
+    except ServidorOcupado as e:
+        db.session.rollback()
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 503
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -64,12 +70,17 @@ def login_secretaria():
         
         secretaria = Secretaria.query.filter_by(email=data['email']).first()
         
-        if not secretaria or not check_password_hash(secretaria.contrasena, data['contrasena']):
+        if not secretaria or not verificar_contrasena(secretaria.contrasena, data['contrasena']):
             return jsonify({
                 'error': 'Credenciales inválidas',
                 'status': 'error'
             }), 401
         
+        # Si cambió el método o el costo configurado, se actualiza el hash
+        if necesita_rehash(secretaria.contrasena):
+            secretaria.contrasena = generar_hash(data['contrasena'])
+            db.session.commit()
+        
         access_token = create_access_token(identity=str(secretaria.id))
         
         return jsonify({
@@ -79,7 +90,14 @@ def login_secretaria():
             'status': 'success'
         }), 200
         
+    except ServidorOcupado as e:
+        db.session.rollback()
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 503
     except Exception as e:
+        db.session.rollback()
         return jsonify({
             'error': str(e),
             'status': 'error'
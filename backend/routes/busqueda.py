@@ -0,0 +1,54 @@
+from flask import Blueprint, jsonify, request
+from utils.busqueda import TIPOS_BUSQUEDA, buscar, terminos
+from utils.cache import respuesta_cacheable
+from utils.consultas import presupuesto_consultas
+from utils.paginacion import ParametroInvalido, entero
+
+busqueda_bp = Blueprint('busqueda', __name__)
+
+LIMITE_BUSQUEDA = 20
+LIMITE_BUSQUEDA_MAXIMO = 100
+
+@busqueda_bp.route('/buscar', methods=['GET'])
+@respuesta_cacheable('estudiantes', 'practicas', 'proyectos')
+@presupuesto_consultas(1)
+def buscar_registros():
+    try:
+        palabras = terminos(request.args.get('q'))
+        if not palabras:
+            raise ParametroInvalido('El parámetro q es obligatorio')
+        
+        tipos = request.args.get('tipo')
+        tipos = [tipo.strip() for tipo in tipos.split(',')] if tipos else list(TIPOS_BUSQUEDA)
+        for tipo in tipos:
+            if tipo not in TIPOS_BUSQUEDA:
+                raise ParametroInvalido(f'Tipo de búsqueda no válido: {tipo}')
+        
+        limite = entero(request.args.get('limit', LIMITE_BUSQUEDA), 'limit')
+        offset = entero(request.args.get('offset', 0), 'offset')
+        if limite < 1 or offset < 0:
+            raise ParametroInvalido('limit debe ser mayor que 0 y offset no puede ser negativo')
+        limite = min(limite, LIMITE_BUSQUEDA_MAXIMO)
+        
+        resultados = buscar(palabras, tipos, limite, offset)
+        hay_mas = len(resultados) > limite
+        
+        return jsonify({
+            'data': resultados[:limite],
+            'paginacion': {
+                'limit': limite,
+                'offset': offset,
+                'siguiente': offset + limite if hay_mas else None
+            },
+            'status': 'success'
+        }), 200
+    except ParametroInvalido as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
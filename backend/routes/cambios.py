@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required
+from utils.cambios import ENTIDADES, cambios_desde, cursor_actual, filas_actuales
+from utils.paginacion import ParametroInvalido, entero
+
+cambios_bp = Blueprint('cambios', __name__)
+
+@cambios_bp.route('/cambios', methods=['GET'])
+@jwt_required()
+def obtener_cambios():
+    """Filas creadas, actualizadas o eliminadas después de ?since=<cursor>.
+
+    Sin since solo se devuelve el cursor actual: el cliente carga las listas
+    completas una vez y desde ahí pide los cambios.
+    """
+    try:
+        since = request.args.get('since')
+        if since is None:
+            return jsonify({
+                'data': {'cursor': cursor_actual(), 'hay_mas': False},
+                'status': 'success'
+            }), 200
+        
+        cursor = entero(since, 'since')
+        limite = entero(request.args.get('limit', current_app.config['PAGINACION_LIMITE']), 'limit')
+        if limite < 1:
+            raise ParametroInvalido('El parámetro limit debe ser mayor que 0')
+        limite = min(limite, current_app.config['PAGINACION_LIMITE_MAXIMO'])
+        
+        registros = cambios_desde(cursor, limite)
+        hay_mas = len(registros) > limite
+        registros = registros[:limite]
+        
+        # Solo importa la última acción sobre cada fila dentro del lote
+        ultimas = OrderedDict()
+        recargar = set()
+        for registro in registros:
+            if registro.accion == 'recargar':
+                recargar.add(registro.entidad)
+            else:
+                ultimas[(registro.entidad, registro.entidad_id)] = registro.accion
+        
+        actualizados = {entidad: [] for entidad in ENTIDADES}
+        eliminados = {entidad: [] for entidad in ENTIDADES}
+        for (entidad, entidad_id), accion in ultimas.items():
+            if entidad in recargar:
+                continue
+            (eliminados if accion == 'eliminado' else actualizados)[entidad].append(entidad_id)
+        
+        datos = {
+            'cursor': registros[-1].id if registros else cursor,
+            'hay_mas': hay_mas,
+            'actualizados': {entidad: filas_actuales(entidad, ids) if ids else []
+                             for entidad, ids in actualizados.items()},
+            'eliminados': eliminados,
+            'recargar': sorted(recargar)
+        }
+        return jsonify({
+            'data': datos,
+            'status': 'success'
+        }), 200
+        
+    except ParametroInvalido as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
@@ -1,16 +1,25 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, Response, request, jsonify, send_file, stream_with_context
 import os
 from werkzeug.utils import secure_filename
 from flask_jwt_extended import jwt_required
 from app import db
 from models.practica import Practica
+from models.estudiante import Estudiante
+from utils.almacenamiento import (agregar_referencia, colocar_blob, descartar_temporal,
+                                  escribir_temporal, programar_borrado, quitar_referencia,
+                                  ruta_blob, ruta_documento, ruta_relativa, es_hash)
+from utils.filtros import filtrar_practicas
+from utils.paginacion import ParametroInvalido
+from utils.zip_streaming import zip_en_streaming
+from utils.trabajos import encolar
+import utils.procesamiento_pdf  # noqa: F401  registra el manejador procesar_documento
 
 documentos_bp = Blueprint('documentos', __name__)
 
-UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf'}
 
-# Crear subdirectorios para cada tipo de documento
+# Subdirectorios heredados de cada tipo de documento; los archivos nuevos se
+# guardan una sola vez por contenido en uploads/blobs
 DOCUMENT_TYPES = {
     'carta_supervisor': 'cartas_supervisor',
     'certificado_alumno': 'certificados_alumno',
@@ -18,27 +27,34 @@ DOCUMENT_TYPES = {
     'autorizacion_empresa': 'autorizaciones_empresa'
 }
 
-# Crear directorios si no existen
-for doc_type in DOCUMENT_TYPES.values():
-    path = os.path.join(UPLOAD_FOLDER, doc_type)
-    if not os.path.exists(path):
-        os.makedirs(path)
-
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def save_document(file, practica_id, doc_type):
-    if file and allowed_file(file.filename):
-        filename = secure_filename(f"practica_{practica_id}_{file.filename}")
-        subfolder = DOCUMENT_TYPES.get(doc_type)
-        if not subfolder:
-            return None
-            
-        filepath = os.path.join(UPLOAD_FOLDER, subfolder, filename)
-        file.save(filepath)
-        return filepath
+def save_document(file, doc_type):
+    """Copia el archivo a un temporal junto a los blobs, sin tocar la base de datos."""
+    if file and allowed_file(file.filename) and doc_type in DOCUMENT_TYPES:
+        return escribir_temporal(file.stream)
     return None
 
+def registrar_documento(sha256, tamano, temporal):
+    """Suma la referencia y, con la fila del documento bloqueada, coloca el blob."""
+    if agregar_referencia(sha256, tamano):
+        # Validación y conteo de páginas fuera de la petición
+        encolar('procesar_documento', sha256=sha256)
+    return colocar_blob(sha256, temporal)
+
+def info_documentos(practica, metadatos):
+    return {
+        tipo: metadatos.get(getattr(practica, tipo))
+        for tipo in DOCUMENT_TYPES
+        if getattr(practica, tipo)
+    }
+
+def nombre_descarga(valor, practica_id, doc_type):
+    if es_hash(valor):
+        return secure_filename(f"practica_{practica_id}_{doc_type}.pdf")
+    return os.path.basename(ruta_documento(valor))
+
 @documentos_bp.route('/documentos/subir/<string:tipo>/<int:practica_id>', methods=['POST'])
 @jwt_required()
 def subir_documento(tipo, practica_id):
@@ -62,27 +78,48 @@ def subir_documento(tipo, practica_id):
                 'status': 'success'
             }), 200
 
-        practica = Practica.query.get_or_404(practica_id)
-        
-        # Si ya existe un archivo anterior, eliminarlo
-        filepath_anterior = getattr(practica, tipo)
-        if filepath_anterior and os.path.exists(filepath_anterior):
-            os.remove(filepath_anterior)
+        # Una consulta por clave primaria evita transferir el archivo a una
+        # práctica inexistente; la conexión se devuelve antes de la transferencia
+        existe = db.session.query(Practica.id).filter_by(id=practica_id).scalar()
+        db.session.close()
+        if existe is None:
+            return jsonify({
+                'error': 'Práctica no encontrada',
+                'status': 'error'
+            }), 404
 
-        filepath = save_document(file, practica_id, tipo)
+        guardado = save_document(file, tipo)
         
-        if not filepath:
+        if not guardado:
             return jsonify({
                 'message': 'Tipo de archivo no permitido',
                 'status': 'error'
             }), 400
 
-        setattr(practica, tipo, filepath)
-        db.session.commit()
+        sha256, tamano, temporal = guardado
+        colocado = False
+        try:
+            practica = Practica.query.get_or_404(practica_id)
+            colocado = registrar_documento(sha256, tamano, temporal)
+            # El archivo anterior se borra tras el commit, y solo si ninguna otra
+            # práctica lo referencia
+            programar_borrado(quitar_referencia(getattr(practica, tipo)))
+            setattr(practica, tipo, sha256)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            if colocado:
+                # El blob recién colocado quedó sin referencia; se limpia en diferido
+                programar_borrado(ruta_blob(sha256))
+                db.session.commit()
+            raise
+        finally:
+            descartar_temporal(temporal)
 
         return jsonify({
             'message': 'Documento subido exitosamente',
-            'filepath': filepath,
+            'filepath': ruta_relativa(ruta_blob(sha256)),
+            'sha256': sha256,
             'tipo': tipo,
             'practica_id': practica_id,
             'status': 'success'
@@ -106,7 +143,8 @@ def descargar_documento(tipo, practica_id):
             }), 400
 
         practica = Practica.query.get_or_404(practica_id)
-        filepath = getattr(practica, tipo)
+        valor = getattr(practica, tipo)
+        filepath = ruta_documento(valor)
 
         if not filepath or not os.path.exists(filepath):
             return jsonify({
@@ -114,18 +152,22 @@ def descargar_documento(tipo, practica_id):
                 'status': 'error'
             }), 404
 
-        # Agregar headers para permitir la visualización en el navegador
+        # conditional=True responde Range con 206 e If-None-Match/If-Modified-Since con 304
         response = send_file(
             filepath,
             mimetype='application/pdf',
             as_attachment=False,  # Permite visualización en el navegador
-            download_name=os.path.basename(filepath)
+            download_name=nombre_descarga(valor, practica_id, tipo),
+            conditional=True,
+            etag=valor if es_hash(valor) else True
         )
         
-        # Agregar headers para el control de caché
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
+        # El navegador puede guardar el PDF pero debe revalidarlo; la ETag cambia
+        # cuando subir_documento reemplaza el archivo
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        response.cache_control.public = False
+        response.cache_control.max_age = None
         
         return response
 
@@ -146,10 +188,10 @@ def eliminar_documento(tipo, practica_id):
             }), 400
 
         practica = Practica.query.get_or_404(practica_id)
-        filepath = getattr(practica, tipo)
+        valor = getattr(practica, tipo)
 
-        if filepath and os.path.exists(filepath):
-            os.remove(filepath)
+        if valor:
+            programar_borrado(quitar_referencia(valor))
             setattr(practica, tipo, None)
             db.session.commit()
 
@@ -160,6 +202,55 @@ def eliminar_documento(tipo, practica_id):
 
     except Exception as e:
         db.session.rollback()
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+def _entradas_zip(filas, tipos):
+    for fila in filas:
+        for tipo in tipos:
+            filepath = ruta_documento(getattr(fila, tipo))
+            if filepath and os.path.exists(filepath):
+                nombre = secure_filename(
+                    f"{fila.apellido}_{fila.nombre}_practica_{fila.id}_{tipo}.pdf"
+                )
+                yield nombre, filepath
+
+@documentos_bp.route('/documentos/zip', methods=['GET'])
+@jwt_required()
+def descargar_documentos_zip():
+    try:
+        tipos = request.args.get('tipos')
+        tipos = [tipo for tipo in tipos.split(',') if tipo] if tipos else list(DOCUMENT_TYPES)
+        invalidos = [tipo for tipo in tipos if tipo not in DOCUMENT_TYPES]
+        if invalidos:
+            return jsonify({
+                'error': f"Tipo de documento no válido: {', '.join(invalidos)}",
+                'status': 'error'
+            }), 400
+        
+        query = db.session.query(
+            Practica.id,
+            Estudiante.nombre,
+            Estudiante.apellido,
+            *[getattr(Practica, tipo) for tipo in DOCUMENT_TYPES]
+        ).join(Practica.estudiante)
+        query = filtrar_practicas(query, request.args).order_by(Practica.id)
+        
+        filas = query.yield_per(500)
+        return Response(
+            stream_with_context(zip_en_streaming(_entradas_zip(filas, tipos))),
+            mimetype='application/zip',
+            headers={'Content-Disposition': 'attachment; filename=documentos.zip'}
+        )
+        
+    except ParametroInvalido as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+    except Exception as e:
         return jsonify({
             'error': str(e),
             'status': 'error'
@@ -0,0 +1,23 @@
+from flask import Blueprint, jsonify
+from utils.cache import respuesta_cacheable
+from utils.consultas import presupuesto_consultas
+from utils.estadisticas import obtener_estadisticas
+
+estadisticas_bp = Blueprint('estadisticas', __name__)
+
+# Presupuesto: 2 consultas con el resumen al día; recalcular todas las secciones y
+# encolar el refresco toma 8
+@estadisticas_bp.route('/estadisticas', methods=['GET'])
+@respuesta_cacheable('proyectos', 'practicas', 'profesores', 'carga_profesores')
+@presupuesto_consultas(10)
+def obtener_estadisticas_departamento():
+    try:
+        return jsonify({
+            'data': obtener_estadisticas(),
+            'status': 'success'
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
@@ -1,16 +1,32 @@
 from flask import Blueprint, jsonify
 from models.estudiante import Estudiante
+from utils.paginacion import ParametroInvalido, paginar
+from utils.filtros import ORDEN_ESTUDIANTES
+from utils.cache import respuesta_cacheable
+from utils.consultas import presupuesto_consultas
+from utils.serializadores import COLUMNAS_ESTUDIANTE, serializar_estudiante
 
 estudiantes_bp = Blueprint('estudiantes', __name__)
 
 @estudiantes_bp.route('/estudiantes', methods=['GET'])
+@respuesta_cacheable('estudiantes')
+@presupuesto_consultas(1)
 def obtener_estudiantes():
     try:
-        estudiantes = Estudiante.query.all()
-        return jsonify({
-            'data': [estudiante.to_dict() for estudiante in estudiantes],
+        estudiantes, paginacion = paginar(Estudiante.query.with_entities(*COLUMNAS_ESTUDIANTE), Estudiante.id,
+                                          ORDEN_ESTUDIANTES)
+        respuesta = {
+            'data': [serializar_estudiante(estudiante) for estudiante in estudiantes],
             'status': 'success'
-        }), 200
+        }
+        if paginacion:
+            respuesta['paginacion'] = paginacion
+        return jsonify(respuesta), 200
+    except ParametroInvalido as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
     except Exception as e:
         return jsonify({
             'error': str(e),
@@ -0,0 +1,129 @@
+import json
+import time
+from datetime import timedelta
+from flask import Blueprint, current_app, jsonify, request, stream_with_context
+from flask_jwt_extended import (create_access_token, get_jwt, get_jwt_identity,
+                                get_jwt_request_location, jwt_required)
+from app import db
+from extensions import jwt
+from utils.cambios import cambios_desde
+from utils.eventos import ServidorLleno, difusor
+from utils.paginacion import ParametroInvalido, entero
+
+eventos_bp = Blueprint('eventos', __name__)
+
+# Claim de los tokens de corta duración que EventSource lleva en la URL
+USO_EVENTOS = 'eventos'
+
+
+@jwt.token_verification_loader
+def _token_de_eventos_solo_para_eventos(jwt_header, jwt_data):
+    # Un token de eventos queda en logs y cachés de URL: no sirve para el resto de la API
+    return jwt_data.get('uso') != USO_EVENTOS or request.endpoint == 'eventos.transmitir_eventos'
+
+
+def _mensaje(evento):
+    return f"id: {evento['cursor']}\nevent: cambio\ndata: {json.dumps(evento, separators=(',', ':'))}\n\n"
+
+
+@eventos_bp.route('/eventos/token', methods=['POST'])
+@jwt_required()
+def obtener_token_eventos():
+    """Token para ?jwt= de /api/eventos: solo vale para el canal y expira pronto."""
+    segundos = current_app.config['EVENTOS_TOKEN_SEGUNDOS']
+    token = create_access_token(identity=get_jwt_identity(), expires_delta=timedelta(seconds=segundos),
+                                additional_claims={'uso': USO_EVENTOS})
+    return jsonify({
+        'data': {'token': token, 'expira_en': segundos},
+        'status': 'success'
+    }), 200
+
+# EventSource no permite cabeceras: se acepta ?jwt= solo con un token de eventos
+@eventos_bp.route('/eventos', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def transmitir_eventos():
+    if get_jwt_request_location() == 'query_string' and get_jwt().get('uso') != USO_EVENTOS:
+        return jsonify({
+            'error': 'En ?jwt= solo se acepta un token de POST /api/eventos/token',
+            'status': 'error'
+        }), 401
+    
+    # Un worker sync (sin hilos) quedaría tomado por la conexión entera
+    if not request.environ.get('wsgi.multithread'):
+        return jsonify({
+            'error': 'El canal de eventos requiere workers con hilos (GUNICORN_THREADS > 1)',
+            'status': 'error'
+        }), 503
+    
+    try:
+        ultimo = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        ultimo = entero(ultimo, 'Last-Event-ID') if ultimo else None
+    except ParametroInvalido as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+    
+    app = current_app._get_current_object()
+    
+    # Al reconectar se reenvía lo ocurrido desde Last-Event-ID; si es demasiado
+    # el cliente debe recargar. La consulta se hace antes de suscribirse, así
+    # un error aquí no deja un suscriptor ocupando cupo, y la conexión vuelve
+    # al pool antes de empezar a transmitir.
+    pendientes, recargar = [], False
+    if ultimo is not None:
+        registros = cambios_desde(ultimo, app.config['EVENTOS_BUFFER'])
+        recargar = len(registros) > app.config['EVENTOS_BUFFER']
+        pendientes = [registro.to_dict() for registro in registros[:app.config['EVENTOS_BUFFER']]]
+    db.session.close()
+    
+    try:
+        suscriptor = difusor.suscribir(app)
+    except ServidorLleno as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 503
+    
+    def generar():
+        enviado = ultimo or 0
+        inicio = latido = time.monotonic()
+        try:
+            yield f"retry: {app.config['EVENTOS_REINTENTO_MS']}\n\n"
+            if recargar:
+                yield 'event: recargar\ndata: {}\n\n'
+                return
+            while True:
+                if suscriptor.desbordado:
+                    # El cliente no alcanza a leer: que recargue y se reconecte
+                    yield 'event: recargar\ndata: {}\n\n'
+                    return
+                for evento in pendientes + suscriptor.tomar():
+                    if evento['cursor'] > enviado:
+                        enviado = evento['cursor']
+                        yield _mensaje(evento)
+                pendientes.clear()
+                
+                ahora = time.monotonic()
+                # Cerrar de vez en cuando libera el hilo; el navegador se
+                # reconecta solo enviando Last-Event-ID
+                if ahora - inicio >= app.config['EVENTOS_DURACION_MAXIMA']:
+                    return
+                if ahora - latido >= app.config['EVENTOS_HEARTBEAT']:
+                    latido = ahora
+                    yield ': ping\n\n'
+                suscriptor.esperar(app.config['EVENTOS_HEARTBEAT'])
+        finally:
+            difusor.desuscribir(suscriptor)
+    
+    try:
+        respuesta = current_app.response_class(stream_with_context(generar()), mimetype='text/event-stream')
+        # Si la respuesta se cierra antes del primer next() el finally de
+        # generar() nunca corre: se libera el cupo también al cerrar
+        respuesta.call_on_close(lambda: difusor.desuscribir(suscriptor))
+    except Exception:
+        difusor.desuscribir(suscriptor)
+        raise
+    respuesta.headers['Cache-Control'] = 'no-cache'
+    respuesta.headers['X-Accel-Buffering'] = 'no'
+    return respuesta
@@ -1,41 +1,65 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
 from models.practica import Practica
 from models.estudiante import Estudiante
+from routes.documentos import DOCUMENT_TYPES, info_documentos
 from datetime import datetime
 from app import db
+from utils.consultas import presupuesto_consultas
+from utils.paginacion import ParametroInvalido, paginar
+from utils.filtros import ORDEN_PRACTICAS, filtrar_practicas
+from utils.notas import con_errores, marcar_inexistentes, validar_notas
+from utils.exportacion import respuesta_csv
+from utils.cache import respuesta_cacheable
+from utils.serializadores import consulta_practicas, serializar_practica
+from utils.almacenamiento import metadatos_documentos, programar_borrado, quitar_referencia
 
 practicas_bp = Blueprint('practicas', __name__)
 
+COLUMNAS_EXPORTACION = [
+    ('id', Practica.id),
+    ('tipo_practica', Practica.tipo_practica),
+    ('estudiante_nombre', Estudiante.nombre),
+    ('estudiante_apellido', Estudiante.apellido),
+    ('estudiante_email', Estudiante.email),
+    ('empresa', Practica.empresa),
+    ('fecha_inicio', Practica.fecha_inicio),
+    ('fecha_termino', Practica.fecha_termino),
+    ('supervisor', Practica.supervisor),
+    ('contacto_supervisor', Practica.contacto_supervisor),
+    ('nota', Practica.nota)
+]
+
 @practicas_bp.route('/practicas/inicial', methods=['GET'])
+@respuesta_cacheable('practicas', 'estudiantes', 'documentos')
+@presupuesto_consultas(2)
 def obtener_practicas_iniciales():
     try:
-        practicas = Practica.query.filter(Practica.tipo_practica.ilike('inicial')).all()
-        
-        resultado = []
-        for practica in practicas:
-            practica_info = {
-                'id': practica.id,
-                'estudiante': f"{practica.estudiante.nombre} {practica.estudiante.apellido}",
-                'estudiante_email': practica.estudiante.email,
-                'empresa': practica.empresa,
-                'fecha_inicio': practica.fecha_inicio.strftime('%Y-%m-%d'),
-                'fecha_termino': practica.fecha_termino.strftime('%Y-%m-%d'),
-                'supervisor': practica.supervisor,
-                'contacto_supervisor': practica.contacto_supervisor,
-                'nota': practica.nota if practica.nota else None,
-                'carta_supervisor': practica.carta_supervisor,
-                'certificado_alumno': practica.certificado_alumno,
-                'formulario_inscripcion': practica.formulario_inscripcion,
-                'autorizacion_empresa': practica.autorizacion_empresa
-            }
-            resultado.append(practica_info)
-            
-        return jsonify({
+        query = consulta_practicas().filter(Practica.tipo_practica == 'Inicial')
+        practicas, paginacion = paginar(filtrar_practicas(query, request.args), Practica.id, ORDEN_PRACTICAS)
+        
+        metadatos = metadatos_documentos(
+            getattr(practica, tipo) for practica in practicas for tipo in DOCUMENT_TYPES
+        )
+        
+        resultado = [serializar_practica(practica, info_documentos(practica, metadatos))
+                     for practica in practicas]
+        
+        respuesta = {
             'data': resultado,
             'status': 'success'
-        }), 200
+        }
+        if paginacion:
+            respuesta['paginacion'] = paginacion
+        return jsonify(respuesta), 200
         
+    except ParametroInvalido as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
     except Exception as e:
         return jsonify({
             'error': str(e),
@@ -73,17 +97,6 @@ def crear_practica_inicial():
                 'status': 'error'
             }), 404
             
-        practica_existente = Practica.query.filter_by(
-            estudiante_id=data['estudiante_id'],
-            tipo_practica='Inicial'
-        ).first()
-        
-        if practica_existente:
-            return jsonify({
-                'error': 'El estudiante ya tiene una práctica inicial registrada',
-                'status': 'error'
-            }), 400
-
         nueva_practica = Practica(
             estudiante_id=data['estudiante_id'],
             tipo_practica='Inicial',
@@ -95,7 +108,15 @@ def crear_practica_inicial():
         )
         
         db.session.add(nueva_practica)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # uq_practicas_estudiante_tipo: una práctica de cada tipo por estudiante
+            db.session.rollback()
+            return jsonify({
+                'error': 'El estudiante ya tiene una práctica inicial registrada',
+                'status': 'error'
+            }), 400
         
         return jsonify({
             'message': 'Práctica inicial creada exitosamente',
@@ -115,34 +136,33 @@ def crear_practica_inicial():
         }), 500
 
 @practicas_bp.route('/practicas/profesional', methods=['GET'])
+@respuesta_cacheable('practicas', 'estudiantes', 'documentos')
+@presupuesto_consultas(2)
 def obtener_practicas_profesionales():
     try:
-        practicas = Practica.query.filter(Practica.tipo_practica.ilike('profesional')).all()
-        
-        resultado = []
-        for practica in practicas:
-            practica_info = {
-                'id': practica.id,
-                'estudiante': f"{practica.estudiante.nombre} {practica.estudiante.apellido}",
-                'estudiante_email': practica.estudiante.email,
-                'empresa': practica.empresa,
-                'fecha_inicio': practica.fecha_inicio.strftime('%Y-%m-%d'),
-                'fecha_termino': practica.fecha_termino.strftime('%Y-%m-%d'),
-                'supervisor': practica.supervisor,
-                'contacto_supervisor': practica.contacto_supervisor,
-                'nota': practica.nota if practica.nota else None,
-                'carta_supervisor': practica.carta_supervisor if hasattr(practica, 'carta_supervisor') else None,
-                'certificado_alumno': practica.certificado_alumno if hasattr(practica, 'certificado_alumno') else None,
-                'formulario_inscripcion': practica.formulario_inscripcion if hasattr(practica, 'formulario_inscripcion') else None,
-                'autorizacion_empresa': practica.autorizacion_empresa if hasattr(practica, 'autorizacion_empresa') else None
-            }
-            resultado.append(practica_info)
-            
-        return jsonify({
+        query = consulta_practicas().filter(Practica.tipo_practica == 'Profesional')
+        practicas, paginacion = paginar(filtrar_practicas(query, request.args), Practica.id, ORDEN_PRACTICAS)
+        
+        metadatos = metadatos_documentos(
+            getattr(practica, tipo) for practica in practicas for tipo in DOCUMENT_TYPES
+        )
+        
+        resultado = [serializar_practica(practica, info_documentos(practica, metadatos))
+                     for practica in practicas]
+        
+        respuesta = {
             'data': resultado,
             'status': 'success'
-        }), 200
+        }
+        if paginacion:
+            respuesta['paginacion'] = paginacion
+        return jsonify(respuesta), 200
         
+    except ParametroInvalido as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
     except Exception as e:
         return jsonify({
             'error': str(e),
@@ -150,32 +170,21 @@ def obtener_practicas_profesionales():
         }), 500
         
 @practicas_bp.route('/practicas/profesional/<int:id>', methods=['GET'])
+@respuesta_cacheable('practicas', 'estudiantes', 'documentos')
 def obtener_practica_profesional(id):
     try:
-        practica = Practica.query.filter_by(id=id, tipo_practica='Profesional').first()
+        practica = consulta_practicas().filter(Practica.id == id, Practica.tipo_practica == 'Profesional').first()
         
         if not practica:
             return jsonify({
                 'error': 'Práctica no encontrada',
                 'status': 'error'
             }), 404
-            
-        practica_info = {
-            'id': practica.id,
-            'estudiante': f"{practica.estudiante.nombre} {practica.estudiante.apellido}",
-            'estudiante_email': practica.estudiante.email,
-            'empresa': practica.empresa,
-            'fecha_inicio': practica.fecha_inicio.strftime('%Y-%m-%d'),
-            'fecha_termino': practica.fecha_termino.strftime('%Y-%m-%d'),
-            'supervisor': practica.supervisor,
-            'contacto_supervisor': practica.contacto_supervisor,
-            'nota': practica.nota if practica.nota else None,
-            'carta_supervisor': practica.carta_supervisor,
-            'certificado_alumno': practica.certificado_alumno,
-            'formulario_inscripcion': practica.formulario_inscripcion,
-            'autorizacion_empresa': practica.autorizacion_empresa
-        }
-            
+        
+        practica_info = serializar_practica(practica, info_documentos(practica, metadatos_documentos(
+            getattr(practica, tipo) for tipo in DOCUMENT_TYPES
+        )))
+        
         return jsonify({
             'data': practica_info,
             'status': 'success'
@@ -218,17 +227,6 @@ def crear_practica_profesional():
                 'status': 'error'
             }), 404
             
-        practica_existente = Practica.query.filter_by(
-            estudiante_id=data['estudiante_id'],
-            tipo_practica='Profesional'
-        ).first()
-        
-        if practica_existente:
-            return jsonify({
-                'error': 'El estudiante ya tiene una práctica profesional registrada',
-                'status': 'error'
-            }), 400
-
         nueva_practica = Practica(
             estudiante_id=data['estudiante_id'],
             tipo_practica='Profesional',
@@ -240,7 +238,15 @@ def crear_practica_profesional():
         )
         
         db.session.add(nueva_practica)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # uq_practicas_estudiante_tipo: una práctica de cada tipo por estudiante
+            db.session.rollback()
+            return jsonify({
+                'error': 'El estudiante ya tiene una práctica profesional registrada',
+                'status': 'error'
+            }), 400
         
         return jsonify({
             'message': 'Práctica profesional creada exitosamente',
@@ -371,11 +377,54 @@ def actualizar_practica(id):
             'status': 'error'
         }), 500
 
+# Presupuesto: verificación de ids, UPDATE masivo, versiones, registro de cambios,
+# y la consulta y el alta del trabajo que refresca las estadísticas
+@practicas_bp.route('/practicas/notas', methods=['PUT'])
+@jwt_required()
+@presupuesto_consultas(6)
+def actualizar_notas_practicas():
+    try:
+        notas, resultados = validar_notas(request.get_json(), permitir_vacia=True)
+        existentes = set(db.session.scalars(select(Practica.id).where(Practica.id.in_(notas))))
+        marcar_inexistentes(resultados, existentes, 'Práctica no encontrada')
+        
+        # Todo o nada: si algún ítem es inválido no se registra ninguna nota
+        if con_errores(resultados):
+            db.session.rollback()
+            return jsonify({
+                'error': 'Hay notas inválidas; no se registró ninguna',
+                'data': resultados,
+                'status': 'error'
+            }), 400
+        
+        db.session.execute(update(Practica), [{'id': id, 'nota': nota} for id, nota in notas.items()])
+        db.session.commit()
+        return jsonify({
+            'message': f'{len(notas)} notas registradas exitosamente',
+            'data': resultados,
+            'status': 'success'
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
 @practicas_bp.route('/practicas/<int:id>', methods=['DELETE'])
 @jwt_required()
 def eliminar_practica(id):
     try:
         practica = Practica.query.get_or_404(id)
+        
+        for tipo in DOCUMENT_TYPES:
+            programar_borrado(quitar_referencia(getattr(practica, tipo)))
         db.session.delete(practica)
         db.session.commit()
         
@@ -386,6 +435,40 @@ def eliminar_practica(id):
         
     except Exception as e:
         db.session.rollback()
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@practicas_bp.route('/practicas/export', methods=['GET'])
+@jwt_required()
+def exportar_practicas():
+    try:
+        formato = request.args.get('formato', 'csv').lower()
+        if formato != 'csv':
+            return jsonify({
+                'error': f'Formato de exportación no soportado: {formato}',
+                'status': 'error'
+            }), 400
+        
+        sort = request.args.get('sort', 'id')
+        if sort.lstrip('-') not in ORDEN_PRACTICAS:
+            raise ParametroInvalido(f"No se puede ordenar por {sort.lstrip('-')}")
+        columna_orden = ORDEN_PRACTICAS[sort.lstrip('-')]
+        
+        query = db.session.query(*[columna for _, columna in COLUMNAS_EXPORTACION])\
+                          .join(Practica.estudiante)
+        query = filtrar_practicas(query, request.args)\
+            .order_by(columna_orden.desc() if sort.startswith('-') else columna_orden, Practica.id)
+        
+        return respuesta_csv('practicas.csv', [nombre for nombre, _ in COLUMNAS_EXPORTACION], query)
+        
+    except ParametroInvalido as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+    except Exception as e:
         return jsonify({
             'error': str(e),
             'status': 'error'
@@ -1,36 +1,26 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
+from sqlalchemy import or_
 from models.profesor import Profesor
 from models.proyecto import Proyecto
+from models.estudiante import Estudiante
 from app import db
+from utils.consultas import presupuesto_consultas
+from utils.carga import profesores_con_carga, carga_de
+from utils.cache import respuesta_cacheable
+from utils.serializadores import (COLUMNAS_PROFESOR, COLUMNAS_PROYECTO_PROFESOR, serializar_profesor,
+                                  serializar_proyecto_profesor)
 
 profesores_bp = Blueprint('profesores', __name__)
 
 @profesores_bp.route('/profesores', methods=['GET'])
 @jwt_required()
+@respuesta_cacheable('profesores', 'proyectos', 'carga_profesores')
+@presupuesto_consultas(1)
 def obtener_profesores():
     try:
-        profesores = Profesor.query.filter_by(activo=True).all() 
-        
-        resultado = []
-        for profesor in profesores:
-            proyectos_guiados = Proyecto.query.filter_by(profesor_guia_id=profesor.id)\
-                                            .filter(Proyecto.nota.is_(None))\
-                                            .count()
-            
-            proyectos_informados = Proyecto.query.filter_by(profesor_informante_id=profesor.id)\
-                                               .filter(Proyecto.nota.is_(None))\
-                                               .count()
-            
-            profesor_info = {
-                'id': profesor.id,
-                'nombre': profesor.nombre,
-                'apellido': profesor.apellido,
-                'email': profesor.email,
-                'proyectos_guiados': proyectos_guiados,
-                'proyectos_informados': proyectos_informados
-            }
-            resultado.append(profesor_info)
+        profesores = profesores_con_carga(*COLUMNAS_PROFESOR).filter(Profesor.activo.is_(True)).all()
+        resultado = [serializar_profesor(profesor) for profesor in profesores]
             
         return jsonify({
             'data': resultado,
@@ -86,6 +76,7 @@ def crear_profesor():
         }), 500
 
 @profesores_bp.route('/profesores/<int:id>', methods=['GET'])
+@respuesta_cacheable('profesores')
 def obtener_profesor(id):
     try:
         profesor = Profesor.query.get_or_404(id)
@@ -105,13 +96,7 @@ def eliminar_profesor(id):
     try:
         profesor = Profesor.query.get_or_404(id)
         
-        proyectos_guiados = Proyecto.query.filter_by(profesor_guia_id=profesor.id)\
-                                        .filter(Proyecto.nota.is_(None))\
-                                        .count()
-        
-        proyectos_informados = Proyecto.query.filter_by(profesor_informante_id=profesor.id)\
-                                           .filter(Proyecto.nota.is_(None))\
-                                           .count()
+        proyectos_guiados, proyectos_informados = carga_de(profesor.id)
         
         # Si tiene proyectos activos, no permitir la eliminación
         if proyectos_guiados > 0 or proyectos_informados > 0:
@@ -177,33 +162,25 @@ def actualizar_profesor(id):
         }), 500
         
 @profesores_bp.route('/profesores/<int:id>/detalle', methods=['GET'])
+@respuesta_cacheable('profesores', 'proyectos', 'estudiantes')
+@presupuesto_consultas(2)
 def obtener_profesor_detalle(id):
     try:
         profesor = Profesor.query.get_or_404(id)
         
-        proyectos_guiados = Proyecto.query.filter_by(profesor_guia_id=profesor.id)\
-                                        .filter(Proyecto.nota.is_(None))\
-                                        .all()
-        
-        proyectos_informados = Proyecto.query.filter_by(profesor_informante_id=profesor.id)\
-                                           .filter(Proyecto.nota.is_(None))\
-                                           .all()
-        
-        proyectos_guiados_data = [{
-            'id': p.id,
-            'titulo': p.titulo,
-            'descripcion': p.descripcion,
-            'estudiante': f"{p.estudiante.nombre} {p.estudiante.apellido}",
-            'estudiante_email': p.estudiante.email
-        } for p in proyectos_guiados]
-        
-        proyectos_informados_data = [{
-            'id': p.id,
-            'titulo': p.titulo,
-            'descripcion': p.descripcion,
-            'estudiante': f"{p.estudiante.nombre} {p.estudiante.apellido}",
-            'estudiante_email': p.estudiante.email
-        } for p in proyectos_informados]
+        # Guiados e informados abiertos en una sola consulta por columnas
+        proyectos = db.session.query(*COLUMNAS_PROYECTO_PROFESOR)\
+                              .join(Estudiante, Proyecto.estudiante_id == Estudiante.id)\
+                              .filter(or_(Proyecto.profesor_guia_id == profesor.id,
+                                          Proyecto.profesor_informante_id == profesor.id))\
+                              .filter(Proyecto.nota.is_(None))\
+                              .order_by(Proyecto.id)\
+                              .all()
+        
+        proyectos_guiados_data = [serializar_proyecto_profesor(p) for p in proyectos
+                                  if p.profesor_guia_id == profesor.id]
+        proyectos_informados_data = [serializar_proyecto_profesor(p) for p in proyectos
+                                     if p.profesor_informante_id == profesor.id]
         
         profesor_detalle = {
             'id': profesor.id,
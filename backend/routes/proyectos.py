@@ -1,32 +1,58 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
+from sqlalchemy import select, update
 from models.proyecto import Proyecto
+from models.estudiante import Estudiante
 from app import db
+from utils.consultas import presupuesto_consultas
+from utils.carga import ajustar_carga, ajustar_carga_lote
+from utils.notas import con_errores, estado_proyecto, marcar_inexistentes, validar_notas
+from utils.paginacion import ParametroInvalido, paginar
+from utils.filtros import ORDEN_PROYECTOS, ORDEN_PROYECTOS_FINALIZADOS, filtrar_proyectos
+from utils.exportacion import respuesta_csv
+from utils.cache import respuesta_cacheable
+from utils.serializadores import (ProfesorGuia, ProfesorInformante, con_participantes,
+                                  consulta_proyectos, serializar_proyecto)
 
 proyectos_bp = Blueprint('proyectos', __name__)
 
+COLUMNAS_EXPORTACION = [
+    ('id', Proyecto.id),
+    ('titulo', Proyecto.titulo),
+    ('estudiante_nombre', Estudiante.nombre),
+    ('estudiante_apellido', Estudiante.apellido),
+    ('estudiante_email', Estudiante.email),
+    ('profesor_guia_nombre', ProfesorGuia.nombre),
+    ('profesor_guia_apellido', ProfesorGuia.apellido),
+    ('profesor_informante_nombre', ProfesorInformante.nombre),
+    ('profesor_informante_apellido', ProfesorInformante.apellido),
+    ('nota', Proyecto.nota),
+    ('estado', Proyecto.estado)
+]
+
 @proyectos_bp.route('/proyectos', methods=['GET'])
+@respuesta_cacheable('proyectos', 'estudiantes', 'profesores')
+@presupuesto_consultas(1)
 def obtener_proyectos():
     try:
-        proyectos = Proyecto.query.filter(Proyecto.nota.is_(None)).all()
+        query = consulta_proyectos().filter(Proyecto.nota.is_(None))
+        proyectos, paginacion = paginar(filtrar_proyectos(query, request.args), Proyecto.id, ORDEN_PROYECTOS)
         
-        resultado = []
-        for proyecto in proyectos:
-            proyecto_info = {
-                'id': proyecto.id,
-                'estudiante': f"{proyecto.estudiante.nombre} {proyecto.estudiante.apellido}",
-                'correo': proyecto.estudiante.email,
-                'proyecto_titulo': proyecto.titulo,
-                'profesor_guia': f"{proyecto.profesor_guia.nombre} {proyecto.profesor_guia.apellido}",
-                'profesor_informante': f"{proyecto.profesor_informante.nombre} {proyecto.profesor_informante.apellido}"
-            }
-            resultado.append(proyecto_info)
-            
-        return jsonify({
+        resultado = [serializar_proyecto(proyecto) for proyecto in proyectos]
+        
+        respuesta = {
             'data': resultado,
             'status': 'success'
-        }), 200
+        }
+        if paginacion:
+            respuesta['paginacion'] = paginacion
+        return jsonify(respuesta), 200
         
+    except ParametroInvalido as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
     except Exception as e:
         return jsonify({
             'error': str(e),
@@ -34,6 +60,7 @@ def obtener_proyectos():
         }), 500
 
 @proyectos_bp.route('/proyectos/<int:id>', methods=['GET'])
+@respuesta_cacheable('proyectos')
 def obtener_proyecto(id):
     try:
         proyecto = Proyecto.query.get_or_404(id)
@@ -69,6 +96,7 @@ def crear_proyecto():
         )
         
         db.session.add(nuevo_proyecto)
+        ajustar_carga(nuevo_proyecto.profesor_guia_id, nuevo_proyecto.profesor_informante_id, 1)
         db.session.commit()
         
         return jsonify({
@@ -90,6 +118,10 @@ def actualizar_proyecto(id):
         proyecto = Proyecto.query.get_or_404(id)
         data = request.get_json()
         
+        if proyecto.nota is None:
+            ajustar_carga(proyecto.profesor_guia_id, proyecto.profesor_informante_id, -1)
+            ajustar_carga(data['profesor_guia_id'], data['profesor_informante_id'], 1)
+        
         proyecto.titulo = data['titulo']
         proyecto.descripcion = data['descripcion']
         proyecto.estudiante_id = data['estudiante_id']
@@ -115,6 +147,9 @@ def eliminar_proyecto(id):
     try:
         proyecto = Proyecto.query.get_or_404(id)
         
+        if proyecto.nota is None:
+            ajustar_carga(proyecto.profesor_guia_id, proyecto.profesor_informante_id, -1)
+        
         db.session.delete(proyecto)
         db.session.commit()
         
@@ -143,8 +178,11 @@ def finalizar_proyecto(id):
                 'status': 'error'
             }), 400
             
+        if proyecto.nota is None:
+            ajustar_carga(proyecto.profesor_guia_id, proyecto.profesor_informante_id, -1)
+            
         proyecto.nota = float(data['nota'])
-        proyecto.estado = 'Aprobado' if proyecto.nota >= 4.0 else 'Reprobado'
+        proyecto.estado = estado_proyecto(proyecto.nota)
         
         db.session.commit()
         
@@ -160,30 +198,115 @@ def finalizar_proyecto(id):
             'status': 'error'
         }), 500
 
+# Presupuesto: lectura de los proyectos, carga de profesores (lectura, altas y
+# UPDATE masivo), UPDATE masivo de notas, versiones, registro de cambios, y la
+# consulta y el alta del trabajo que refresca las estadísticas
+@proyectos_bp.route('/proyectos/notas', methods=['PUT'])
+@jwt_required()
+@presupuesto_consultas(9)
+def finalizar_proyectos():
+    try:
+        notas, resultados = validar_notas(request.get_json())
+        actuales = db.session.execute(
+            select(Proyecto.id, Proyecto.nota, Proyecto.profesor_guia_id, Proyecto.profesor_informante_id)
+            .where(Proyecto.id.in_(notas))
+        ).all()
+        marcar_inexistentes(resultados, {fila.id for fila in actuales}, 'Proyecto no encontrado')
+        
+        # Todo o nada: si algún ítem es inválido no se registra ninguna nota
+        if con_errores(resultados):
+            db.session.rollback()
+            return jsonify({
+                'error': 'Hay notas inválidas; no se registró ninguna',
+                'data': resultados,
+                'status': 'error'
+            }), 400
+        
+        # Los proyectos que estaban abiertos dejan de contar en la carga
+        ajustar_carga_lote([(fila.profesor_guia_id, fila.profesor_informante_id)
+                            for fila in actuales if fila.nota is None], -1)
+        
+        for resultado in resultados:
+            resultado['estado'] = estado_proyecto(resultado['nota'])
+        db.session.execute(update(Proyecto), [
+            {'id': resultado['id'], 'nota': resultado['nota'], 'estado': resultado['estado']}
+            for resultado in resultados
+        ])
+        db.session.commit()
+        return jsonify({
+            'message': f'{len(notas)} proyectos finalizados exitosamente',
+            'data': resultados,
+            'status': 'success'
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
 @proyectos_bp.route('/proyectos/finalizados', methods=['GET'])
+@respuesta_cacheable('proyectos', 'estudiantes', 'profesores')
+@presupuesto_consultas(1)
 def obtener_proyectos_finalizados():
     try:
-        proyectos = Proyecto.query.filter(Proyecto.nota.isnot(None)).all()
+        query = consulta_proyectos().filter(Proyecto.nota.isnot(None))
+        proyectos, paginacion = paginar(filtrar_proyectos(query, request.args), Proyecto.id, ORDEN_PROYECTOS_FINALIZADOS)
         
-        resultado = []
-        for proyecto in proyectos:
-            proyecto_info = {
-                'id': proyecto.id,
-                'estudiante': f"{proyecto.estudiante.nombre} {proyecto.estudiante.apellido}",
-                'correo': proyecto.estudiante.email,
-                'proyecto_titulo': proyecto.titulo,
-                'profesor_guia': f"{proyecto.profesor_guia.nombre} {proyecto.profesor_guia.apellido}",
-                'profesor_informante': f"{proyecto.profesor_informante.nombre} {proyecto.profesor_informante.apellido}",
-                'nota': proyecto.nota,
-                'estado': proyecto.estado
-            }
-            resultado.append(proyecto_info)
-            
-        return jsonify({
+        resultado = [serializar_proyecto(proyecto, con_nota=True) for proyecto in proyectos]
+        
+        respuesta = {
             'data': resultado,
             'status': 'success'
-        }), 200
+        }
+        if paginacion:
+            respuesta['paginacion'] = paginacion
+        return jsonify(respuesta), 200
+        
+    except ParametroInvalido as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@proyectos_bp.route('/proyectos/export', methods=['GET'])
+@jwt_required()
+def exportar_proyectos():
+    try:
+        formato = request.args.get('formato', 'csv').lower()
+        if formato != 'csv':
+            return jsonify({
+                'error': f'Formato de exportación no soportado: {formato}',
+                'status': 'error'
+            }), 400
+        
+        sort = request.args.get('sort', 'id')
+        if sort.lstrip('-') not in ORDEN_PROYECTOS_FINALIZADOS:
+            raise ParametroInvalido(f"No se puede ordenar por {sort.lstrip('-')}")
+        columna_orden = ORDEN_PROYECTOS_FINALIZADOS[sort.lstrip('-')]
+        
+        query = con_participantes(db.session.query(*[columna for _, columna in COLUMNAS_EXPORTACION]))
+        query = filtrar_proyectos(query, request.args)\
+            .order_by(columna_orden.desc() if sort.startswith('-') else columna_orden, Proyecto.id)
+        
+        return respuesta_csv('proyectos.csv', [nombre for nombre, _ in COLUMNAS_EXPORTACION], query)
         
+    except ParametroInvalido as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
     except Exception as e:
         return jsonify({
             'error': str(e),
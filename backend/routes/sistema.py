@@ -0,0 +1,56 @@
+import hmac
+import os
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required
+from app import db
+from utils.consultas import estadisticas_pool
+from utils.metricas import metricas
+
+sistema_bp = Blueprint('sistema', __name__)
+
+@sistema_bp.route('/sistema/pool', methods=['GET'])
+@jwt_required()
+def obtener_estadisticas_pool():
+    try:
+        return jsonify({
+            'data': estadisticas_pool(db.engine),
+            'status': 'success'
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@sistema_bp.route('/metrics', methods=['GET'])
+def obtener_metricas():
+    # Latencias y consultas por endpoint no son públicas: sin METRICS_TOKEN no se sirven
+    token = current_app.config.get('METRICS_TOKEN')
+    if not token:
+        return jsonify({
+            'error': 'Métricas deshabilitadas',
+            'status': 'error'
+        }), 404
+    recibido = request.headers.get('Authorization', '').removeprefix('Bearer ')
+    if not hmac.compare_digest(recibido.encode(), token.encode()):
+        return jsonify({
+            'error': 'No autorizado',
+            'status': 'error'
+        }), 401
+    
+    lineas = metricas.exportar()
+    pool = estadisticas_pool(db.engine)
+    etiqueta = f'pid="{os.getpid()}"'
+    for clave, nombre, ayuda in (
+        ('tamano', 'db_pool_size', 'Conexiones configuradas en el pool'),
+        ('en_uso', 'db_pool_checked_out', 'Conexiones prestadas a peticiones'),
+        ('disponibles', 'db_pool_checked_in', 'Conexiones libres en el pool'),
+        ('overflow', 'db_pool_overflow', 'Conexiones por sobre pool_size'),
+    ):
+        if clave in pool:
+            lineas.append(f'# HELP {nombre} {ayuda}')
+            lineas.append(f'# TYPE {nombre} gauge')
+            lineas.append(f'{nombre}{{{etiqueta}}} {pool[clave]}')
+    
+    return current_app.response_class('\n'.join(lineas) + '\n',
+                                      content_type='text/plain; version=0.0.4; charset=utf-8')
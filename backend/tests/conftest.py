@@ -0,0 +1,74 @@
+"""Fixtures comunes: la app en modo TESTING sobre un SQLite temporal.
+
+Config lee el entorno al importarse, por eso las variables se fijan antes de
+importar la app.
+"""
+import os
+import tempfile
+
+_DIRECTORIO = tempfile.mkdtemp(prefix='practica-tests-')
+os.environ['DB_URL'] = 'sqlite:///' + os.path.join(_DIRECTORIO, 'pruebas.db')
+os.environ['DB_REPLICA_URLS'] = ''
+os.environ['TRABAJOS_HILOS'] = '0'
+os.environ['UPLOAD_FOLDER'] = os.path.join(_DIRECTORIO, 'uploads')
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db
+from config import Config
+from benchmarks.datos import sembrar
+import models.participacionprofesores  # noqa: F401
+from utils.cache import respuestas
+
+
+@pytest.fixture
+def binds():
+    """SQLALCHEMY_BINDS de la app; las pruebas de réplicas lo reemplazan."""
+    return {}
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch, binds):
+    monkeypatch.setattr(Config, 'SQLALCHEMY_BINDS', binds)
+    app = create_app()
+    app.config.update(
+        TESTING=True,
+        UPLOAD_FOLDER=str(tmp_path / 'uploads'),
+        REPLICA_MARCAS_DIR=str(tmp_path / 'escrituras'),
+        RESPONSE_CACHE_ENABLED=False
+    )
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    respuestas.limpiar()
+
+
+@pytest.fixture
+def cliente(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def cabeceras(app):
+    return {'Authorization': f"Bearer {create_access_token(identity='1')}"}
+
+
+@pytest.fixture
+def datos(app):
+    return sembrar(estudiantes=30, practicas=50, proyectos=20, profesores=6)
+
+
+@pytest.fixture
+def contar_consultas(app):
+    """Cuenta las sentencias SQL de todo el bloque, incluido el cuerpo en streaming."""
+    consultas = []
+    
+    def contar(*_):
+        consultas.append(1)
+    
+    event.listen(db.engine, 'before_cursor_execute', contar)
+    yield lambda: len(consultas)
+    event.remove(db.engine, 'before_cursor_execute', contar)
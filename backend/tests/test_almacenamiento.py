@@ -0,0 +1,96 @@
+"""Conteo de referencias de los blobs y borrado diferido tras el commit."""
+import hashlib
+import io
+import os
+from app import db
+from models.documento import Documento
+from models.practica import Practica
+from utils.almacenamiento import (agregar_referencia, borrar_si_huerfano, colocar_blob,
+                                  escribir_temporal, ruta_blob)
+from utils.trabajos import ejecutar_pendientes
+
+PDF = b'%PDF-1.4\n1 0 obj << /Type /Page >> endobj\n%%EOF\n'
+OTRO_PDF = b'%PDF-1.4\n2 0 obj << /Type /Page >> endobj\n%%EOF\n'
+
+
+def _subir(cliente, cabeceras, practica_id, contenido, tipo='carta_supervisor'):
+    return cliente.post(f'/api/documentos/subir/{tipo}/{practica_id}', headers=cabeceras,
+                        data={'file': (io.BytesIO(contenido), 'documento.pdf')},
+                        content_type='multipart/form-data')
+
+
+def _referencias(sha256):
+    db.session.expire_all()
+    return db.session.query(Documento.referencias).filter_by(sha256=sha256).scalar()
+
+
+def test_mismo_contenido_se_guarda_una_vez(app, cliente, cabeceras, datos):
+    sha256 = _subir(cliente, cabeceras, 1, PDF).json['sha256']
+    assert _subir(cliente, cabeceras, 2, PDF).json['sha256'] == sha256
+    assert _referencias(sha256) == 2
+    assert os.path.exists(ruta_blob(sha256))
+
+
+def test_el_archivo_anterior_se_borra_despues_del_commit(app, cliente, cabeceras, datos):
+    anterior = _subir(cliente, cabeceras, 1, PDF).json['sha256']
+    _subir(cliente, cabeceras, 2, PDF)
+    
+    # Reemplazar en la práctica 1: el blob sigue referenciado por la 2
+    _subir(cliente, cabeceras, 1, OTRO_PDF)
+    ejecutar_pendientes(app)
+    assert _referencias(anterior) == 1
+    assert os.path.exists(ruta_blob(anterior))
+    
+    # Quitarlo de la 2 lo deja huérfano; se borra solo al correr el trabajo
+    assert cliente.delete('/api/documentos/carta_supervisor/2', headers=cabeceras).status_code == 200
+    assert os.path.exists(ruta_blob(anterior))
+    ejecutar_pendientes(app)
+    assert not os.path.exists(ruta_blob(anterior))
+    assert _referencias(anterior) is None
+
+
+def test_subida_fallida_no_deja_blobs_huerfanos(app, cliente, cabeceras, datos, monkeypatch):
+    # Falla después de colocar el blob, dentro de la transacción de la práctica
+    def fallar(*_):
+        raise RuntimeError('error al actualizar la práctica')
+    
+    monkeypatch.setattr('routes.documentos.quitar_referencia', fallar)
+    respuesta = _subir(cliente, cabeceras, 1, PDF)
+    assert respuesta.status_code == 500
+    ejecutar_pendientes(app)
+    assert not os.path.exists(ruta_blob(hashlib.sha256(PDF).hexdigest()))
+    assert not os.listdir(os.path.join(app.config['UPLOAD_FOLDER'], 'blobs', '.tmp'))
+
+
+def test_borrado_respeta_referencias_vigentes(app, cliente, cabeceras, datos):
+    sha256 = _subir(cliente, cabeceras, 1, PDF).json['sha256']
+    borrar_si_huerfano(ruta_blob(sha256))
+    assert os.path.exists(ruta_blob(sha256))
+    assert _referencias(sha256) == 1
+
+
+def test_subida_concurrente_vuelve_a_colocar_un_blob_borrado(app, cliente, cabeceras, datos):
+    sha256 = _subir(cliente, cabeceras, 1, PDF).json['sha256']
+    assert cliente.delete('/api/documentos/carta_supervisor/1', headers=cabeceras).status_code == 200
+    
+    # Una subida del mismo contenido ya escribió su temporal cuando corre el borrado
+    _, tamano, temporal = escribir_temporal(io.BytesIO(PDF))
+    ejecutar_pendientes(app)
+    assert not os.path.exists(ruta_blob(sha256))
+    
+    agregar_referencia(sha256, tamano)
+    assert colocar_blob(sha256, temporal)
+    Practica.query.get(2).carta_supervisor = sha256
+    db.session.commit()
+    assert os.path.exists(ruta_blob(sha256))
+    assert _referencias(sha256) == 1
+
+
+def test_subir_a_practica_inexistente_responde_404_sin_transferir(app, cliente, cabeceras, datos, monkeypatch):
+    def transferir(*_):
+        raise AssertionError('no debía recibirse el archivo')
+    
+    monkeypatch.setattr('routes.documentos.save_document', transferir)
+    respuesta = _subir(cliente, cabeceras, 9999, PDF)
+    assert respuesta.status_code == 404
+    assert respuesta.json['error'] == 'Práctica no encontrada'
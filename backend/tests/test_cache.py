@@ -0,0 +1,74 @@
+"""Caché de respuestas: ETag, 304 e invalidación por versiones de las tablas."""
+import io
+import pytest
+from utils.trabajos import ejecutar_pendientes
+
+URL = '/api/practicas/profesional'
+PDF = b'%PDF-1.4\n1 0 obj << /Type /Page >> endobj\n%%EOF\n'
+
+
+@pytest.fixture(autouse=True)
+def cache_activa(app):
+    app.config['RESPONSE_CACHE_ENABLED'] = True
+
+
+def _etag(cliente, cabeceras, url=URL):
+    respuesta = cliente.get(url, headers=cabeceras)
+    assert respuesta.status_code == 200, respuesta.get_data(as_text=True)
+    assert respuesta.headers['ETag']
+    return respuesta.headers['ETag']
+
+
+def test_la_respuesta_lleva_etag(cliente, cabeceras, datos):
+    respuesta = cliente.get(URL, headers=cabeceras)
+    assert respuesta.status_code == 200
+    assert respuesta.headers['ETag']
+    assert 'no-cache' in respuesta.headers['Cache-Control']
+
+
+def test_if_none_match_vigente_responde_304(cliente, cabeceras, datos):
+    etag = _etag(cliente, cabeceras)
+    respuesta = cliente.get(URL, headers={**cabeceras, 'If-None-Match': etag})
+    assert respuesta.status_code == 304
+    assert respuesta.headers['ETag'] == etag
+    assert respuesta.get_data() == b''
+
+
+def test_la_carga_masiva_de_notas_invalida(cliente, cabeceras, datos):
+    etag = _etag(cliente, cabeceras)
+    respuesta = cliente.put('/api/practicas/notas', headers=cabeceras, json=[{'id': 1, 'nota': 6.5}])
+    assert respuesta.status_code == 200
+    
+    assert _etag(cliente, cabeceras) != etag
+    assert cliente.get(URL, headers={**cabeceras, 'If-None-Match': etag}).status_code == 200
+
+
+def test_la_edicion_individual_invalida(cliente, cabeceras, datos):
+    etag = _etag(cliente, cabeceras)
+    respuesta = cliente.put('/api/practicas/1', headers=cabeceras, json={'nota': 4.0})
+    assert respuesta.status_code == 200
+    assert _etag(cliente, cabeceras) != etag
+
+
+def test_un_trabajo_en_segundo_plano_invalida(app, cliente, cabeceras, datos):
+    subida = cliente.post('/api/documentos/subir/carta_supervisor/1', headers=cabeceras,
+                          data={'file': (io.BytesIO(PDF), 'documento.pdf')},
+                          content_type='multipart/form-data')
+    assert subida.status_code == 200
+    etag = _etag(cliente, cabeceras)
+    
+    # procesar_documento escribe la tabla documentos fuera de la petición
+    assert ejecutar_pendientes(app) > 0
+    assert _etag(cliente, cabeceras) != etag
+
+
+def test_parametros_distintos_no_comparten_entrada(cliente, cabeceras, datos):
+    diez = cliente.get(f'{URL}?limit=10', headers=cabeceras)
+    cinco = cliente.get(f'{URL}?limit=5', headers=cabeceras)
+    assert diez.headers['ETag'] != cinco.headers['ETag']
+    assert len(diez.json['data']) == 10
+    assert len(cinco.json['data']) == 5
+    
+    # La ETag de una consulta no vale para la otra
+    respuesta = cliente.get(f'{URL}?limit=5', headers={**cabeceras, 'If-None-Match': diez.headers['ETag']})
+    assert respuesta.status_code == 200
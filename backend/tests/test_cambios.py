@@ -0,0 +1,54 @@
+"""Sincronización incremental con /api/cambios."""
+import pytest
+from app import db
+from models.estudiante import Estudiante
+
+
+@pytest.fixture(autouse=True)
+def sin_margen(app):
+    app.config['CAMBIOS_MARGEN_SEGUNDOS'] = 0
+
+
+def _cambios(cliente, cabeceras, **parametros):
+    respuesta = cliente.get('/api/cambios', headers=cabeceras, query_string=parametros)
+    assert respuesta.status_code == 200, respuesta.json
+    return respuesta.json['data']
+
+
+def test_entrega_lo_cambiado_desde_el_cursor(cliente, cabeceras, datos):
+    cursor = _cambios(cliente, cabeceras)['cursor']
+    
+    cliente.put('/api/practicas/notas', headers=cabeceras, json=[{'id': 3, 'nota': 6.1}])
+    assert cliente.delete('/api/practicas/4', headers=cabeceras).status_code == 200
+    estudiante = Estudiante(nombre='Ana', apellido='Rojas', email='ana@alu.uct.cl')
+    db.session.add(estudiante)
+    db.session.commit()
+    
+    delta = _cambios(cliente, cabeceras, since=cursor)
+    assert delta['cursor'] > cursor
+    assert not delta['hay_mas']
+    assert [(fila['id'], fila['nota']) for fila in delta['actualizados']['practicas']] == [(3, 6.1)]
+    assert delta['eliminados']['practicas'] == [4]
+    assert [fila['email'] for fila in delta['actualizados']['estudiantes']] == ['ana@alu.uct.cl']
+    
+    # Desde el cursor nuevo no queda nada pendiente
+    siguiente = _cambios(cliente, cabeceras, since=delta['cursor'])
+    assert siguiente['cursor'] == delta['cursor']
+    assert not any(siguiente['actualizados'].values())
+
+
+def test_pagina_con_limit(cliente, cabeceras, datos):
+    cursor = _cambios(cliente, cabeceras)['cursor']
+    cliente.put('/api/practicas/notas', headers=cabeceras,
+                json=[{'id': 1, 'nota': 5.0}, {'id': 2, 'nota': 5.5}])
+    
+    primera = _cambios(cliente, cabeceras, since=cursor, limit=1)
+    assert primera['hay_mas']
+    segunda = _cambios(cliente, cabeceras, since=primera['cursor'], limit=1)
+    assert not segunda['hay_mas']
+    ids = [fila['id'] for pagina in (primera, segunda) for fila in pagina['actualizados']['practicas']]
+    assert ids == [1, 2]
+
+
+def test_cursor_invalido(cliente, cabeceras):
+    assert cliente.get('/api/cambios?since=abc', headers=cabeceras).status_code == 400
@@ -0,0 +1,81 @@
+"""Compresión negociada de las respuestas de /api y sus variantes en la caché."""
+import gzip
+import io
+import json
+import pytest
+import utils.compresion
+
+URL = '/api/practicas/profesional'
+PDF = b'%PDF-1.4\n1 0 obj << /Type /Page >> endobj\n%%EOF\n'
+
+
+@pytest.fixture(autouse=True)
+def compresion_activa(app):
+    app.config.update(RESPONSE_CACHE_ENABLED=True, COMPRESSION_ENABLED=True, COMPRESSION_MIN_SIZE=0)
+
+
+def _sin_comprimir(monkeypatch):
+    def fallar(*_):
+        raise AssertionError('la variante debía salir de la caché')
+    
+    monkeypatch.setattr(utils.compresion, 'comprimir', fallar)
+
+
+@pytest.mark.parametrize('codificacion', ['gzip', 'br'])
+def test_la_variante_se_reutiliza_desde_la_cache(cliente, cabeceras, datos, monkeypatch, codificacion):
+    if codificacion == 'br':
+        brotli = pytest.importorskip('brotli')
+    cabeceras = {**cabeceras, 'Accept-Encoding': codificacion}
+    
+    primera = cliente.get(URL, headers=cabeceras)
+    assert primera.headers['Content-Encoding'] == codificacion
+    assert primera.headers['ETag'].endswith(f'-{codificacion}"')
+    assert 'Accept-Encoding' in primera.headers['Vary']
+    descomprimir = gzip.decompress if codificacion == 'gzip' else brotli.decompress
+    assert json.loads(descomprimir(primera.get_data()))['status'] == 'success'
+    
+    _sin_comprimir(monkeypatch)
+    segunda = cliente.get(URL, headers=cabeceras)
+    assert segunda.get_data() == primera.get_data()
+    assert segunda.headers['ETag'] == primera.headers['ETag']
+
+
+def test_sin_accept_encoding_se_sirve_la_identidad(cliente, cabeceras, datos):
+    respuesta = cliente.get(URL, headers={**cabeceras, 'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in respuesta.headers
+    assert 'Accept-Encoding' in respuesta.headers['Vary']
+    assert respuesta.json['status'] == 'success'
+
+
+def test_cuerpo_bajo_el_minimo_no_se_comprime(app, cliente, cabeceras, datos):
+    app.config['COMPRESSION_MIN_SIZE'] = 10 ** 7
+    respuesta = cliente.get(URL, headers={**cabeceras, 'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in respuesta.headers
+    assert respuesta.json['status'] == 'success'
+
+
+def test_csv_zip_y_pdf_no_se_comprimen(cliente, cabeceras, datos):
+    subida = cliente.post('/api/documentos/subir/carta_supervisor/1', headers=cabeceras,
+                          data={'file': (io.BytesIO(PDF), 'documento.pdf')},
+                          content_type='multipart/form-data')
+    assert subida.status_code == 200
+    
+    cabeceras = {**cabeceras, 'Accept-Encoding': 'gzip, br'}
+    for url, mimetype in (('/api/practicas/export', 'text/csv'),
+                          ('/api/documentos/zip', 'application/zip'),
+                          ('/api/documentos/descargar/carta_supervisor/1', 'application/pdf')):
+        respuesta = cliente.get(url, headers=cabeceras)
+        assert respuesta.status_code == 200, url
+        assert respuesta.mimetype == mimetype
+        assert 'Content-Encoding' not in respuesta.headers, url
+        respuesta.close()
+
+
+def test_304_de_una_variante_devuelve_su_etag(cliente, cabeceras, datos):
+    cabeceras = {**cabeceras, 'Accept-Encoding': 'gzip'}
+    etag = cliente.get(URL, headers=cabeceras).headers['ETag']
+    
+    respuesta = cliente.get(URL, headers={**cabeceras, 'If-None-Match': etag})
+    assert respuesta.status_code == 304
+    assert respuesta.headers['ETag'] == etag
+    assert 'Accept-Encoding' in respuesta.headers['Vary']
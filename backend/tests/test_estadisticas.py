@@ -0,0 +1,42 @@
+"""Resumen de estadísticas: sellos en la base y trabajos de refresco coalescidos."""
+from app import db
+from models.resumen_estadistica import ResumenEstadistica
+from models.trabajo import Trabajo
+from utils.estadisticas import SECCIONES
+from utils.trabajos import ejecutar_pendientes
+
+
+def _practicas_iniciales(cliente, cabeceras):
+    return cliente.get('/api/estadisticas', headers=cabeceras).json['data']['practicas']['Inicial']
+
+
+def test_escrituras_seguidas_encolan_un_solo_refresco(app, cliente, cabeceras, datos):
+    _practicas_iniciales(cliente, cabeceras)
+    for nota in (5.0, 6.0, 3.0):
+        respuesta = cliente.put('/api/practicas/notas', headers=cabeceras, json=[{'id': 1, 'nota': nota}])
+        assert respuesta.status_code == 200
+    assert Trabajo.query.filter_by(tipo='refrescar_estadisticas', estado='pendiente').count() == 1
+
+
+def test_el_refresco_actualiza_el_resumen_guardado(app, cliente, cabeceras, datos):
+    cliente.put('/api/practicas/notas', headers=cabeceras, json=[{'id': 1, 'nota': None}])
+    antes = _practicas_iniciales(cliente, cabeceras)
+    
+    cliente.put('/api/practicas/notas', headers=cabeceras, json=[{'id': 1, 'nota': 7.0}])
+    ejecutar_pendientes(app)
+    despues = _practicas_iniciales(cliente, cabeceras)
+    assert despues['evaluadas'] == antes['evaluadas'] + 1
+    assert despues['aprobadas'] == antes['aprobadas'] + 1
+
+
+def test_la_lectura_no_guarda_el_resumen(app, cliente, cabeceras, datos):
+    # Con réplicas la lectura puede ver versiones atrasadas: solo el trabajo guarda
+    Trabajo.query.delete()
+    db.session.commit()
+    calculadas = _practicas_iniciales(cliente, cabeceras)
+    assert ResumenEstadistica.query.count() == 0
+    assert Trabajo.query.filter_by(tipo='refrescar_estadisticas', estado='pendiente').count() == 1
+    
+    ejecutar_pendientes(app)
+    assert ResumenEstadistica.query.count() == len(SECCIONES)
+    assert _practicas_iniciales(cliente, cabeceras) == calculadas
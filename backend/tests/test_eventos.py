@@ -0,0 +1,56 @@
+"""Acceso al canal /api/eventos."""
+import pytest
+from utils.eventos import difusor
+
+CON_HILOS = {'wsgi.multithread': True}
+
+
+@pytest.fixture
+def token_eventos(cliente, cabeceras):
+    respuesta = cliente.post('/api/eventos/token', headers=cabeceras)
+    assert respuesta.status_code == 200
+    return respuesta.json['data']['token']
+
+
+def _conectar(cliente, token, **kwargs):
+    respuesta = cliente.get(f'/api/eventos?jwt={token}', buffered=False, **kwargs)
+    respuesta.close()
+    return respuesta
+
+
+def test_token_de_eventos_abre_el_canal(app, cliente, token_eventos):
+    app.config['EVENTOS_DURACION_MAXIMA'] = 0
+    respuesta = _conectar(cliente, token_eventos, environ_overrides=CON_HILOS)
+    assert respuesta.status_code == 200
+    assert respuesta.mimetype == 'text/event-stream'
+
+
+def test_token_de_sesion_no_se_acepta_en_la_url(cliente, cabeceras):
+    token = cabeceras['Authorization'].removeprefix('Bearer ')
+    assert _conectar(cliente, token, environ_overrides=CON_HILOS).status_code == 401
+
+
+def test_token_de_eventos_no_sirve_para_la_api(cliente, token_eventos):
+    respuesta = cliente.get('/api/cambios', headers={'Authorization': f'Bearer {token_eventos}'})
+    assert respuesta.status_code in (400, 401, 422)
+
+
+def test_worker_sin_hilos_responde_503(cliente, token_eventos):
+    assert _conectar(cliente, token_eventos, environ_overrides={'wsgi.multithread': False}).status_code == 503
+
+
+def test_error_en_la_reconexion_no_deja_suscriptor(cliente, token_eventos, monkeypatch):
+    def fallar(*_):
+        raise RuntimeError('sin base de datos')
+    
+    monkeypatch.setattr('routes.eventos.cambios_desde', fallar)
+    with pytest.raises(RuntimeError):
+        cliente.get(f'/api/eventos?jwt={token_eventos}', headers={'Last-Event-ID': '1'},
+                    environ_overrides=CON_HILOS)
+    assert len(difusor._suscriptores) == 0
+
+
+def test_cerrar_sin_leer_libera_el_suscriptor(cliente, token_eventos):
+    respuesta = _conectar(cliente, token_eventos, environ_overrides=CON_HILOS)
+    assert respuesta.status_code == 200
+    assert len(difusor._suscriptores) == 0
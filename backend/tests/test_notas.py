@@ -0,0 +1,42 @@
+"""Carga masiva de notas: validación y todo o nada."""
+import pytest
+from app import db
+from models.practica import Practica
+from models.proyecto import Proyecto
+
+
+def _notas(modelo, ids):
+    db.session.expire_all()
+    return {fila.id: fila.nota for fila in db.session.query(modelo.id, modelo.nota).filter(modelo.id.in_(ids))}
+
+
+@pytest.mark.parametrize('nota', ['nan', 'NaN', 'inf', '-inf', 0.5, 7.5, 'siete'])
+def test_nota_invalida_rechaza_todo_el_lote(cliente, cabeceras, datos, nota):
+    antes = _notas(Practica, [1, 2])
+    respuesta = cliente.put('/api/practicas/notas', headers=cabeceras,
+                            json=[{'id': 1, 'nota': 6.0}, {'id': 2, 'nota': nota}])
+    assert respuesta.status_code == 400
+    assert [item['status'] for item in respuesta.json['data']] == ['success', 'error']
+    assert _notas(Practica, [1, 2]) == antes
+
+
+def test_id_inexistente_rechaza_todo_el_lote(cliente, cabeceras, datos):
+    antes = _notas(Proyecto, [1])
+    respuesta = cliente.put('/api/proyectos/notas', headers=cabeceras,
+                            json=[{'id': 1, 'nota': 6.0}, {'id': 9999, 'nota': 5.0}])
+    assert respuesta.status_code == 400
+    assert respuesta.json['data'][1]['error'] == 'Proyecto no encontrado'
+    assert _notas(Proyecto, [1]) == antes
+
+
+def test_lote_valido_se_registra_completo(cliente, cabeceras, datos):
+    respuesta = cliente.put('/api/proyectos/notas', headers=cabeceras,
+                            json=[{'id': 1, 'nota': '6.5'}, {'id': 2, 'nota': 3.0}])
+    assert respuesta.status_code == 200
+    assert _notas(Proyecto, [1, 2]) == {1: 6.5, 2: 3.0}
+    assert [item['estado'] for item in respuesta.json['data']] == ['Aprobado', 'Reprobado']
+    
+    respuesta = cliente.put('/api/practicas/notas', headers=cabeceras,
+                            json=[{'id': 1, 'nota': 5.0}, {'id': 2, 'nota': None}])
+    assert respuesta.status_code == 200
+    assert _notas(Practica, [1, 2]) == {1: 5.0, 2: None}
@@ -0,0 +1,107 @@
+"""Presupuesto de consultas de los endpoints de listas.
+
+Con TESTING, presupuesto_consultas lanza PresupuestoExcedido y la petición
+falla; además se comprueba que la cantidad de consultas no crece con la de
+filas, lo que detecta un N+1 también en los endpoints sin decorador.
+"""
+import pytest
+from sqlalchemy import select
+from app import db
+from benchmarks.datos import sembrar
+from models.practica import Practica
+from models.proyecto import Proyecto
+from utils.carga import recalcular_carga
+from utils.consultas import PresupuestoExcedido
+
+ENDPOINTS = [
+    '/api/estudiantes',
+    '/api/estudiantes?limit=10',
+    '/api/practicas/inicial',
+    '/api/practicas/inicial?limit=10',
+    '/api/practicas/profesional',
+    '/api/practicas/profesional?con_nota=false&sort=-fecha_inicio&limit=10',
+    '/api/practicas/export',
+    '/api/proyectos',
+    '/api/proyectos?limit=10',
+    '/api/proyectos/finalizados',
+    '/api/proyectos/export',
+    '/api/profesores',
+    '/api/profesores/1/detalle',
+    '/api/estadisticas',
+    '/api/buscar?q=banco',
+    '/api/buscar?q=gonz&tipo=estudiante',
+]
+
+
+def _consultas(cliente, cabeceras, contar_consultas, url):
+    antes = contar_consultas()
+    respuesta = cliente.get(url, headers=cabeceras)
+    respuesta.get_data()
+    assert respuesta.status_code == 200, respuesta.get_data(as_text=True)
+    return contar_consultas() - antes
+
+
+@pytest.mark.parametrize('url', ENDPOINTS)
+def test_endpoint_dentro_del_presupuesto(cliente, cabeceras, datos, url):
+    respuesta = cliente.get(url, headers=cabeceras)
+    assert respuesta.status_code == 200, respuesta.get_data(as_text=True)
+
+
+@pytest.mark.parametrize('url', ENDPOINTS)
+def test_consultas_no_dependen_de_las_filas(app, cliente, cabeceras, contar_consultas, url):
+    sembrar(estudiantes=10, practicas=15, proyectos=6, profesores=3)
+    # La primera llamada puede precalcular resúmenes; se mide desde la segunda
+    _consultas(cliente, cabeceras, contar_consultas, url)
+    pocas = _consultas(cliente, cabeceras, contar_consultas, url)
+    
+    for tabla in reversed(db.metadata.sorted_tables):
+        db.session.execute(tabla.delete())
+    db.session.commit()
+    sembrar(estudiantes=60, practicas=100, proyectos=40, profesores=12, semilla=2)
+    _consultas(cliente, cabeceras, contar_consultas, url)
+    assert _consultas(cliente, cabeceras, contar_consultas, url) == pocas
+
+
+# Cargas masivas de notas, con la carga de profesores mantenida para medir también su ajuste
+ESCRITURAS_MASIVAS = [
+    ('/api/practicas/notas', Practica),
+    ('/api/proyectos/notas', Proyecto),
+]
+
+
+def _cerrar_abiertos(cliente, cabeceras, contar_consultas, url, modelo):
+    ids = list(db.session.scalars(select(modelo.id).where(modelo.nota.is_(None))))
+    antes = contar_consultas()
+    respuesta = cliente.put(url, headers=cabeceras, json=[{'id': id, 'nota': 5.0} for id in ids])
+    assert respuesta.status_code == 200, respuesta.get_data(as_text=True)
+    return contar_consultas() - antes
+
+
+@pytest.mark.parametrize('url, modelo', ESCRITURAS_MASIVAS)
+def test_escritura_masiva_no_depende_de_las_filas(app, cliente, cabeceras, contar_consultas, url, modelo):
+    app.config['CARGA_PROFESORES_MANTENIDA'] = True
+    sembrar(estudiantes=10, practicas=15, proyectos=6, profesores=3)
+    recalcular_carga()
+    pocas = _cerrar_abiertos(cliente, cabeceras, contar_consultas, url, modelo)
+    
+    for tabla in reversed(db.metadata.sorted_tables):
+        db.session.execute(tabla.delete())
+    db.session.commit()
+    sembrar(estudiantes=60, practicas=100, proyectos=40, profesores=12, semilla=2)
+    recalcular_carga()
+    assert _cerrar_abiertos(cliente, cabeceras, contar_consultas, url, modelo) == pocas
+
+
+def test_exceder_el_presupuesto_falla(app):
+    from utils.consultas import presupuesto_consultas
+    from models.estudiante import Estudiante
+    
+    @presupuesto_consultas(1)
+    def vista():
+        for _ in range(3):
+            Estudiante.query.count()
+        return 'ok'
+    
+    with app.test_request_context():
+        with pytest.raises(PresupuestoExcedido):
+            vista()
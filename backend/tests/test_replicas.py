@@ -0,0 +1,56 @@
+"""Lecturas en réplicas con leer lo propio recién escrito.
+
+La réplica es un segundo SQLite con el esquema pero sin los datos: simula una
+réplica atrasada, así se distingue de qué base vino cada lectura.
+"""
+import time
+import pytest
+from flask_jwt_extended import create_access_token
+from app import db
+from config import binds_replicas
+
+
+@pytest.fixture
+def binds(tmp_path):
+    return binds_replicas('sqlite:///' + str(tmp_path / 'replica.db'))
+
+
+@pytest.fixture
+def replica(app, datos):
+    db.metadata.create_all(db.engines['replica0'])
+    app.config['REPLICA_VENTANA_SEGUNDOS'] = 0.5
+
+
+def _cabeceras(identidad):
+    return {'Authorization': f'Bearer {create_access_token(identity=identidad)}'}
+
+
+def _leer(cliente, identidad):
+    respuesta = cliente.get('/api/practicas/inicial', headers=_cabeceras(identidad))
+    assert respuesta.status_code == 200
+    return respuesta.headers['X-DB-Origen'], len(respuesta.json['data'])
+
+
+def test_get_sin_escrituras_lee_de_la_replica(cliente, replica):
+    assert _leer(cliente, 'ana') == ('replica0', 0)
+
+
+def test_quien_escribe_lee_de_la_primaria_durante_la_ventana(cliente, replica):
+    respuesta = cliente.put('/api/practicas/notas', headers=_cabeceras('ana'), json=[{'id': 1, 'nota': 6.0}])
+    assert respuesta.status_code == 200
+    assert respuesta.headers['X-DB-Origen'] == 'primaria'
+    
+    origen, filas = _leer(cliente, 'ana')
+    assert origen == 'primaria' and filas > 0
+    # Otra identidad sigue en la réplica
+    assert _leer(cliente, 'beto') == ('replica0', 0)
+    
+    time.sleep(0.6)
+    assert _leer(cliente, 'ana') == ('replica0', 0)
+
+
+def test_escrituras_van_siempre_a_la_primaria(cliente, replica):
+    respuesta = cliente.put('/api/practicas/notas', headers=_cabeceras('beto'), json=[{'id': 2, 'nota': 5.0}])
+    assert respuesta.status_code == 200
+    with db.engines['replica0'].connect() as conexion:
+        assert conexion.exec_driver_sql('SELECT count(*) FROM practicas').scalar() == 0
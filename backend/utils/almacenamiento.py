@@ -0,0 +1,209 @@
+import hashlib
+import os
+import re
+import uuid
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from app import db
+from models.documento import Documento
+from utils.trabajos import encolar, manejador
+
+TAMANO_BLOQUE = 64 * 1024
+
+_HASH = re.compile(r'^[0-9a-f]{64}$')
+
+
+def es_hash(valor):
+    return bool(valor) and bool(_HASH.match(valor))
+
+
+def directorio_blobs():
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], 'blobs')
+
+
+def ruta_blob(sha256):
+    return os.path.join(directorio_blobs(), sha256[:2], f'{sha256}.pdf')
+
+
+def ruta_relativa(ruta):
+    # Forma 'uploads/...' que usaban las rutas guardadas antes del almacenamiento por contenido
+    relativa = os.path.relpath(ruta, current_app.config['UPLOAD_FOLDER']).replace(os.sep, '/')
+    return f'uploads/{relativa}'
+
+
+def ruta_documento(valor):
+    """Ruta en disco de un documento: hash de contenido o ruta heredada."""
+    if not valor:
+        return None
+    if es_hash(valor):
+        return ruta_blob(valor)
+    if os.path.isabs(valor):
+        return valor
+    # Las rutas heredadas son relativas al antiguo directorio 'uploads' (a veces con '\\')
+    partes = valor.replace('\\', '/').split('/')
+    if partes[0] == 'uploads':
+        partes = partes[1:]
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], *partes)
+
+
+def _sincronizar_directorio(directorio):
+    # Persiste la entrada del directorio tras un rename (no aplica en Windows)
+    if os.name == 'nt':
+        return
+    descriptor = os.open(directorio, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def escribir_temporal(stream):
+    """Copia stream a un archivo temporal calculando su SHA-256.
+
+    El temporal está en el mismo sistema de archivos que los blobs y queda
+    sincronizado a disco, listo para el rename atómico de colocar_blob. No usa
+    la base de datos: se llama antes de abrir la transacción.
+    Devuelve (sha256, tamano, temporal).
+    """
+    directorio_temporal = os.path.join(directorio_blobs(), '.tmp')
+    os.makedirs(directorio_temporal, exist_ok=True)
+    temporal = os.path.join(directorio_temporal, uuid.uuid4().hex)
+    
+    sha256 = hashlib.sha256()
+    tamano = 0
+    try:
+        with open(temporal, 'wb') as destino:
+            while True:
+                bloque = stream.read(TAMANO_BLOQUE)
+                if not bloque:
+                    break
+                sha256.update(bloque)
+                tamano += len(bloque)
+                destino.write(bloque)
+            destino.flush()
+            os.fsync(destino.fileno())
+        return sha256.hexdigest(), tamano, temporal
+    except BaseException:
+        descartar_temporal(temporal)
+        raise
+
+
+def colocar_blob(sha256, temporal):
+    """Mueve el temporal a la ruta del blob, o lo descarta si el blob ya existe.
+
+    Se llama con la referencia ya sumada (agregar_referencia), que bloquea la
+    fila del documento hasta el commit: borrar_si_huerfano no puede eliminar el
+    blob entre esta comprobación y el commit, y si lo eliminó antes el blob se
+    vuelve a colocar aquí. Devuelve True si el archivo se colocó.
+    """
+    ruta = ruta_blob(sha256)
+    if os.path.exists(ruta):
+        descartar_temporal(temporal)
+        return False
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    os.replace(temporal, ruta)
+    _sincronizar_directorio(os.path.dirname(ruta))
+    return True
+
+
+def descartar_temporal(temporal):
+    if temporal and os.path.exists(temporal):
+        os.remove(temporal)
+
+
+def agregar_referencia(sha256, tamano):
+    """Suma una referencia al blob; devuelve True si es un contenido nuevo."""
+    actualizadas = Documento.query.filter_by(sha256=sha256)\
+                                  .update({Documento.referencias: Documento.referencias + 1},
+                                          synchronize_session=False)
+    if not actualizadas:
+        db.session.add(Documento(sha256=sha256, tamano=tamano, referencias=1))
+        db.session.flush()
+        return True
+    return False
+
+
+def quitar_referencia(valor):
+    """Descuenta una referencia y devuelve la ruta a borrar tras el commit, si queda huérfana."""
+    if not valor:
+        return None
+    if not es_hash(valor):
+        return ruta_documento(valor)
+    
+    Documento.query.filter_by(sha256=valor)\
+                   .update({Documento.referencias: Documento.referencias - 1},
+                           synchronize_session=False)
+    referencias = db.session.query(Documento.referencias).filter_by(sha256=valor).scalar()
+    return ruta_blob(valor) if not referencias or referencias <= 0 else None
+
+
+def metadatos_documentos(valores):
+    """Tamaño y resultados del procesamiento para un conjunto de hashes, en una consulta."""
+    hashes = {valor for valor in valores if es_hash(valor)}
+    if not hashes:
+        return {}
+    documentos = db.session.query(Documento.sha256, Documento.tamano, Documento.paginas,
+                                  Documento.valido, Documento.procesado_en)\
+                           .filter(Documento.sha256.in_(hashes))
+    return {
+        sha256: {
+            'tamano': tamano,
+            'paginas': paginas,
+            'valido': valido,
+            'procesado': procesado_en is not None
+        }
+        for sha256, tamano, paginas, valido, procesado_en in documentos
+    }
+
+
+def programar_borrado(ruta):
+    """Encola el borrado de ruta en la transacción en curso.
+
+    El archivo se elimina solo si el commit se confirma, y el trabajo sobrevive
+    a una caída del proceso entre el commit y el borrado.
+    """
+    if ruta:
+        encolar('borrar_archivo', ruta=ruta_relativa(ruta))
+
+
+@manejador('borrar_archivo')
+def borrar_archivo(ruta):
+    borrar_si_huerfano(ruta_documento(ruta))
+
+
+def borrar_si_huerfano(ruta):
+    """Elimina el archivo de un blob sin referencias. Se llama después del commit.
+
+    La fila del documento se bloquea y su contador se vuelve a leer en la
+    misma transacción que borra el archivo. Si la fila no existe (una subida
+    que no llegó a confirmar), se inserta una vacía para tener el mismo
+    bloqueo. Una subida concurrente del mismo contenido espera a esta
+    transacción y al continuar vuelve a colocar el blob (colocar_blob).
+    """
+    if not ruta:
+        return
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    if not es_hash(nombre):
+        if os.path.exists(ruta):
+            os.remove(ruta)
+        return
+    
+    documento = Documento.query.filter_by(sha256=nombre).with_for_update().first()
+    try:
+        if documento is None:
+            documento = Documento(sha256=nombre, tamano=0, referencias=0)
+            db.session.add(documento)
+            db.session.flush()
+    except IntegrityError:
+        # Una subida del mismo contenido insertó la fila y confirmó: el blob está en uso
+        db.session.rollback()
+        return
+    if documento.referencias > 0:
+        db.session.rollback()
+        return
+    
+    db.session.delete(documento)
+    db.session.flush()
+    if os.path.exists(ruta):
+        os.remove(ruta)
+    db.session.commit()
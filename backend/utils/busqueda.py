@@ -0,0 +1,125 @@
+"""Búsqueda de texto sobre estudiantes, prácticas y proyectos.
+
+En PostgreSQL se usan índices GIN sobre expresiones to_tsvector (declarados
+en los modelos); en SQLite, una tabla FTS5 mantenida con triggers.
+"""
+import re
+from sqlalchemy import event, text
+from app import db
+
+TIPOS_BUSQUEDA = ('estudiante', 'practica', 'proyecto')
+MAXIMO_TERMINOS = 8
+
+# Expresiones to_tsvector: deben coincidir exactamente con las de los índices
+VECTOR_ESTUDIANTE = ("to_tsvector('simple', coalesce(nombre, '') || ' ' || "
+                     "coalesce(apellido, '') || ' ' || coalesce(email, ''))")
+VECTOR_PRACTICA = "to_tsvector('simple', coalesce(empresa, '') || ' ' || coalesce(supervisor, ''))"
+VECTOR_PROYECTO = "to_tsvector('spanish', coalesce(titulo, '') || ' ' || coalesce(descripcion, ''))"
+
+_CONSULTAS_POSTGRES = {
+    'estudiante': f"""
+        SELECT 'estudiante' AS tipo, id, nombre || ' ' || apellido AS titulo, email AS detalle,
+               ts_rank({VECTOR_ESTUDIANTE}, to_tsquery('simple', :consulta)) AS rango
+        FROM estudiantes WHERE {VECTOR_ESTUDIANTE} @@ to_tsquery('simple', :consulta)""",
+    'practica': f"""
+        SELECT 'practica' AS tipo, id, empresa AS titulo, supervisor AS detalle,
+               ts_rank({VECTOR_PRACTICA}, to_tsquery('simple', :consulta)) AS rango
+        FROM practicas WHERE {VECTOR_PRACTICA} @@ to_tsquery('simple', :consulta)""",
+    'proyecto': f"""
+        SELECT 'proyecto' AS tipo, id, titulo, descripcion AS detalle,
+               ts_rank({VECTOR_PROYECTO}, to_tsquery('spanish', :consulta)) AS rango
+        FROM proyectos WHERE {VECTOR_PROYECTO} @@ to_tsquery('spanish', :consulta)""",
+}
+
+# SQLite: el rowid de la tabla FTS codifica tipo e id (id * 3 + desplazamiento)
+# para que los triggers reemplacen y borren filas sin recorrer la tabla.
+# {f} es el prefijo de columna: 'new.' dentro de los triggers, '' al poblarla.
+_FUENTES_SQLITE = {
+    'estudiante': ('estudiantes', 0, "{f}nombre || ' ' || {f}apellido", '{f}email'),
+    'practica': ('practicas', 1, '{f}empresa', '{f}supervisor'),
+    'proyecto': ('proyectos', 2, '{f}titulo', "coalesce({f}descripcion, '')"),
+}
+
+
+def ddl_busqueda_sqlite():
+    sentencias = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS busqueda USING fts5("
+        "tipo UNINDEXED, ref_id UNINDEXED, titulo, detalle, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    ]
+    for tipo, (tabla, desplazamiento, titulo, detalle) in _FUENTES_SQLITE.items():
+        insertar = (f"INSERT INTO busqueda(rowid, tipo, ref_id, titulo, detalle) VALUES "
+                    f"(new.id * 3 + {desplazamiento}, '{tipo}', new.id, "
+                    f"{titulo.format(f='new.')}, {detalle.format(f='new.')});")
+        borrar = f"DELETE FROM busqueda WHERE rowid = old.id * 3 + {desplazamiento};"
+        sentencias += [
+            f"CREATE TRIGGER IF NOT EXISTS busqueda_{tabla}_ai AFTER INSERT ON {tabla} "
+            f"BEGIN {insertar} END",
+            f"CREATE TRIGGER IF NOT EXISTS busqueda_{tabla}_au AFTER UPDATE ON {tabla} "
+            f"BEGIN {borrar} {insertar} END",
+            f"CREATE TRIGGER IF NOT EXISTS busqueda_{tabla}_ad AFTER DELETE ON {tabla} "
+            f"BEGIN {borrar} END",
+            f"INSERT INTO busqueda(rowid, tipo, ref_id, titulo, detalle) "
+            f"SELECT id * 3 + {desplazamiento}, '{tipo}', id, {titulo.format(f='')}, "
+            f"{detalle.format(f='')} FROM {tabla}",
+        ]
+    return sentencias
+
+
+def eliminar_busqueda_sqlite():
+    sentencias = [f'DROP TRIGGER IF EXISTS busqueda_{tabla}_{sufijo}'
+                  for tabla, *_ in _FUENTES_SQLITE.values() for sufijo in ('ai', 'au', 'ad')]
+    return sentencias + ['DROP TABLE IF EXISTS busqueda']
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _crear_busqueda_sqlite(metadata, connection, **kwargs):
+    # Bases creadas con db.create_all() (benchmarks, pruebas locales)
+    if connection.dialect.name == 'sqlite':
+        for sentencia in ddl_busqueda_sqlite():
+            connection.exec_driver_sql(sentencia)
+
+
+@event.listens_for(db.metadata, 'after_drop')
+def _eliminar_busqueda_sqlite(metadata, connection, **kwargs):
+    if connection.dialect.name == 'sqlite':
+        for sentencia in eliminar_busqueda_sqlite():
+            connection.exec_driver_sql(sentencia)
+
+
+def terminos(q):
+    palabras = re.findall(r'\w+', (q or '').lower())
+    return palabras[:MAXIMO_TERMINOS]
+
+
+def buscar(palabras, tipos, limite, offset):
+    """Devuelve hasta limite + 1 coincidencias ordenadas por relevancia.
+
+    Todas las palabras deben aparecer y cada una se busca como prefijo, así
+    'gonz ped' encuentra a 'Pedro González'.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        consulta = ' & '.join(f'{palabra}:*' for palabra in palabras)
+        sql = ' UNION ALL '.join(_CONSULTAS_POSTGRES[tipo] for tipo in tipos)
+        sql = f'SELECT * FROM ({sql}) AS resultados ORDER BY rango DESC, tipo, id LIMIT :limite OFFSET :offset'
+        filas = db.session.execute(text(sql), {
+            'consulta': consulta, 'limite': limite + 1, 'offset': offset
+        })
+    else:
+        consulta = ' '.join(f'"{palabra}"*' for palabra in palabras)
+        marcadores = ', '.join(f':tipo{i}' for i in range(len(tipos)))
+        sql = (f'SELECT tipo, ref_id AS id, titulo, detalle, -bm25(busqueda) AS rango FROM busqueda '
+               f'WHERE busqueda MATCH :consulta AND tipo IN ({marcadores}) '
+               f'ORDER BY rango DESC, tipo, id LIMIT :limite OFFSET :offset')
+        parametros = {f'tipo{i}': tipo for i, tipo in enumerate(tipos)}
+        filas = db.session.execute(text(sql), {
+            'consulta': consulta, 'limite': limite + 1, 'offset': offset, **parametros
+        })
+    
+    return [{
+        'tipo': fila.tipo,
+        'id': fila.id,
+        'titulo': fila.titulo,
+        'detalle': fila.detalle,
+        'rango': round(float(fila.rango), 4)
+    } for fila in filas]
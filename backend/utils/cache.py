@@ -0,0 +1,157 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, make_response, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app import db
+from models.version_recurso import VersionRecurso
+from utils.compresion import codificaciones_disponibles, etag_variante
+from utils.consultas import insertar_o_actualizar
+
+
+class CacheLRU:
+    def __init__(self):
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, clave):
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                self._entradas.move_to_end(clave)
+            return entrada
+
+    def guardar(self, clave, entrada, capacidad):
+        with self._lock:
+            self._entradas[clave] = entrada
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > capacidad:
+                self._entradas.popitem(last=False)
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+
+
+respuestas = CacheLRU()
+
+
+# Versiones por recurso (tabla), guardadas en la tabla versiones: todos los
+# procesos y servidores ven la misma versión, y la lectura va a la misma base
+# (primaria o réplica) que los datos, así versión y contenido son coherentes.
+
+# Solo se versionan las tablas de las que depende alguna respuesta o resumen;
+# así las escrituras de la cola de trabajos no suman una sentencia más
+RECURSOS_VERSIONADOS = set()
+
+
+def versionar(*recursos):
+    RECURSOS_VERSIONADOS.update(recursos)
+
+
+def versiones_recursos(recursos):
+    """Versión actual de cada recurso, en una consulta por clave primaria."""
+    versiones = dict(db.session.query(VersionRecurso.recurso, VersionRecurso.version)
+                                .filter(VersionRecurso.recurso.in_(recursos)))
+    return [versiones.get(recurso, 0) for recurso in recursos]
+
+
+def version_recurso(recurso):
+    return versiones_recursos([recurso])[0]
+
+
+def subir_versiones(session, recursos):
+    """Sube la versión de los recursos dentro de la transacción en curso."""
+    # Orden fijo: dos transacciones que suben las mismas versiones no se bloquean mutuamente
+    insertar_o_actualizar(session, VersionRecurso,
+                          [{'recurso': recurso, 'version': 1} for recurso in sorted(recursos)],
+                          lambda tabla, propuestas: {'version': tabla.c.version + 1})
+
+
+def respuesta_cacheable(*recursos):
+    """Cachea la respuesta JSON de un GET mientras no cambien sus recursos.
+
+    La ETag se deriva de la ruta, los parámetros y las versiones de los
+    recursos, así un If-None-Match vigente se responde con 304 tras una sola
+    consulta (la de las versiones).
+    """
+    versionar(*recursos)
+    
+    def decorador(f):
+        @wraps(f)
+        def envoltura(*args, **kwargs):
+            if not current_app.config.get('RESPONSE_CACHE_ENABLED', True):
+                return f(*args, **kwargs)
+            
+            parametros = sorted(request.args.items(multi=True))
+            versiones = versiones_recursos(recursos)
+            etag = hashlib.sha1(repr((request.path, parametros, versiones)).encode()).hexdigest()
+            
+            # La ETag de una variante comprimida lleva el sufijo de su codificación;
+            # el 304 devuelve la que coincidió y, como el 200, varía según Accept-Encoding
+            etiquetas = [etag] + [etag_variante(etag, codificacion)
+                                  for codificacion in codificaciones_disponibles()]
+            coincidente = next((etiqueta for etiqueta in etiquetas
+                                if request.if_none_match.contains(etiqueta)), None)
+            if coincidente is not None:
+                respuesta = current_app.response_class(status=304)
+                respuesta.set_etag(coincidente)
+                respuesta.vary.add('Accept-Encoding')
+            else:
+                entrada = respuestas.obtener(etag)
+                if entrada is not None:
+                    mimetype, variantes = entrada
+                    respuesta = current_app.response_class(variantes['identity'], mimetype=mimetype)
+                else:
+                    respuesta = make_response(f(*args, **kwargs))
+                    if respuesta.status_code != 200:
+                        return respuesta
+                    # Las variantes comprimidas las agrega utils/compresion.py al servirlas
+                    variantes = {'identity': respuesta.get_data()}
+                    respuestas.guardar(etag, (respuesta.mimetype, variantes),
+                                       current_app.config['RESPONSE_CACHE_SIZE'])
+                respuesta.variantes = variantes
+                respuesta.set_etag(etag)
+            
+            respuesta.cache_control.private = True
+            respuesta.cache_control.no_cache = True
+            return respuesta
+        return envoltura
+    return decorador
+
+
+# Invalidación: toda escritura cambia la versión de sus tablas en la misma transacción
+
+def _pendientes(session):
+    return session.info.setdefault('recursos_modificados', set())
+
+
+@event.listens_for(Session, 'after_flush')
+def _registrar_flush(session, flush_context):
+    for objeto in list(session.new) + list(session.dirty) + list(session.deleted):
+        tabla = getattr(objeto, '__tablename__', None)
+        if tabla:
+            _pendientes(session).add(tabla)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _registrar_ejecucion(orm_execute_state):
+    if (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert) \
+            and orm_execute_state.bind_mapper is not None:
+        _pendientes(orm_execute_state.session).add(orm_execute_state.bind_mapper.local_table.name)
+
+
+@event.listens_for(Session, 'before_commit')
+def _subir_versiones_al_confirmar(session):
+    session.flush()
+    recursos = session.info.get('recursos_modificados', set()) & RECURSOS_VERSIONADOS
+    if recursos:
+        subir_versiones(session, recursos)
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def _descartar_recursos(session):
+    session.info.pop('recursos_modificados', None)
@@ -0,0 +1,113 @@
+"""Registro de cambios de estudiantes, prácticas, proyectos y profesores.
+
+Los eventos de sesión anotan cada fila creada, actualizada o eliminada en la
+tabla cambios dentro de la misma transacción que la escritura; el id del
+registro sirve de cursor para /api/cambios (y para el canal de eventos).
+"""
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import event, func, insert, inspect
+from sqlalchemy.orm import Session
+from app import db
+from models.cambio import Cambio
+from models.estudiante import Estudiante
+from models.practica import Practica
+from models.profesor import Profesor
+from models.proyecto import Proyecto
+
+ENTIDADES = {
+    'estudiantes': Estudiante,
+    'practicas': Practica,
+    'proyectos': Proyecto,
+    'profesores': Profesor,
+}
+
+_TABLAS = {modelo.__tablename__ for modelo in ENTIDADES.values()}
+
+
+def _pendientes(session):
+    return session.info.setdefault('cambios_pendientes', [])
+
+
+def _accion_actualizacion(objeto):
+    # Los profesores se desactivan en vez de borrarse: se informa como eliminación
+    if isinstance(objeto, Profesor) and inspect(objeto).attrs.activo.history.added == [False]:
+        return 'eliminado'
+    return 'actualizado'
+
+
+@event.listens_for(Session, 'after_flush')
+def _registrar_cambios(session, flush_context):
+    pendientes = _pendientes(session)
+    for objeto in session.new:
+        if getattr(objeto, '__tablename__', None) in _TABLAS:
+            pendientes.append((objeto.__tablename__, objeto.id, 'creado'))
+    for objeto in session.dirty:
+        if getattr(objeto, '__tablename__', None) in _TABLAS \
+                and session.is_modified(objeto, include_collections=False):
+            pendientes.append((objeto.__tablename__, objeto.id, _accion_actualizacion(objeto)))
+    for objeto in session.deleted:
+        if getattr(objeto, '__tablename__', None) in _TABLAS:
+            pendientes.append((objeto.__tablename__, objeto.id, 'eliminado'))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _registrar_ejecucion_masiva(orm_execute_state):
+    estado = orm_execute_state
+    if not (estado.is_update or estado.is_delete or estado.is_insert) or estado.bind_mapper is None:
+        return
+    tabla = estado.bind_mapper.local_table.name
+    if tabla not in _TABLAS:
+        return
+    
+    accion = 'creado' if estado.is_insert else 'eliminado' if estado.is_delete else 'actualizado'
+    parametros = estado.parameters
+    # Escrituras masivas por clave primaria (lista de diccionarios con id)
+    if isinstance(parametros, list) and parametros and all('id' in fila for fila in parametros):
+        _pendientes(estado.session).extend((tabla, fila['id'], accion) for fila in parametros)
+    else:
+        _pendientes(estado.session).append((tabla, None, 'recargar'))
+
+
+@event.listens_for(Session, 'before_commit')
+def _guardar_cambios(session):
+    session.flush()
+    pendientes = session.info.pop('cambios_pendientes', None)
+    if pendientes:
+        ahora = datetime.utcnow()
+        session.execute(insert(Cambio), [
+            {'entidad': entidad, 'entidad_id': entidad_id, 'accion': accion, 'creado_en': ahora}
+            for entidad, entidad_id, accion in pendientes
+        ])
+
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_cambios(session):
+    session.info.pop('cambios_pendientes', None)
+
+
+def cursor_actual():
+    return db.session.query(func.coalesce(func.max(Cambio.id), 0)).scalar()
+
+
+def cambios_desde(cursor, limite):
+    """Registros posteriores al cursor, hasta limite + 1.
+
+    Se omiten los más recientes que CAMBIOS_MARGEN_SEGUNDOS: los ids se asignan
+    al insertar y no al confirmar, así que una transacción larga puede
+    confirmar un id menor después de que el cliente ya avanzó su cursor.
+    """
+    margen = timedelta(seconds=current_app.config['CAMBIOS_MARGEN_SEGUNDOS'])
+    return Cambio.query.filter(Cambio.id > cursor, Cambio.creado_en <= datetime.utcnow() - margen)\
+                       .order_by(Cambio.id)\
+                       .limit(limite + 1)\
+                       .all()
+
+
+def filas_actuales(entidad, ids):
+    """Estado actual de las filas indicadas, con todas sus columnas."""
+    modelo = ENTIDADES[entidad]
+    tabla = modelo.__table__
+    columnas = [columna for columna in tabla.columns]
+    return [fila._asdict() for fila in
+            db.session.query(*columnas).filter(tabla.c.id.in_(ids)).order_by(tabla.c.id)]
@@ -0,0 +1,130 @@
+from collections import Counter
+from flask import current_app
+from sqlalchemy import func, literal, select, union_all, update
+from app import db
+from models.carga_profesor import CargaProfesor
+from models.profesor import Profesor
+from models.proyecto import Proyecto
+
+
+def carga_mantenida():
+    return current_app.config.get('CARGA_PROFESORES_MANTENIDA', False)
+
+
+def _subconsulta_carga():
+    # Un único agregado agrupado sobre los proyectos abiertos (sin nota)
+    guias = db.session.query(
+        Proyecto.profesor_guia_id.label('profesor_id'),
+        literal(1).label('guia'),
+        literal(0).label('informante')
+    ).filter(Proyecto.nota.is_(None))
+    informantes = db.session.query(
+        Proyecto.profesor_informante_id.label('profesor_id'),
+        literal(0).label('guia'),
+        literal(1).label('informante')
+    ).filter(Proyecto.nota.is_(None))
+    abiertos = union_all(guias, informantes).subquery()
+    return db.session.query(
+        abiertos.c.profesor_id,
+        func.sum(abiertos.c.guia).label('proyectos_guiados'),
+        func.sum(abiertos.c.informante).label('proyectos_informados')
+    ).group_by(abiertos.c.profesor_id).subquery()
+
+
+def profesores_con_carga(*columnas):
+    """Consulta de tuplas (Profesor, proyectos_guiados, proyectos_informados).
+
+    Con columnas (p. ej. Profesor.id, Profesor.nombre) se consultan esas en
+    lugar de la entidad completa.
+    """
+    carga = CargaProfesor.__table__ if carga_mantenida() else _subconsulta_carga()
+    return db.session.query(
+        *(columnas or (Profesor,)),
+        func.coalesce(carga.c.proyectos_guiados, 0).label('proyectos_guiados'),
+        func.coalesce(carga.c.proyectos_informados, 0).label('proyectos_informados')
+    ).outerjoin(carga, carga.c.profesor_id == Profesor.id)
+
+
+def carga_de(profesor_id):
+    fila = profesores_con_carga().filter(Profesor.id == profesor_id).first()
+    if not fila:
+        return 0, 0
+    return int(fila[1]), int(fila[2])
+
+
+def _sumar(profesor_id, columna, delta):
+    actualizadas = CargaProfesor.query.filter_by(profesor_id=profesor_id)\
+                                      .update({columna: columna + delta}, synchronize_session=False)
+    if not actualizadas:
+        db.session.add(CargaProfesor(profesor_id=profesor_id, **{columna.key: max(delta, 0)}))
+        db.session.flush()
+
+
+def ajustar_carga(profesor_guia_id, profesor_informante_id, delta):
+    if not carga_mantenida() or not delta:
+        return
+    if profesor_guia_id is not None:
+        _sumar(profesor_guia_id, CargaProfesor.proyectos_guiados, delta)
+    if profesor_informante_id is not None:
+        _sumar(profesor_informante_id, CargaProfesor.proyectos_informados, delta)
+
+
+def ajustar_carga_lote(profesores, delta):
+    """Como ajustar_carga para varios proyectos [(guia_id, informante_id)].
+
+    Agrupa por profesor y usa a lo más tres sentencias (lectura con bloqueo,
+    alta de las filas que faltan y un UPDATE masivo), así el costo no depende
+    de la cantidad de proyectos ni de profesores.
+    """
+    if not carga_mantenida() or not delta:
+        return
+    guiados = Counter(guia for guia, _ in profesores if guia is not None)
+    informados = Counter(informante for _, informante in profesores if informante is not None)
+    ids = sorted(set(guiados) | set(informados))
+    if not ids:
+        return
+    
+    # Orden fijo de bloqueo, como en subir_versiones
+    actuales = {fila.profesor_id: fila for fila in db.session.execute(
+        select(CargaProfesor.profesor_id, CargaProfesor.proyectos_guiados, CargaProfesor.proyectos_informados)
+        .where(CargaProfesor.profesor_id.in_(ids))
+        .order_by(CargaProfesor.profesor_id)
+        .with_for_update()
+    )}
+    
+    nuevas, cambios = [], []
+    for profesor_id in ids:
+        fila = actuales.get(profesor_id)
+        if fila is None:
+            nuevas.append(CargaProfesor(profesor_id=profesor_id,
+                                        proyectos_guiados=max(delta * guiados[profesor_id], 0),
+                                        proyectos_informados=max(delta * informados[profesor_id], 0)))
+        else:
+            cambios.append({
+                'profesor_id': profesor_id,
+                'proyectos_guiados': fila.proyectos_guiados + delta * guiados[profesor_id],
+                'proyectos_informados': fila.proyectos_informados + delta * informados[profesor_id]
+            })
+    if nuevas:
+        db.session.add_all(nuevas)
+        db.session.flush()
+    if cambios:
+        db.session.execute(update(CargaProfesor), cambios)
+
+
+def recalcular_carga():
+    carga = _subconsulta_carga()
+    filas = db.session.query(
+        Profesor.id,
+        func.coalesce(carga.c.proyectos_guiados, 0),
+        func.coalesce(carga.c.proyectos_informados, 0)
+    ).outerjoin(carga, carga.c.profesor_id == Profesor.id).all()
+    
+    CargaProfesor.query.delete()
+    db.session.bulk_insert_mappings(CargaProfesor, [{
+        'profesor_id': profesor_id,
+        'proyectos_guiados': int(guiados),
+        'proyectos_informados': int(informados)
+    } for profesor_id, guiados, informados in filas])
+    db.session.commit()
+    return len(filas)
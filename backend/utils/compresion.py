@@ -0,0 +1,75 @@
+"""Compresión gzip/brotli negociada para las respuestas JSON de /api.
+
+Las respuestas servidas por respuesta_cacheable traen el diccionario de
+variantes de su entrada en la caché; la versión comprimida se guarda ahí, así
+una lista se comprime una vez por versión de los datos y no en cada petición.
+brotli es opcional: sin el paquete solo se ofrece gzip.
+"""
+import gzip
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+
+def codificaciones_disponibles():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def codificacion_aceptada():
+    """La mejor codificación que acepta el cliente, o None."""
+    aceptadas = request.accept_encodings
+    candidatas = [(aceptadas[codificacion], codificacion) for codificacion in codificaciones_disponibles()
+                  if aceptadas[codificacion] > 0]
+    if not candidatas:
+        return None
+    # A igual calidad se prefiere brotli (primero en la lista)
+    return max(candidatas, key=lambda candidata: candidata[0])[1]
+
+
+def comprimir(cuerpo, codificacion):
+    if codificacion == 'br':
+        return brotli.compress(cuerpo, quality=current_app.config['COMPRESSION_BROTLI_QUALITY'])
+    return gzip.compress(cuerpo, compresslevel=current_app.config['COMPRESSION_GZIP_LEVEL'], mtime=0)
+
+
+def etag_variante(etag, codificacion):
+    return f'{etag}-{codificacion}'
+
+
+def _comprimir_respuesta(respuesta):
+    if not current_app.config.get('COMPRESSION_ENABLED', True):
+        return respuesta
+    if respuesta.status_code != 200 or respuesta.mimetype != 'application/json' \
+            or respuesta.direct_passthrough or respuesta.is_streamed \
+            or 'Content-Encoding' in respuesta.headers or not request.path.startswith('/api/'):
+        return respuesta
+    
+    variantes = getattr(respuesta, 'variantes', None)
+    cuerpo = variantes['identity'] if variantes else respuesta.get_data()
+    if len(cuerpo) < current_app.config['COMPRESSION_MIN_SIZE']:
+        return respuesta
+    
+    respuesta.vary.add('Accept-Encoding')
+    codificacion = codificacion_aceptada()
+    if codificacion is None:
+        return respuesta
+    
+    comprimido = variantes.get(codificacion) if variantes else None
+    if comprimido is None:
+        comprimido = comprimir(cuerpo, codificacion)
+        if variantes is not None:
+            variantes[codificacion] = comprimido
+    
+    respuesta.set_data(comprimido)
+    respuesta.headers['Content-Encoding'] = codificacion
+    etag, debil = respuesta.get_etag()
+    if etag:
+        respuesta.set_etag(etag_variante(etag, codificacion), weak=debil)
+    return respuesta
+
+
+def registrar_compresion(app):
+    app.after_request(_comprimir_respuesta)
@@ -0,0 +1,86 @@
+import logging
+import time
+from functools import wraps
+from flask import current_app, g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class PresupuestoExcedido(Exception):
+    pass
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _contar_consulta(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        g.consultas_sql = g.get('consultas_sql', 0) + 1
+        context._inicio_consulta = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _medir_consulta(conn, cursor, statement, parameters, context, executemany):
+    inicio = getattr(context, '_inicio_consulta', None)
+    if inicio is not None and has_request_context():
+        g.tiempo_sql = g.get('tiempo_sql', 0.0) + time.perf_counter() - inicio
+
+
+def consultas_realizadas():
+    return g.get('consultas_sql', 0) if has_request_context() else 0
+
+
+def tiempo_sql():
+    return g.get('tiempo_sql', 0.0) if has_request_context() else 0.0
+
+
+def insertar_o_actualizar(session, modelo, filas, actualizar):
+    """INSERT ... ON CONFLICT (clave primaria) DO UPDATE en PostgreSQL y SQLite.
+
+    actualizar recibe la tabla y las filas propuestas (excluded) y devuelve
+    los valores del DO UPDATE. Dos escrituras concurrentes de la misma clave
+    no chocan: la segunda actualiza la fila de la primera.
+    """
+    tabla = modelo.__table__
+    dialecto = session.get_bind(mapper=modelo).dialect.name
+    sentencia = (postgresql if dialecto == 'postgresql' else sqlite).insert(tabla).values(filas)
+    sentencia = sentencia.on_conflict_do_update(
+        index_elements=[columna.name for columna in tabla.primary_key],
+        set_=actualizar(tabla, sentencia.excluded)
+    )
+    return session.execute(sentencia)
+
+
+def estadisticas_pool(engine):
+    pool = engine.pool
+    estadisticas = {'tipo': type(pool).__name__, 'estado': pool.status()}
+    for clave, metodo in (('tamano', 'size'), ('en_uso', 'checkedout'),
+                          ('disponibles', 'checkedin'), ('overflow', 'overflow')):
+        if hasattr(pool, metodo):
+            estadisticas[clave] = getattr(pool, metodo)()
+    return estadisticas
+
+
+def presupuesto_consultas(maximo):
+    """Limita la cantidad de consultas SQL que puede ejecutar un endpoint.
+
+    Con QUERY_BUDGET_STRICT (activo en TESTING) exceder el presupuesto lanza
+    PresupuestoExcedido; en otro caso solo se registra una advertencia.
+    """
+    def decorador(f):
+        @wraps(f)
+        def envoltura(*args, **kwargs):
+            inicio = consultas_realizadas()
+            respuesta = f(*args, **kwargs)
+            usadas = consultas_realizadas() - inicio
+            if usadas > maximo:
+                mensaje = f'{f.__name__} ejecutó {usadas} consultas (presupuesto: {maximo})'
+                if current_app.config.get('QUERY_BUDGET_STRICT') or current_app.testing:
+                    raise PresupuestoExcedido(mensaje)
+                logger.warning(mensaje)
+            return respuesta
+
+        envoltura.presupuesto_consultas = maximo
+        return envoltura
+    return decorador
@@ -0,0 +1,200 @@
+"""Estadísticas del departamento precalculadas en resumen_estadisticas.
+
+Cada sección se guarda con las versiones de sus tablas de origen (tabla
+versiones, compartida por todos los servidores). Una escritura que toca esas
+tablas encola, si no hay ya uno pendiente, un trabajo que recalcula las
+secciones desactualizadas; si una lectura encuentra una sección desactualizada
+(el trabajo aún no corre) la recalcula ella misma, así nunca se sirven datos
+viejos. Solo el trabajo guarda el resumen: una lectura puede venir de una
+réplica atrasada y no debe sellar datos viejos con esas versiones.
+"""
+from datetime import datetime
+from flask import has_app_context
+from sqlalchemy import case, event, func
+from sqlalchemy.orm import Session
+from app import db
+from models.practica import Practica, TIPOS_PRACTICA
+from models.profesor import Profesor
+from models.proyecto import Proyecto
+from models.resumen_estadistica import ResumenEstadistica
+from models.trabajo import Trabajo
+from utils.cache import versionar, versiones_recursos
+from utils.carga import profesores_con_carga
+from utils.consultas import insertar_o_actualizar
+from utils.trabajos import encolar, manejador
+
+MAXIMO_EMPRESAS = 50
+
+
+def _redondear(valor):
+    return round(float(valor), 2) if valor is not None else None
+
+
+def _proyectos():
+    abierto = Proyecto.nota.is_(None)
+    filas = db.session.query(
+        abierto.label('abierto'), Proyecto.estado, func.count(Proyecto.id), func.avg(Proyecto.nota)
+    ).group_by(abierto, Proyecto.estado).all()
+    
+    abiertos = sum(cantidad for es_abierto, _, cantidad, _ in filas if es_abierto)
+    cerrados = {estado: (cantidad, promedio) for es_abierto, estado, cantidad, promedio in filas
+                if not es_abierto}
+    total_cerrados = sum(cantidad for cantidad, _ in cerrados.values())
+    aprobados = cerrados.get('Aprobado', (0, None))[0]
+    suma_notas = sum(cantidad * promedio for cantidad, promedio in cerrados.values() if promedio is not None)
+    return {
+        'abiertos': abiertos,
+        'cerrados': total_cerrados,
+        'aprobados': aprobados,
+        'reprobados': cerrados.get('Reprobado', (0, None))[0],
+        'tasa_aprobacion': _redondear(aprobados / total_cerrados) if total_cerrados else None,
+        'nota_promedio': _redondear(suma_notas / total_cerrados) if total_cerrados else None
+    }
+
+
+def _practicas():
+    filas = db.session.query(
+        Practica.tipo_practica,
+        func.count(Practica.id),
+        func.count(Practica.nota),
+        func.avg(Practica.nota),
+        func.sum(case((Practica.nota >= 4.0, 1), else_=0))
+    ).group_by(Practica.tipo_practica).all()
+    
+    por_tipo = {tipo: {'total': 0, 'evaluadas': 0, 'nota_promedio': None, 'aprobadas': 0}
+                for tipo in TIPOS_PRACTICA}
+    for tipo, total, evaluadas, promedio, aprobadas in filas:
+        por_tipo[tipo] = {
+            'total': total,
+            'evaluadas': evaluadas,
+            'nota_promedio': _redondear(promedio),
+            'aprobadas': int(aprobadas or 0)
+        }
+    return por_tipo
+
+
+def _empresas():
+    cantidad = func.count(Practica.id)
+    filas = db.session.query(Practica.empresa, cantidad)\
+                      .group_by(Practica.empresa)\
+                      .order_by(cantidad.desc(), Practica.empresa)\
+                      .all()
+    return {
+        'total_empresas': len(filas),
+        'principales': [{'empresa': empresa, 'practicas': total}
+                        for empresa, total in filas[:MAXIMO_EMPRESAS]],
+        'otras_practicas': sum(total for _, total in filas[MAXIMO_EMPRESAS:])
+    }
+
+
+def _carga():
+    return [{
+        'profesor_id': profesor.id,
+        'nombre': f'{profesor.nombre} {profesor.apellido}',
+        'proyectos_guiados': int(guiados),
+        'proyectos_informados': int(informados)
+    } for profesor, guiados, informados in profesores_con_carga().order_by(Profesor.id).all()]
+
+
+# sección -> (tablas de origen, función que la calcula)
+SECCIONES = {
+    'proyectos': (('proyectos',), _proyectos),
+    'practicas': (('practicas',), _practicas),
+    'empresas': (('practicas',), _empresas),
+    'carga_profesores': (('proyectos', 'profesores', 'carga_profesores'), _carga),
+}
+
+TABLAS_ORIGEN = {tabla for tablas, _ in SECCIONES.values() for tabla in tablas}
+versionar(*TABLAS_ORIGEN)
+
+
+def _sellos():
+    """Sello de cada sección (versiones de sus tablas), en una consulta."""
+    tablas = sorted(TABLAS_ORIGEN)
+    versiones = dict(zip(tablas, versiones_recursos(tablas)))
+    return {seccion: ','.join(str(versiones[tabla]) for tabla in origen)
+            for seccion, (origen, _) in SECCIONES.items()}
+
+
+def _guardar(calculadas):
+    """Guarda {seccion: (sello, datos)}; dos trabajos que recalculan a la vez no chocan."""
+    ahora = datetime.utcnow()
+    insertar_o_actualizar(db.session, ResumenEstadistica, [
+        {'seccion': seccion, 'versiones': sello, 'datos': datos, 'calculado_en': ahora}
+        for seccion, (sello, datos) in calculadas.items()
+    ], lambda tabla, propuestas: {
+        'versiones': propuestas.versiones,
+        'datos': propuestas.datos,
+        'calculado_en': propuestas.calculado_en
+    })
+    return ahora
+
+
+def _desactualizadas(secciones):
+    """Recalcula las secciones cuyo sello no coincide con el guardado.
+
+    Los sellos se leen antes de calcular: si una escritura llega entremedio la
+    sección queda marcada como desactualizada y no al revés.
+    """
+    guardadas = {seccion: (versiones, datos, calculado_en) for seccion, versiones, datos, calculado_en in
+                 db.session.query(ResumenEstadistica.seccion, ResumenEstadistica.versiones,
+                                  ResumenEstadistica.datos, ResumenEstadistica.calculado_en)}
+    sellos = _sellos()
+    calculadas = {}
+    for seccion in secciones:
+        guardada = guardadas.get(seccion)
+        if guardada is None or guardada[0] != sellos[seccion]:
+            calculadas[seccion] = (sellos[seccion], SECCIONES[seccion][1]())
+    return guardadas, calculadas
+
+
+def _encolar_si_no_hay_pendiente(session):
+    # Un trabajo aún pendiente recalculará al correr todo lo desactualizado
+    pendiente = session.query(Trabajo.id)\
+                       .filter(Trabajo.estado == 'pendiente', Trabajo.tipo == 'refrescar_estadisticas')\
+                       .first()
+    if pendiente is None:
+        encolar('refrescar_estadisticas')
+
+
+def obtener_estadisticas():
+    guardadas, calculadas = _desactualizadas(SECCIONES)
+    if calculadas:
+        # Se sirve lo calculado sin guardarlo; el trabajo lo guarda leyendo de la primaria
+        calculado_en = datetime.utcnow()
+        _encolar_si_no_hay_pendiente(db.session)
+        db.session.commit()
+        for seccion, (sello, datos) in calculadas.items():
+            guardadas[seccion] = (sello, datos, calculado_en)
+    
+    return {
+        **{seccion: guardadas[seccion][1] for seccion in SECCIONES},
+        'calculado_en': min(guardadas[seccion][2] for seccion in SECCIONES).isoformat()
+    }
+
+
+@manejador('refrescar_estadisticas')
+def refrescar_estadisticas(tablas=None):
+    # tablas solo llega en trabajos encolados por versiones anteriores
+    secciones = [seccion for seccion, (origen, _) in SECCIONES.items()
+                 if tablas is None or set(origen) & set(tablas)]
+    _, calculadas = _desactualizadas(secciones)
+    if calculadas:
+        _guardar(calculadas)
+    db.session.commit()
+
+
+@event.listens_for(Session, 'before_commit')
+def _encolar_refresco(session):
+    if session.info.get('estadisticas_encoladas') or not has_app_context():
+        return
+    session.flush()
+    if session.info.get('recursos_modificados', set()) & TABLAS_ORIGEN:
+        session.info['estadisticas_encoladas'] = True
+        _encolar_si_no_hay_pendiente(session)
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def _limpiar_marca(session):
+    session.info.pop('estadisticas_encoladas', None)
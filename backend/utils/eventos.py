@@ -0,0 +1,117 @@
+"""Difusión de cambios a los clientes conectados a /api/eventos.
+
+Un hilo por proceso lee la tabla cambios y reparte cada registro a las colas
+de los suscriptores. Mientras nadie escribe cada vuelta es una sola consulta:
+el máximo id de cambios, por clave primaria.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from app import db
+from utils.cambios import cambios_desde, cursor_actual
+
+logger = logging.getLogger(__name__)
+
+LOTE_EVENTOS = 500
+
+
+class ServidorLleno(Exception):
+    pass
+
+
+class Suscriptor:
+    """Cola acotada de un cliente; si se llena se marca como desbordada."""
+
+    def __init__(self, capacidad):
+        self.cola = deque()
+        self.capacidad = capacidad
+        self.desbordado = False
+        self.aviso = threading.Event()
+
+    def entregar(self, evento):
+        if len(self.cola) >= self.capacidad:
+            self.desbordado = True
+        else:
+            self.cola.append(evento)
+        self.aviso.set()
+
+    def esperar(self, segundos):
+        self.aviso.wait(segundos)
+        self.aviso.clear()
+
+    def tomar(self):
+        eventos = []
+        while self.cola:
+            eventos.append(self.cola.popleft())
+        return eventos
+
+
+class Difusor:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._suscriptores = set()
+        self._pid = None
+        self.ultimo = 0
+
+    def suscribir(self, app):
+        with self._lock:
+            if len(self._suscriptores) >= app.config['EVENTOS_MAX_CLIENTES']:
+                raise ServidorLleno('Demasiadas conexiones de eventos en este proceso')
+            suscriptor = Suscriptor(app.config['EVENTOS_BUFFER'])
+            self._suscriptores.add(suscriptor)
+        self._iniciar(app)
+        return suscriptor
+
+    def desuscribir(self, suscriptor):
+        with self._lock:
+            self._suscriptores.discard(suscriptor)
+
+    def _iniciar(self, app):
+        # Un hilo por proceso, también en los workers creados por fork
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            with app.app_context():
+                self.ultimo = cursor_actual()
+                db.session.remove()
+            self._pid = os.getpid()
+            threading.Thread(target=self._bucle, args=(app,), name='difusor-eventos', daemon=True).start()
+
+    def _bucle(self, app):
+        intervalo = app.config['EVENTOS_INTERVALO']
+        while True:
+            time.sleep(intervalo)
+            try:
+                with app.app_context():
+                    # Los registros recientes quedan retenidos por el margen de
+                    # cambios_desde; mientras tanto el cursor sigue adelante
+                    # y se vuelve a repartir en la vuelta siguiente
+                    if cursor_actual() > self.ultimo:
+                        self._repartir()
+                    else:
+                        db.session.remove()
+            except Exception:
+                logger.exception('Error en el difusor de eventos')
+
+    def _repartir(self):
+        try:
+            while True:
+                registros = cambios_desde(self.ultimo, LOTE_EVENTOS)
+                for registro in registros[:LOTE_EVENTOS]:
+                    evento = registro.to_dict()
+                    with self._lock:
+                        suscriptores = list(self._suscriptores)
+                    for suscriptor in suscriptores:
+                        suscriptor.entregar(evento)
+                    self.ultimo = registro.id
+                if len(registros) <= LOTE_EVENTOS:
+                    break
+        finally:
+            db.session.remove()
+
+
+difusor = Difusor()
@@ -0,0 +1,45 @@
+import csv
+import io
+from flask import Response, stream_with_context
+
+TAMANO_BLOQUE = 64 * 1024
+
+
+def _valor(valor):
+    if valor is None:
+        return ''
+    if hasattr(valor, 'isoformat'):
+        return valor.isoformat()
+    return valor
+
+
+def _csv(encabezados, filas):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    # BOM para que Excel reconozca el archivo como UTF-8
+    buffer.write('\ufeff')
+    writer.writerow(encabezados)
+    
+    for fila in filas:
+        writer.writerow([_valor(valor) for valor in fila])
+        if buffer.tell() >= TAMANO_BLOQUE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    yield buffer.getvalue()
+
+
+def respuesta_csv(nombre_archivo, encabezados, query, filas_por_lote=1000):
+    """Transmite el resultado de query como CSV sin cargarlo completo en memoria.
+
+    La consulta se recorre con un cursor del lado del servidor (yield_per),
+    por lo que la memoria usada no depende de la cantidad de filas.
+    """
+    filas = query.yield_per(filas_por_lote)
+    return Response(
+        stream_with_context(_csv(encabezados, filas)),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={nombre_archivo}'}
+    )
@@ -0,0 +1,97 @@
+from datetime import datetime
+from sqlalchemy import or_
+from models.estudiante import Estudiante
+from models.practica import Practica, TIPOS_PRACTICA
+from models.proyecto import Proyecto
+from utils.paginacion import ParametroInvalido, entero
+
+ORDEN_ESTUDIANTES = {
+    'id': Estudiante.id,
+    'nombre': Estudiante.nombre,
+    'apellido': Estudiante.apellido,
+    'email': Estudiante.email
+}
+
+ORDEN_PRACTICAS = {
+    'id': Practica.id,
+    'empresa': Practica.empresa,
+    'fecha_inicio': Practica.fecha_inicio,
+    'fecha_termino': Practica.fecha_termino
+}
+
+ORDEN_PROYECTOS = {
+    'id': Proyecto.id,
+    'titulo': Proyecto.titulo
+}
+
+ORDEN_PROYECTOS_FINALIZADOS = {
+    **ORDEN_PROYECTOS,
+    'nota': Proyecto.nota
+}
+
+
+def _fecha(valor, campo):
+    try:
+        return datetime.strptime(valor, '%Y-%m-%d').date()
+    except ValueError:
+        raise ParametroInvalido(f'Formato de fecha inválido para {campo}')
+
+
+def _booleano(valor, campo):
+    valor = valor.lower()
+    if valor in ('1', 'true', 'si', 'sí'):
+        return True
+    if valor in ('0', 'false', 'no'):
+        return False
+    raise ParametroInvalido(f'El parámetro {campo} debe ser true o false')
+
+
+def _rango_fechas(query, args, columna, campo):
+    if args.get(f'{campo}_desde'):
+        query = query.filter(columna >= _fecha(args[f'{campo}_desde'], f'{campo}_desde'))
+    if args.get(f'{campo}_hasta'):
+        query = query.filter(columna <= _fecha(args[f'{campo}_hasta'], f'{campo}_hasta'))
+    return query
+
+
+def _ids(valor):
+    return [entero(parte, 'ids') for parte in valor.split(',') if parte.strip()]
+
+
+def filtrar_practicas(query, args):
+    if args.get('ids'):
+        query = query.filter(Practica.id.in_(_ids(args['ids'])))
+    if args.get('tipo_practica'):
+        tipo = args['tipo_practica'].capitalize()
+        if tipo not in TIPOS_PRACTICA:
+            raise ParametroInvalido(f"Tipo de práctica no válido: {args['tipo_practica']}")
+        query = query.filter(Practica.tipo_practica == tipo)
+    if args.get('empresa'):
+        query = query.filter(Practica.empresa.ilike(f"%{args['empresa']}%"))
+    if args.get('estudiante_id'):
+        query = query.filter(Practica.estudiante_id == entero(args['estudiante_id'], 'estudiante_id'))
+    if args.get('con_nota'):
+        con_nota = _booleano(args['con_nota'], 'con_nota')
+        query = query.filter(Practica.nota.isnot(None) if con_nota else Practica.nota.is_(None))
+    query = _rango_fechas(query, args, Practica.fecha_inicio, 'fecha_inicio')
+    query = _rango_fechas(query, args, Practica.fecha_termino, 'fecha_termino')
+    return query
+
+
+def filtrar_proyectos(query, args):
+    if args.get('profesor_id'):
+        profesor_id = entero(args['profesor_id'], 'profesor_id')
+        query = query.filter(or_(Proyecto.profesor_guia_id == profesor_id,
+                                 Proyecto.profesor_informante_id == profesor_id))
+    if args.get('profesor_guia_id'):
+        query = query.filter(Proyecto.profesor_guia_id == entero(args['profesor_guia_id'], 'profesor_guia_id'))
+    if args.get('profesor_informante_id'):
+        query = query.filter(Proyecto.profesor_informante_id == entero(args['profesor_informante_id'], 'profesor_informante_id'))
+    if args.get('estudiante_id'):
+        query = query.filter(Proyecto.estudiante_id == entero(args['estudiante_id'], 'estudiante_id'))
+    if args.get('con_nota'):
+        con_nota = _booleano(args['con_nota'], 'con_nota')
+        query = query.filter(Proyecto.nota.isnot(None) if con_nota else Proyecto.nota.is_(None))
+    if args.get('estado'):
+        query = query.filter(Proyecto.estado == args['estado'])
+    return query
@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+from flask import current_app, g, has_request_context, request
+from utils.consultas import consultas_realizadas, tiempo_sql
+from utils.proveedor_json import ProveedorJSON
+
+logger = logging.getLogger(__name__)
+
+# Límites superiores (segundos / cantidad) de los buckets de los histogramas
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (1, 2, 5, 10, 25, 50, 100)
+
+
+class Histograma:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.conteos = [0] * len(buckets)
+        self.total = 0
+        self.suma = 0.0
+
+    def observar(self, valor):
+        for i, limite in enumerate(self.buckets):
+            if valor <= limite:
+                self.conteos[i] += 1
+        self.total += 1
+        self.suma += valor
+
+
+class RegistroMetricas:
+    """Histogramas por endpoint, agregados dentro del proceso.
+
+    Con gunicorn cada worker publica los suyos; Prometheus los distingue por
+    la etiqueta instance/pid o se suman en la consulta.
+    """
+
+    SERIES = (
+        ('http_request_duration_seconds', 'Duración total de la petición', BUCKETS_SEGUNDOS),
+        ('http_request_db_seconds', 'Tiempo en consultas SQL por petición', BUCKETS_SEGUNDOS),
+        ('http_request_serialization_seconds', 'Tiempo serializando JSON por petición', BUCKETS_SEGUNDOS),
+        ('http_request_sql_queries', 'Consultas SQL por petición', BUCKETS_CONSULTAS),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histogramas = {}
+
+    def observar(self, endpoint, metodo, valores):
+        with self._lock:
+            for (nombre, _, buckets), valor in zip(self.SERIES, valores):
+                clave = (nombre, endpoint, metodo)
+                if clave not in self._histogramas:
+                    self._histogramas[clave] = Histograma(buckets)
+                self._histogramas[clave].observar(valor)
+
+    def exportar(self):
+        lineas = []
+        with self._lock:
+            for nombre, ayuda, _ in self.SERIES:
+                lineas.append(f'# HELP {nombre} {ayuda}')
+                lineas.append(f'# TYPE {nombre} histogram')
+                for (serie, endpoint, metodo), histograma in sorted(self._histogramas.items()):
+                    if serie != nombre:
+                        continue
+                    etiquetas = f'endpoint="{endpoint}",method="{metodo}"'
+                    for limite, conteo in zip(histograma.buckets, histograma.conteos):
+                        lineas.append(f'{nombre}_bucket{{{etiquetas},le="{limite}"}} {conteo}')
+                    lineas.append(f'{nombre}_bucket{{{etiquetas},le="+Inf"}} {histograma.total}')
+                    lineas.append(f'{nombre}_sum{{{etiquetas}}} {histograma.suma:.6f}')
+                    lineas.append(f'{nombre}_count{{{etiquetas}}} {histograma.total}')
+        return lineas
+
+    def limpiar(self):
+        with self._lock:
+            self._histogramas.clear()
+
+
+metricas = RegistroMetricas()
+
+
+class ProveedorJSONMedido(ProveedorJSON):
+    """Acumula en g el tiempo que la petición pasa serializando JSON."""
+
+    def codificar(self, obj):
+        if not has_request_context():
+            return super().codificar(obj)
+        inicio = time.perf_counter()
+        try:
+            return super().codificar(obj)
+        finally:
+            g.tiempo_serializacion = g.get('tiempo_serializacion', 0.0) + time.perf_counter() - inicio
+
+
+def _iniciar_medicion():
+    g.inicio_peticion = time.perf_counter()
+
+
+def _cerrar_medicion(respuesta):
+    inicio = g.get('inicio_peticion')
+    if inicio is None:
+        return respuesta
+    
+    total = time.perf_counter() - inicio
+    sql = tiempo_sql()
+    serializacion = g.get('tiempo_serializacion', 0.0)
+    consultas = consultas_realizadas()
+    aplicacion = max(0.0, total - sql - serializacion)
+    
+    respuesta.headers['Server-Timing'] = ', '.join([
+        f'db;dur={sql * 1000:.1f};desc="{consultas} consultas"',
+        f'serializacion;dur={serializacion * 1000:.1f}',
+        f'app;dur={aplicacion * 1000:.1f}',
+        f'total;dur={total * 1000:.1f}',
+    ])
+    
+    endpoint = request.endpoint or 'desconocido'
+    metricas.observar(endpoint, request.method, (total, sql, serializacion, consultas))
+    
+    umbral = current_app.config.get('SLOW_REQUEST_MS')
+    if umbral and total * 1000 >= umbral:
+        logger.warning(
+            'Petición lenta %s %s -> %s: %.0f ms (sql %.0f ms en %d consultas, serialización %.0f ms)',
+            request.method, request.full_path.rstrip('?'), respuesta.status_code,
+            total * 1000, sql * 1000, consultas, serializacion * 1000
+        )
+    return respuesta
+
+
+def registrar_metricas(app):
+    app.json = ProveedorJSONMedido(app)
+    app.before_request(_iniciar_medicion)
+    app.after_request(_cerrar_medicion)
@@ -0,0 +1,70 @@
+import math
+from flask import current_app
+
+NOTA_MINIMA = 1.0
+NOTA_MAXIMA = 7.0
+
+
+def estado_proyecto(nota):
+    return 'Aprobado' if nota >= 4.0 else 'Reprobado'
+
+
+def _numero(convertir, valor, mensaje):
+    try:
+        return convertir(valor)
+    except (TypeError, ValueError):
+        raise ValueError(mensaje)
+
+
+def validar_notas(items, permitir_vacia=False):
+    """Valida una lista [{id, nota}] sin consultar la base.
+
+    Devuelve ({id: nota}, resultados), con un resultado por ítem en el
+    mismo orden recibido. Con permitir_vacia, nota null o '' borra la nota.
+    """
+    if not isinstance(items, list) or not items:
+        raise ValueError('Se espera una lista no vacía de {id, nota}')
+    maximo = current_app.config['NOTAS_POR_LOTE_MAXIMO']
+    if len(items) > maximo:
+        raise ValueError(f'Se aceptan como máximo {maximo} notas por solicitud')
+    
+    notas = {}
+    resultados = []
+    for item in items:
+        resultado = {'id': item.get('id') if isinstance(item, dict) else None, 'status': 'success'}
+        resultados.append(resultado)
+        try:
+            if not isinstance(item, dict) or 'id' not in item or 'nota' not in item:
+                raise ValueError('Cada ítem requiere id y nota')
+            id = _numero(int, item['id'], 'El id debe ser un número entero')
+            resultado['id'] = id
+            if id in notas:
+                raise ValueError('id repetido en la solicitud')
+            
+            if item['nota'] is None or item['nota'] == '':
+                if not permitir_vacia:
+                    raise ValueError('La nota es requerida')
+                nota = None
+            else:
+                nota = _numero(float, item['nota'], 'La nota debe ser un número')
+                # NaN no cumple ninguna comparación: se descarta explícitamente
+                if not math.isfinite(nota) or not (NOTA_MINIMA <= nota <= NOTA_MAXIMA):
+                    raise ValueError('La nota debe estar entre 1.0 y 7.0')
+            
+            notas[id] = nota
+            resultado['nota'] = nota
+        except ValueError as e:
+            resultado['status'] = 'error'
+            resultado['error'] = str(e)
+    return notas, resultados
+
+
+def marcar_inexistentes(resultados, existentes, mensaje):
+    for resultado in resultados:
+        if resultado['status'] == 'success' and resultado['id'] not in existentes:
+            resultado['status'] = 'error'
+            resultado['error'] = mensaje
+
+
+def con_errores(resultados):
+    return any(resultado['status'] == 'error' for resultado in resultados)
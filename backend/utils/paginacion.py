@@ -0,0 +1,66 @@
+from flask import current_app, request
+from sqlalchemy import and_, or_
+from app import db
+
+
+class ParametroInvalido(ValueError):
+    pass
+
+
+def entero(valor, campo):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        raise ParametroInvalido(f'El parámetro {campo} debe ser un número entero')
+
+
+def _condicion_cursor(columna, columna_id, after, descendente):
+    if columna is columna_id:
+        return columna_id < after if descendente else columna_id > after
+    
+    # Valor de la columna de orden en la fila del cursor, resuelto en la misma consulta
+    ancla = db.session.query(columna).filter(columna_id == after).scalar_subquery()
+    if descendente:
+        return or_(columna < ancla, and_(columna == ancla, columna_id < after))
+    return or_(columna > ancla, and_(columna == ancla, columna_id > after))
+
+
+def paginar(query, columna_id, columnas_orden, args=None, obtener_id=lambda fila: fila.id):
+    """Ordena y pagina por cursor (?sort=campo|-campo, ?after=<id>, ?limit=).
+
+    Sin after ni limit se devuelve la lista completa y paginacion es None.
+    """
+    args = request.args if args is None else args
+    
+    sort = args.get('sort', 'id')
+    descendente = sort.startswith('-')
+    campo = sort.lstrip('-')
+    if campo not in columnas_orden:
+        raise ParametroInvalido(f'No se puede ordenar por {campo}')
+    columna = columnas_orden[campo]
+    
+    after = args.get('after')
+    limit = args.get('limit')
+    
+    if after is not None:
+        query = query.filter(_condicion_cursor(columna, columna_id, entero(after, 'after'), descendente))
+    
+    orden = [columna, columna_id] if columna is not columna_id else [columna_id]
+    query = query.order_by(*[c.desc() if descendente else c.asc() for c in orden])
+    
+    if after is None and limit is None:
+        return query.all(), None
+    
+    limite = entero(limit, 'limit') if limit is not None else current_app.config['PAGINACION_LIMITE']
+    if limite < 1:
+        raise ParametroInvalido('El parámetro limit debe ser mayor que 0')
+    limite = min(limite, current_app.config['PAGINACION_LIMITE_MAXIMO'])
+    
+    filas = query.limit(limite + 1).all()
+    hay_mas = len(filas) > limite
+    filas = filas[:limite]
+    
+    return filas, {
+        'limit': limite,
+        'siguiente': obtener_id(filas[-1]) if hay_mas else None
+    }
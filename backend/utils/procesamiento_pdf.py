@@ -0,0 +1,61 @@
+import mmap
+import os
+import re
+from datetime import datetime
+from app import db
+from models.documento import Documento
+from utils.almacenamiento import ruta_blob
+from utils.trabajos import manejador
+
+_VERSION = re.compile(rb'^%PDF-(\d\.\d)')
+_PAGINA = re.compile(rb'/Type\s*/Page(?![a-zA-Z])')
+_CONTEO = re.compile(rb'/Type\s*/Pages\b[^>]*?/Count\s+(\d+)|/Count\s+(\d+)[^>]*?/Type\s*/Pages\b', re.S)
+
+
+def analizar_pdf(ruta):
+    """Valida la estructura básica de un PDF y cuenta sus páginas.
+
+    El archivo se recorre mapeado en memoria: el sistema operativo lo lee por
+    páginas bajo demanda en vez de copiarlo completo al proceso.
+    """
+    tamano = os.path.getsize(ruta)
+    if not tamano:
+        return {'valido': False, 'paginas': None, 'version_pdf': None, 'tamano': 0}
+    
+    with open(ruta, 'rb') as archivo, \
+            mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as contenido:
+        version = _VERSION.match(contenido)
+        valido = bool(version) and contenido.rfind(b'%%EOF', max(0, tamano - 2048)) != -1
+        
+        # Con flujos de objetos comprimidos las páginas no son visibles; se usa
+        # entonces el /Count del árbol de páginas
+        paginas = sum(1 for _ in _PAGINA.finditer(contenido))
+        conteos = [int(a or b) for a, b in _CONTEO.findall(contenido)]
+        if conteos:
+            paginas = max(paginas, max(conteos))
+        version_pdf = version.group(1).decode() if version else None
+    
+    return {
+        'valido': valido,
+        'paginas': paginas if valido else None,
+        'version_pdf': version_pdf,
+        'tamano': tamano
+    }
+
+
+@manejador('procesar_documento')
+def procesar_documento(sha256):
+    documento = db.session.get(Documento, sha256)
+    if documento is None or documento.procesado_en is not None:
+        return
+    ruta = ruta_blob(sha256)
+    if not os.path.exists(ruta):
+        return
+    
+    resultado = analizar_pdf(ruta)
+    documento.valido = resultado['valido']
+    documento.paginas = resultado['paginas']
+    documento.version_pdf = resultado['version_pdf']
+    documento.tamano = resultado['tamano']
+    documento.procesado_en = datetime.utcnow()
+    db.session.commit()
@@ -0,0 +1,57 @@
+"""Proveedor JSON de la aplicación: orjson cuando está instalado.
+
+orjson serializa date/datetime (ISO 8601), UUID y dataclasses de forma nativa
+y entrega bytes, que van directo al cuerpo de la respuesta. Sin orjson (o con
+JSON_ORJSON=false) se usa el módulo json estándar con el mismo formato de
+fechas, así el resultado no depende de qué proveedor esté activo.
+"""
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+
+def _por_defecto(obj):
+    if isinstance(obj, date):
+        return obj.isoformat()
+    return DefaultJSONProvider.default(obj)
+
+
+class ProveedorJSON(DefaultJSONProvider):
+    default = staticmethod(_por_defecto)
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.usa_orjson = orjson is not None and app.config.get('JSON_ORJSON', True)
+
+    def _opciones(self):
+        opciones = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            opciones |= orjson.OPT_SORT_KEYS
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            opciones |= orjson.OPT_INDENT_2
+        return opciones
+
+    def codificar(self, obj):
+        """Serializa obj; bytes con orjson, str con el módulo estándar."""
+        if self.usa_orjson:
+            return orjson.dumps(obj, default=self.default, option=self._opciones())
+        return super().dumps(obj)
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        resultado = self.codificar(obj)
+        return resultado.decode() if isinstance(resultado, bytes) else resultado
+
+    def loads(self, s, **kwargs):
+        if self.usa_orjson and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.codificar(obj), mimetype=self.mimetype)
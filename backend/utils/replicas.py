@@ -0,0 +1,95 @@
+"""Enrutamiento de los GET a réplicas de lectura.
+
+Cada petición GET/HEAD recibe una réplica (por turnos) en la sesión, salvo
+que la misma identidad JWT haya escrito hace menos de REPLICA_VENTANA_SEGUNDOS
+(leer lo propio recién escrito). Las marcas de escritura son archivos para que
+valgan en todos los workers; con varios servidores REPLICA_MARCAS_DIR debe ser
+un directorio compartido. Las versiones de la caché se leen de la misma réplica
+que los datos, así una réplica atrasada no guarda datos viejos bajo una versión
+nueva.
+"""
+import hashlib
+import itertools
+import os
+import time
+from flask import current_app, g, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import event
+from app import db
+from extensions import SesionEnrutada
+
+_turno = itertools.count()
+
+
+def replicas_configuradas():
+    return [clave for clave in current_app.config.get('SQLALCHEMY_BINDS') or {} if clave.startswith('replica')]
+
+
+def _ruta_marca(identidad):
+    directorio = current_app.config.get('REPLICA_MARCAS_DIR') or \
+        os.path.join(current_app.instance_path, 'escrituras')
+    return directorio, os.path.join(directorio, hashlib.sha1(str(identidad).encode()).hexdigest())
+
+
+def marcar_escritura(identidad):
+    directorio, ruta = _ruta_marca(identidad)
+    os.makedirs(directorio, exist_ok=True)
+    with open(ruta, 'a'):
+        pass
+    os.utime(ruta)
+
+
+def escribio_hace_poco(identidad):
+    try:
+        modificado = os.stat(_ruta_marca(identidad)[1]).st_mtime
+    except FileNotFoundError:
+        return False
+    return time.time() - modificado < current_app.config['REPLICA_VENTANA_SEGUNDOS']
+
+
+def _identidad():
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+def _elegir_base():
+    replicas = replicas_configuradas()
+    if not replicas or request.method not in ('GET', 'HEAD'):
+        return
+    identidad = _identidad()
+    if identidad is not None and escribio_hace_poco(identidad):
+        return
+    db.session.info['replica'] = replicas[next(_turno) % len(replicas)]
+    g.replica = db.session.info['replica']
+
+
+def _registrar_escritura(respuesta):
+    if not replicas_configuradas():
+        return respuesta
+    if request.method not in ('GET', 'HEAD', 'OPTIONS') and respuesta.status_code < 400:
+        identidad = _identidad()
+        if identidad is not None:
+            marcar_escritura(identidad)
+    origen = db.session.info.get('replica') if g.get('replica') else None
+    respuesta.headers['X-DB-Origen'] = origen or 'primaria'
+    return respuesta
+
+
+# Lo que una sesión ya escribió se vuelve a leer desde la primaria
+@event.listens_for(SesionEnrutada, 'after_flush')
+def _tras_escritura(session, flush_context):
+    session.info.pop('replica', None)
+
+
+@event.listens_for(SesionEnrutada, 'do_orm_execute')
+def _tras_escritura_masiva(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        orm_execute_state.session.info.pop('replica', None)
+
+
+def registrar_replicas(app):
+    app.before_request(_elegir_base)
+    app.after_request(_registrar_escritura)
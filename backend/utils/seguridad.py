@@ -0,0 +1,58 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class ServidorOcupado(Exception):
+    pass
+
+
+_estado = {'pid': None, 'executor': None, 'cupos': None}
+_metodos = {}
+_lock = threading.Lock()
+
+
+def _executor():
+    # Un executor por proceso: los hilos no sobreviven a un fork
+    if _estado['pid'] != os.getpid():
+        with _lock:
+            if _estado['pid'] != os.getpid():
+                hilos = current_app.config['PASSWORD_HASH_WORKERS']
+                _estado['executor'] = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='hash')
+                _estado['cupos'] = threading.BoundedSemaphore(hilos + current_app.config['PASSWORD_HASH_QUEUE'])
+                _estado['pid'] = os.getpid()
+    return _estado['executor'], _estado['cupos']
+
+
+def _ejecutar(funcion, *args):
+    """Ejecuta el hash en el pool acotado; si está saturado responde ServidorOcupado."""
+    executor, cupos = _executor()
+    espera = current_app.config['PASSWORD_HASH_TIMEOUT']
+    if not cupos.acquire(timeout=espera):
+        raise ServidorOcupado('Demasiados inicios de sesión simultáneos, intenta nuevamente')
+    try:
+        return executor.submit(funcion, *args).result()
+    finally:
+        cupos.release()
+
+
+def _metodo_canonico(metodo):
+    # 'scrypt' se guarda como 'scrypt:32768:8:1'; se obtiene una vez por método
+    if metodo not in _metodos:
+        _metodos[metodo] = generate_password_hash('', method=metodo).split('$', 1)[0]
+    return _metodos[metodo]
+
+
+def generar_hash(contrasena):
+    return _ejecutar(generate_password_hash, contrasena, current_app.config['PASSWORD_HASH_METHOD'])
+
+
+def verificar_contrasena(hash_guardado, contrasena):
+    return _ejecutar(check_password_hash, hash_guardado, contrasena)
+
+
+def necesita_rehash(hash_guardado):
+    metodo = _metodo_canonico(current_app.config['PASSWORD_HASH_METHOD'])
+    return hash_guardado.split('$', 1)[0] != metodo
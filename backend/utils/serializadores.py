@@ -0,0 +1,154 @@
+"""Consultas por columnas y serializadores compartidos de las vistas de lista.
+
+Las listas se arman desde tuplas (Row) con solo las columnas necesarias en
+lugar de instancias ORM completas: no hay identity map ni estado por fila.
+Las fechas se entregan como date; el proveedor JSON las escribe en ISO 8601.
+"""
+from sqlalchemy.orm import aliased
+from app import db
+from models.estudiante import Estudiante
+from models.practica import Practica
+from models.profesor import Profesor
+from models.proyecto import Proyecto
+
+ProfesorGuia = aliased(Profesor)
+ProfesorInformante = aliased(Profesor)
+
+
+def nombre_completo(nombre, apellido):
+    return f'{nombre} {apellido}'
+
+
+# Estudiantes
+
+COLUMNAS_ESTUDIANTE = (Estudiante.id, Estudiante.nombre, Estudiante.apellido, Estudiante.email)
+
+
+def serializar_estudiante(fila):
+    return fila._asdict()
+
+
+# Prácticas
+
+COLUMNAS_PRACTICA = (
+    Practica.id,
+    Estudiante.nombre.label('estudiante_nombre'),
+    Estudiante.apellido.label('estudiante_apellido'),
+    Estudiante.email.label('estudiante_email'),
+    Practica.empresa,
+    Practica.fecha_inicio,
+    Practica.fecha_termino,
+    Practica.supervisor,
+    Practica.contacto_supervisor,
+    Practica.nota,
+    Practica.carta_supervisor,
+    Practica.certificado_alumno,
+    Practica.formulario_inscripcion,
+    Practica.autorizacion_empresa,
+)
+
+
+def consulta_practicas():
+    return db.session.query(*COLUMNAS_PRACTICA).join(Estudiante, Practica.estudiante_id == Estudiante.id)
+
+
+def serializar_practica(fila, documentos_info):
+    return {
+        'id': fila.id,
+        'estudiante': nombre_completo(fila.estudiante_nombre, fila.estudiante_apellido),
+        'estudiante_email': fila.estudiante_email,
+        'empresa': fila.empresa,
+        'fecha_inicio': fila.fecha_inicio,
+        'fecha_termino': fila.fecha_termino,
+        'supervisor': fila.supervisor,
+        'contacto_supervisor': fila.contacto_supervisor,
+        'nota': fila.nota or None,
+        'carta_supervisor': fila.carta_supervisor,
+        'certificado_alumno': fila.certificado_alumno,
+        'formulario_inscripcion': fila.formulario_inscripcion,
+        'autorizacion_empresa': fila.autorizacion_empresa,
+        'documentos_info': documentos_info
+    }
+
+
+# Proyectos
+
+COLUMNAS_PROYECTO = (
+    Proyecto.id,
+    Proyecto.titulo,
+    Proyecto.nota,
+    Proyecto.estado,
+    Estudiante.nombre.label('estudiante_nombre'),
+    Estudiante.apellido.label('estudiante_apellido'),
+    Estudiante.email.label('estudiante_email'),
+    ProfesorGuia.nombre.label('guia_nombre'),
+    ProfesorGuia.apellido.label('guia_apellido'),
+    ProfesorInformante.nombre.label('informante_nombre'),
+    ProfesorInformante.apellido.label('informante_apellido'),
+)
+
+
+def con_participantes(query):
+    return query.join(Estudiante, Proyecto.estudiante_id == Estudiante.id)\
+                .join(ProfesorGuia, Proyecto.profesor_guia_id == ProfesorGuia.id)\
+                .join(ProfesorInformante, Proyecto.profesor_informante_id == ProfesorInformante.id)
+
+
+def consulta_proyectos():
+    return con_participantes(db.session.query(*COLUMNAS_PROYECTO))
+
+
+def serializar_proyecto(fila, con_nota=False):
+    proyecto = {
+        'id': fila.id,
+        'estudiante': nombre_completo(fila.estudiante_nombre, fila.estudiante_apellido),
+        'correo': fila.estudiante_email,
+        'proyecto_titulo': fila.titulo,
+        'profesor_guia': nombre_completo(fila.guia_nombre, fila.guia_apellido),
+        'profesor_informante': nombre_completo(fila.informante_nombre, fila.informante_apellido)
+    }
+    if con_nota:
+        proyecto['nota'] = fila.nota
+        proyecto['estado'] = fila.estado
+    return proyecto
+
+
+# Proyectos de un profesor (detalle)
+
+COLUMNAS_PROYECTO_PROFESOR = (
+    Proyecto.id,
+    Proyecto.titulo,
+    Proyecto.descripcion,
+    Proyecto.profesor_guia_id,
+    Proyecto.profesor_informante_id,
+    Estudiante.nombre.label('estudiante_nombre'),
+    Estudiante.apellido.label('estudiante_apellido'),
+    Estudiante.email.label('estudiante_email'),
+)
+
+
+def serializar_proyecto_profesor(fila):
+    return {
+        'id': fila.id,
+        'titulo': fila.titulo,
+        'descripcion': fila.descripcion,
+        'estudiante': nombre_completo(fila.estudiante_nombre, fila.estudiante_apellido),
+        'estudiante_email': fila.estudiante_email
+    }
+
+
+# Profesores
+
+COLUMNAS_PROFESOR = (Profesor.id, Profesor.nombre, Profesor.apellido, Profesor.email)
+
+
+def serializar_profesor(fila):
+    """Fila de profesores_con_carga(*COLUMNAS_PROFESOR)."""
+    return {
+        'id': fila.id,
+        'nombre': fila.nombre,
+        'apellido': fila.apellido,
+        'email': fila.email,
+        'proyectos_guiados': int(fila.proyectos_guiados),
+        'proyectos_informados': int(fila.proyectos_informados)
+    }
@@ -0,0 +1,154 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app import db
+from models.trabajo import Trabajo
+
+logger = logging.getLogger(__name__)
+
+MANEJADORES = {}
+
+_despertar = threading.Event()
+_hilos = {'pid': None, 'lista': [], 'siguiente_purga': 0}
+_lock = threading.Lock()
+
+
+def manejador(tipo):
+    def decorador(f):
+        MANEJADORES[tipo] = f
+        return f
+    return decorador
+
+
+def encolar(tipo, **datos):
+    """Agrega un trabajo a la transacción en curso; se ejecuta tras el commit."""
+    trabajo = Trabajo(tipo=tipo, datos=datos, estado='pendiente', intentos=0)
+    db.session.add(trabajo)
+    db.session.info['trabajos_encolados'] = True
+    return trabajo
+
+
+@event.listens_for(Session, 'after_commit')
+def _avisar_trabajadores(session):
+    if session.info.pop('trabajos_encolados', False):
+        _despertar.set()
+
+
+def _tomar_trabajo():
+    candidato = db.session.query(Trabajo.id)\
+                          .filter(Trabajo.estado == 'pendiente')\
+                          .order_by(Trabajo.id)\
+                          .with_for_update(skip_locked=True)\
+                          .limit(1)\
+                          .scalar()
+    if candidato is None:
+        db.session.rollback()
+        return None
+    
+    # La actualización condicional garantiza que un solo trabajador lo toma
+    tomados = Trabajo.query.filter_by(id=candidato, estado='pendiente')\
+                           .update({'estado': 'en_proceso', 'iniciado_en': datetime.utcnow(),
+                                    'intentos': Trabajo.intentos + 1},
+                                   synchronize_session=False)
+    db.session.commit()
+    return db.session.get(Trabajo, candidato) if tomados else None
+
+
+def ejecutar_trabajo(app, trabajo):
+    try:
+        MANEJADORES[trabajo.tipo](**trabajo.datos)
+        trabajo.estado = 'completado'
+        trabajo.error = None
+    except Exception as e:
+        db.session.rollback()
+        trabajo = db.session.get(Trabajo, trabajo.id)
+        reintentar = trabajo.intentos < app.config['TRABAJOS_MAX_INTENTOS']
+        trabajo.estado = 'pendiente' if reintentar else 'fallido'
+        trabajo.error = str(e)
+        logger.exception('Falló el trabajo %s (%s)', trabajo.id, trabajo.tipo)
+    trabajo.terminado_en = datetime.utcnow()
+    db.session.commit()
+
+
+def ejecutar_pendientes(app, limite=None):
+    procesados = 0
+    while limite is None or procesados < limite:
+        trabajo = _tomar_trabajo()
+        if trabajo is None:
+            break
+        ejecutar_trabajo(app, trabajo)
+        procesados += 1
+    return procesados
+
+
+def recuperar_interrumpidos(app):
+    """Devuelve a la cola los trabajos que quedaron en proceso tras una caída."""
+    limite = datetime.utcnow() - timedelta(seconds=app.config['TRABAJOS_TIEMPO_MAXIMO'])
+    recuperados = Trabajo.query.filter(Trabajo.estado == 'en_proceso', Trabajo.iniciado_en < limite)\
+                               .update({'estado': 'pendiente'}, synchronize_session=False)
+    db.session.commit()
+    return recuperados
+
+
+def purgar_terminados(app, dias=None):
+    """Elimina los trabajos completados o fallidos hace más de TRABAJOS_RETENCION_DIAS."""
+    dias = app.config['TRABAJOS_RETENCION_DIAS'] if dias is None else dias
+    limite = datetime.utcnow() - timedelta(days=dias)
+    borrados = Trabajo.query.filter(Trabajo.estado.in_(('completado', 'fallido')),
+                                    Trabajo.terminado_en < limite)\
+                            .delete(synchronize_session=False)
+    db.session.commit()
+    return borrados
+
+
+def _purgar_si_corresponde(app):
+    # Una vez por TRABAJOS_PURGA_INTERVALO en cada proceso, no en cada vuelta
+    ahora = time.monotonic()
+    with _lock:
+        if ahora < _hilos['siguiente_purga']:
+            return
+        _hilos['siguiente_purga'] = ahora + app.config['TRABAJOS_PURGA_INTERVALO']
+    purgar_terminados(app)
+
+
+def _bucle(app):
+    intervalo = app.config['TRABAJOS_INTERVALO']
+    while True:
+        _despertar.wait(intervalo)
+        _despertar.clear()
+        try:
+            with app.app_context():
+                ejecutar_pendientes(app)
+                _purgar_si_corresponde(app)
+        except Exception:
+            logger.exception('Error en el trabajador de la cola')
+
+
+def iniciar_trabajadores(app, hilos=None):
+    """Lanza los hilos trabajadores una vez por proceso (también tras un fork)."""
+    hilos = app.config['TRABAJOS_HILOS'] if hilos is None else hilos
+    if hilos <= 0 or _hilos['pid'] == os.getpid():
+        return
+    with _lock:
+        if _hilos['pid'] == os.getpid():
+            return
+        with app.app_context():
+            recuperar_interrumpidos(app)
+        _hilos['pid'] = os.getpid()
+        _hilos['lista'] = [
+            threading.Thread(target=_bucle, args=(app,), name=f'trabajador-{i}', daemon=True)
+            for i in range(hilos)
+        ]
+        for hilo in _hilos['lista']:
+            hilo.start()
+        _despertar.set()
+
+
+def registrar_trabajadores(app):
+    @app.before_request
+    def _iniciar_trabajadores():
+        iniciar_trabajadores(app)
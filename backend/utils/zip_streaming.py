@@ -0,0 +1,42 @@
+import io
+import zipfile
+
+TAMANO_BLOQUE = 64 * 1024
+
+
+class _Salida(io.RawIOBase):
+    """Destino no posicionable: zipfile escribe aquí y el generador lo vacía."""
+
+    def __init__(self):
+        self._partes = []
+
+    def writable(self):
+        return True
+
+    def write(self, datos):
+        self._partes.append(bytes(datos))
+        return len(datos)
+
+    def vaciar(self):
+        datos = b''.join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+def zip_en_streaming(entradas):
+    """Genera un ZIP a partir de pares (nombre, ruta) sin armarlo en disco ni en memoria.
+
+    Los PDF ya vienen comprimidos, por lo que se guardan sin compresión.
+    """
+    salida = _Salida()
+    with zipfile.ZipFile(salida, mode='w', compression=zipfile.ZIP_STORED) as archivo_zip:
+        for nombre, ruta in entradas:
+            with open(ruta, 'rb') as origen, archivo_zip.open(nombre, mode='w') as destino:
+                while True:
+                    bloque = origen.read(TAMANO_BLOQUE)
+                    if not bloque:
+                        break
+                    destino.write(bloque)
+                    yield salida.vaciar()
+            yield salida.vaciar()
+    yield salida.vaciar()